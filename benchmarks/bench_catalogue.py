@@ -0,0 +1,64 @@
+"""Compares per-worker startup time and private memory of CSVDataReader against the mmap'd RecipeCatalogue.
+
+Each mode runs in a fresh interpreter, standing in for one gunicorn worker. Private memory is Private_Dirty from
+/proc/self/smaps_rollup: heap pages the worker wrote itself, which is what every additional worker costs. Clean
+file-backed pages, such as the mapped catalogue, are left out because the page cache shares them between workers. Run from the project directory:
+python -m benchmarks.bench_catalogue
+"""
+import subprocess
+import sys
+
+from recipe.adapters.datareader.catalogue import RecipeCatalogue
+
+PROBE = """
+import time
+def private_kb():
+    with open('/proc/self/smaps_rollup') as file:
+        return sum(int(line.split()[1]) for line in file if line.startswith('Private_Dirty'))
+{imports}
+baseline = private_kb()
+start = time.perf_counter()
+{load}
+elapsed = time.perf_counter() - start
+for recipe_id in (221, 38, 1, 5000):
+    recipe = {lookup}
+    if recipe is not None:
+        recipe.ingredients
+print(elapsed, private_kb() - baseline)
+"""
+
+MODES = {
+    'CSVDataReader (snapshot)': (
+        "from recipe.adapters.datareader.csvdatareader import CSVDataReader",
+        "reader = CSVDataReader(); recipes = {r.id: r for r in reader.recipes}",
+        "recipes.get(recipe_id)",
+    ),
+    'CSVDataReader (lazy)': (
+        "from recipe.adapters.datareader.csvdatareader import CSVDataReader",
+        "reader = CSVDataReader(lazy=True); recipes = {r.id: r for r in reader.recipes}",
+        "recipes.get(recipe_id)",
+    ),
+    'RecipeCatalogue': (
+        "from recipe.adapters.datareader.catalogue import RecipeCatalogue",
+        "catalogue = RecipeCatalogue.open()",
+        "catalogue.get_recipe(recipe_id)",
+    ),
+}
+
+
+def main():
+    # Make sure the snapshot and the compiled catalogue exist, so every mode measures a warm start.
+    subprocess.run([sys.executable, '-c', PROBE.format(imports=MODES['CSVDataReader (snapshot)'][0],
+                                                         load=MODES['CSVDataReader (snapshot)'][1],
+                                                         lookup=MODES['CSVDataReader (snapshot)'][2])],
+                   check=True, capture_output=True)
+    RecipeCatalogue.open().close()
+    for label, (imports, load, lookup) in MODES.items():
+        output = subprocess.run([sys.executable, '-c', PROBE.format(imports=imports, load=load, lookup=lookup)],
+                                check=True, capture_output=True, text=True).stdout
+        elapsed, private = output.split()
+        print(f"{label:26s} startup {float(elapsed) * 1000:8.1f} ms   private memory {int(private) / 1024:7.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
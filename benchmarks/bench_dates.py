@@ -0,0 +1,51 @@
+"""Compares DatePublished parsing over the whole date column: strptime with fallback, the tokenizer, and DateParser.
+
+Run from the project directory: python -m benchmarks.bench_dates
+"""
+import csv
+import timeit
+from datetime import datetime
+
+from recipe.adapters.datareader.csvdatareader import DEFAULT_CSV_FILE
+from recipe.adapters.datareader.dateparser import DateParser, parse_date_uncached
+
+
+def parse_with_strptime(date_str: str) -> datetime | None:
+    """ The previous implementation: strip ordinal suffixes, then try strptime with each format in turn. """
+    if not date_str:
+        return None
+    date_str = date_str.replace('st ', ' ').replace('nd ', ' ').replace('rd ', ' ').replace('th ', ' ')
+    try:
+        return datetime.strptime(date_str, '%d %b %Y')
+    except ValueError:
+        try:
+            return datetime.strptime(date_str, '%Y-%m-%d')
+        except ValueError:
+            return None
+
+
+def main(repeat: int = 5):
+    with open(DEFAULT_CSV_FILE, encoding='utf-8') as file:
+        dates = [row['DatePublished'] for row in csv.DictReader(file)]
+    assert [parse_with_strptime(text) for text in dates] == [parse_date_uncached(text) for text in dates]
+    print(f"{len(dates)} dates, {len(set(dates))} distinct")
+
+    def cold():
+        parser = DateParser()
+        for text in dates:
+            parser.parse(text)
+
+    warm_parser = DateParser()
+    cases = (
+        ('strptime', lambda: [parse_with_strptime(text) for text in dates]),
+        ('tokenizer, uncached', lambda: [parse_date_uncached(text) for text in dates]),
+        ('DateParser, cold cache', cold),
+        ('DateParser, warm cache', lambda: [warm_parser.parse(text) for text in dates]),
+    )
+    for label, run in cases:
+        seconds = min(timeit.repeat(run, number=1, repeat=repeat))
+        print(f"{label:24s} {seconds * 1000:7.2f} ms   {seconds / len(dates) * 1e6:6.2f} us/row")
+
+
+if __name__ == '__main__':
+    main()
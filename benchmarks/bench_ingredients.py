@@ -0,0 +1,44 @@
+"""Compares bitset pantry queries with a Python scan over Recipe.ingredients.
+
+The catalogue is recipes.csv repeated to the requested size.
+Run from the project directory: python -m benchmarks.bench_ingredients [copies]
+"""
+import sys
+import time
+import timeit
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.ingredientindex import IngredientIndex, normalise_ingredient
+
+PANTRY = ['eggs', 'butter', 'sugar', 'flour', 'milk', 'salt', 'vanilla', 'baking powder', 'onion', 'garlic']
+
+
+def scan(recipe_keys, pantry, max_missing):
+    matches = []
+    for keys in recipe_keys:
+        matched = len(keys & pantry)
+        if matched and len(keys) - matched <= max_missing:
+            matches.append(matched)
+    return matches
+
+
+def main(copies: int = 40):
+    recipes = CSVDataReader().recipes * copies
+    start = time.perf_counter()
+    index = IngredientIndex(recipes)
+    print(f"{len(index)} recipes, {len(index.vocabulary)} ingredients, "
+          f"built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    recipe_keys = [{key for key in map(normalise_ingredient, r.ingredients) if key} for r in recipes]
+    pantry = {normalise_ingredient(name) for name in PANTRY}
+    for max_missing in (0, 2):
+        bitset = min(timeit.repeat(lambda: index.cookable(PANTRY, max_missing), number=1, repeat=5))
+        python = min(timeit.repeat(lambda: scan(recipe_keys, pantry, max_missing), number=1, repeat=5))
+        print(f"missing <= {max_missing}: bitset {bitset * 1000:7.2f} ms   python scan {python * 1000:7.2f} ms   "
+              f"({len(index.cookable(PANTRY, max_missing))} matches)")
+    contains = min(timeit.repeat(lambda: index.containing_all(['eggs', 'sugar', 'butter']), number=1, repeat=5))
+    print(f"containing all of eggs/sugar/butter: {contains * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,35 @@
+"""Reports startup time and peak RSS of eager, snapshot and lazy loading of recipes.csv.
+
+Each mode runs in a fresh interpreter so that peak RSS is not shared between them.
+Run from the project directory: python -m benchmarks.bench_lazy
+"""
+import subprocess
+import sys
+
+PROBE = """
+import resource, sys, time
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+start = time.perf_counter()
+reader = CSVDataReader(**{kwargs})
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+MODES = {
+    'eager (parse)': "{'use_snapshot': False}",
+    'eager (snapshot)': "{}",
+    'lazy': "{'lazy': True}",
+}
+
+
+def main():
+    subprocess.run([sys.executable, '-c', PROBE.format(kwargs="{}")], check=True, capture_output=True)
+    for label, kwargs in MODES.items():
+        output = subprocess.run([sys.executable, '-c', PROBE.format(kwargs=kwargs)], check=True,
+                                capture_output=True, text=True).stdout
+        elapsed, max_rss = output.split()
+        print(f"{label:18s} startup {float(elapsed) * 1000:8.1f} ms   peak RSS {int(max_rss) / 1024:7.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
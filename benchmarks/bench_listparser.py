@@ -0,0 +1,27 @@
+"""Micro-benchmark of parse_list_literal against ast.literal_eval on the list columns of recipes.csv.
+
+Run from the project directory: python -m benchmarks.bench_listparser
+"""
+import ast
+import csv
+import os
+import timeit
+
+from recipe.adapters.datareader.listparser import parse_list_literal
+
+CSV_FILE = os.path.join(os.path.dirname(__file__), '..', 'recipe', 'adapters', 'data', 'recipes.csv')
+LIST_COLUMNS = ('Images', 'RecipeIngredientQuantities', 'RecipeIngredientParts', 'RecipeInstructions')
+
+
+def main(repeat: int = 5):
+    with open(CSV_FILE, 'r', encoding='utf-8') as file:
+        cells = [row[column] for row in csv.DictReader(file) for column in LIST_COLUMNS
+                 if row[column] and row[column] != 'NA']
+
+    for label, parse in (('ast.literal_eval', ast.literal_eval), ('parse_list_literal', parse_list_literal)):
+        best = min(timeit.repeat(lambda: [parse(cell) for cell in cells], number=1, repeat=repeat))
+        print(f"{label:20s} {best * 1000:8.1f} ms for {len(cells)} cells ({best / len(cells) * 1e6:.2f} us/cell)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Measures loading one synthetic author with many recipes, and adding/removing user favourites.
+
+Review and Favourite are still stubs, so plain instances stand in for them. Run from the project directory:
+python -m benchmarks.bench_membership [sizes...]
+"""
+import sys
+import time
+
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.favourite import Favourite
+from recipe.domainmodel.recipe import Recipe
+from recipe.domainmodel.user import User
+
+
+def main(sizes=(1_000, 10_000, 100_000)):
+    print(f"{'size':>9} {'author.add_recipe us':>20} {'add favourite us':>17} {'remove favourite us':>20}")
+    for size in sizes:
+        author = Author(1, "Prolific")
+        recipes = [Recipe(recipe_id, f"Recipe {recipe_id}", author) for recipe_id in range(1, size + 1)]
+        start = time.perf_counter()
+        for recipe in recipes:
+            author.add_recipe(recipe)
+        add_recipe = time.perf_counter() - start
+
+        user = User("cook", "secret", 1)
+        favourites = [Favourite() for _ in range(size)]
+        start = time.perf_counter()
+        for favourite in favourites:
+            user.add_favourite_recipe(favourite)
+        add_favourite = time.perf_counter() - start
+        start = time.perf_counter()
+        # Newest first: the worst order for a list, which would shift or scan past every older favourite.
+        for favourite in reversed(favourites):
+            user.remove_favourite_recipe(favourite)
+        remove_favourite = time.perf_counter() - start
+        print(f"{size:>9} {add_recipe / size * 1e6:>20.2f} {add_favourite / size * 1e6:>17.2f} "
+              f"{remove_favourite / size * 1e6:>20.2f}")
+
+
+if __name__ == '__main__':
+    main(tuple(int(argument) for argument in sys.argv[1:]) or (1_000, 10_000, 100_000))
@@ -0,0 +1,63 @@
+"""Measures the memory held by the loaded catalogue, per recipe, and what string sharing saves on the full dataset.
+
+The report compares the loaded recipes' ingredient and quantity lists against the same lists holding a private copy
+of every string (as the loader produced before interning), and their prefix-compressed image URLs against plain
+lists of full URLs.
+
+Run from the project directory: python -m benchmarks.bench_memory
+"""
+import gc
+import tracemalloc
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.compacturls import CompactUrls, UrlPrefixes
+from recipe.domainmodel.recipe import Recipe
+
+
+def measure(factory) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = factory()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def _copy(text: str) -> str:
+    # Slicing and concatenating builds a new string object with the same value (for two or more characters).
+    return text[:1] + text[1:]
+
+
+def string_report(recipes: list[Recipe]) -> None:
+    lists = [recipe.ingredients + recipe.ingredient_quantities for recipe in recipes]
+    items = sum(len(strings) for strings in lists)
+    distinct = len({text for strings in lists for text in strings})
+    _, shared = measure(lambda: [list(strings) for strings in lists])
+    _, copied = measure(lambda: [[_copy(text) for text in strings] for strings in lists])
+    print(f"ingredients:  {items} strings, {distinct} distinct   "
+          f"copied {copied / 1024:8.0f} KiB   interned {shared / 1024:8.0f} KiB   saved {(copied - shared) / 1024:8.0f} KiB")
+
+    urls = [recipe.images for recipe in recipes]
+    count = sum(len(images) for images in urls)
+    _, full = measure(lambda: [[_copy(url) for url in images] for images in urls])
+    prefixes = UrlPrefixes()
+    _, compact = measure(lambda: [CompactUrls(images, prefixes) for images in urls])
+    print(f"image URLs:   {count} URLs, {len(prefixes)} prefixes      "
+          f"full   {full / 1024:8.0f} KiB   compact  {compact / 1024:8.0f} KiB   saved {(full - compact) / 1024:8.0f} KiB")
+
+
+def main(count: int = 100_000):
+    reader, total = measure(lambda: CSVDataReader())
+    print(f"catalogue:    {total / len(reader.recipes):8.0f} bytes/recipe ({len(reader.recipes)} recipes)")
+    string_report(reader.recipes)
+
+    author = Author(1, "Bob Ross")
+    recipes, total = measure(lambda: [Recipe(index, "Muffins", author) for index in range(1, count + 1)])
+    print(f"bare Recipe:  {total / count:8.0f} bytes/recipe ({count} recipes)")
+
+
+if __name__ == '__main__':
+    main()
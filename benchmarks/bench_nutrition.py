@@ -0,0 +1,59 @@
+"""Compares NutritionIndex queries with a numpy scan of every recipe, by catalogue size.
+
+The catalogue is the nutrition of recipes.csv repeated to each size, every copy scaled by up to 10% so that copies do
+not coincide. The scan cost grows with the catalogue; the index cost grows with the number of boxes a query touches.
+Run from the project directory: python -m benchmarks.bench_nutrition [copies ...]
+"""
+import sys
+import time
+import timeit
+
+import numpy as np
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.nutritionindex import NutritionIndex
+from recipe.domainmodel.nutrition import NUTRITION_FIELDS
+
+TARGETS = {'calories': 500, 'protein_content': 30, 'fat_content': 15}
+RANGES = {'calories': (400, 600), 'protein_content': (30, None)}
+
+
+def scan_nearest(values: np.ndarray, centre: np.ndarray, scale: np.ndarray, k: int) -> np.ndarray:
+    columns = [NUTRITION_FIELDS.index(field) for field in TARGETS]
+    query = np.array(list(TARGETS.values()))
+    squared = (((values[:, columns] - query) / scale[columns]) ** 2).sum(axis=1)
+    return np.argpartition(squared, k)[:k]
+
+
+def scan_within(values: np.ndarray) -> np.ndarray:
+    calories, protein = values[:, NUTRITION_FIELDS.index('calories')], values[:, NUTRITION_FIELDS.index('protein_content')]
+    return np.flatnonzero((calories >= 400) & (calories <= 600) & (protein >= 30))
+
+
+def main(*copies: int):
+    recipes = CSVDataReader().recipes
+    base = np.array([recipe.nutrition.as_tuple() for recipe in recipes], dtype=np.float64)
+    rng = np.random.default_rng(0)
+    for count in copies or (1, 4, 16):
+        values = np.tile(base, (count, 1)) * rng.uniform(0.9, 1.1, (len(base) * count, 1))
+        recipe_ids = np.arange(len(values))
+        start = time.perf_counter()
+        index = NutritionIndex(recipe_ids, values)
+        build = time.perf_counter() - start
+        centre = np.median(values, axis=0)
+        spread = np.subtract(*np.percentile(values, [75, 25], axis=0))
+        scale = np.where(spread > 0, spread, 1.0)
+
+        timings = {
+            'nearest index': lambda: index.nearest(10, **TARGETS),
+            'nearest scan': lambda: scan_nearest(values, centre, scale, 10),
+            'within index': lambda: index.within(**RANGES),
+            'within scan': lambda: scan_within(values),
+        }
+        results = '   '.join(f"{name} {min(timeit.repeat(query, number=200, repeat=3)) / 200 * 1e6:8.1f} us"
+                             for name, query in timings.items())
+        print(f"{len(values):7d} recipes   build {build:5.2f} s   {results}")
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,41 @@
+"""Measures home page latency through the Flask test client: uncached render, cache hit and 304 revalidation.
+
+Run from the project directory: python -m benchmarks.bench_pagecache
+"""
+import timeit
+
+from flask import render_template
+
+import recipe.adapters.repository as repo
+from recipe import HOME_RECIPE_ID, create_app
+
+
+def per_call(function, number: int = 500) -> float:
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    app = create_app({'TESTING': True})
+    client = app.test_client()
+    cache = app.extensions['page_cache']
+    etag = client.get('/').headers['ETag']
+
+    def uncached():
+        cache.clear()
+        client.get('/')
+
+    with app.test_request_context('/'):
+        repository, data_version = repo.published
+        home_recipe = repository.get_recipe(HOME_RECIPE_ID)
+        render = lambda: render_template('recipeDescription.html', recipe=home_recipe)
+        print(f"render_template only {per_call(render):8.1f} us")
+        key = ('recipeDescription.html', HOME_RECIPE_ID, data_version)
+        print(f"cache lookup only    {per_call(lambda: cache.get(key)):8.1f} us")
+    print(f"GET, uncached        {per_call(uncached):8.1f} us")
+    print(f"GET, cache hit       {per_call(lambda: client.get('/')):8.1f} us")
+    print(f"GET, 304             {per_call(lambda: client.get('/', headers={'If-None-Match': etag})):8.1f} us")
+    print(cache.stats())
+
+
+if __name__ == '__main__':
+    main()
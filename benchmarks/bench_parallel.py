@@ -0,0 +1,52 @@
+"""Compares serial and process-pool ingestion on an enlarged copy of recipes.csv.
+
+Run from the project directory: python -m benchmarks.bench_parallel [copies]
+"""
+import csv
+import os
+import sys
+import tempfile
+import time
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+
+CSV_FILE = os.path.join(os.path.dirname(__file__), '..', 'recipe', 'adapters', 'data', 'recipes.csv')
+
+
+def write_enlarged_csv(path: str, copies: int):
+    with open(CSV_FILE, 'r', encoding='utf-8', newline='') as source:
+        reader = csv.reader(source)
+        header = next(reader)
+        rows = list(reader)
+    offset = max(int(row[0]) for row in rows)
+    with open(path, 'w', encoding='utf-8', newline='') as target:
+        writer = csv.writer(target, lineterminator='\n')
+        writer.writerow(header)
+        for copy in range(copies):
+            for row in rows:
+                writer.writerow([str(int(row[0]) + copy * offset)] + row[1:])
+
+
+def timed(**kwargs) -> float:
+    start = time.perf_counter()
+    CSVDataReader(use_snapshot=False, **kwargs)
+    return time.perf_counter() - start
+
+
+def main(copies: int = 20):
+    with tempfile.TemporaryDirectory() as directory:
+        csv_file = os.path.join(directory, 'recipes.csv')
+        write_enlarged_csv(csv_file, copies)
+        print(f"{os.path.getsize(csv_file) / 2 ** 20:.1f} MB, {os.cpu_count()} cores")
+
+        serial = timed(csv_file=csv_file)
+        print(f"serial:     {serial:6.2f} s")
+        workers = 2
+        while workers <= (os.cpu_count() or 1):
+            elapsed = timed(csv_file=csv_file, parallel=True, workers=workers)
+            print(f"{workers:2d} workers: {elapsed:6.2f} s ({serial / elapsed:.1f}x)")
+            workers *= 2
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
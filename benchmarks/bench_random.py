@@ -0,0 +1,33 @@
+"""Measures start-up time, per-request sampling latency and RandomRecipe.html render time of RandomCSVDataReader.
+
+Records are decoded once at load, so a request only samples an index and renders the template over ready-made lists.
+
+Run from the project directory: python -m benchmarks.bench_random
+"""
+import os
+import time
+import timeit
+
+from jinja2 import Environment, FileSystemLoader
+
+from recipe.adapters.datareader.csvdatareader import DEFAULT_CSV_FILE
+from recipe.adapters.datareader.RandomCSVDataReader import RandomCSVDataReader
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), '..', 'recipe', 'adapters', 'templates')
+
+
+def main():
+    template = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=True).get_template('RandomRecipe.html')
+    for label, kwargs in (('uniform', {}), ('weighted by calories', {'weights': 'Calories'})):
+        start = time.perf_counter()
+        reader = RandomCSVDataReader(DEFAULT_CSV_FILE, seed=235, **kwargs)
+        elapsed = time.perf_counter() - start
+        per_call = min(timeit.repeat(reader.get_random_recipe, number=2000, repeat=3)) / 2000
+        per_render = min(timeit.repeat(lambda: template.render(recipe=reader.get_random_recipe()),
+                                       number=500, repeat=3)) / 500
+        print(f"{label:22s} load {elapsed * 1000:7.1f} ms   get_random_recipe {per_call * 1e6:6.1f} us"
+              f"   sample + render {per_render * 1e6:7.1f} us")
+
+
+if __name__ == '__main__':
+    main()
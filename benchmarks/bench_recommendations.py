@@ -0,0 +1,37 @@
+"""Measures the similar-recipe batch job: build time and peak working memory by catalogue and block size, and lookups.
+
+The catalogue is recipes.csv repeated to each size. Build time grows with the square of the catalogue (every pair is
+scored), while the working memory beyond the inputs and the neighbour arrays stays bounded by the block size.
+Run from the project directory: python -m benchmarks.bench_recommendations [copies ...]
+"""
+import sys
+import time
+import timeit
+import tracemalloc
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.recommendations import DEFAULT_NEIGHBOURS, SimilarRecipes
+
+
+def main(*copies: int):
+    recipes = CSVDataReader().recipes
+    for count in copies or (1, 2, 4):
+        catalogue = recipes * count
+        # Neighbour positions (int32) and scores (float16): the part of memory that has to grow with the catalogue.
+        output = len(catalogue) * DEFAULT_NEIGHBOURS * 6
+        for block_size in (256, 1024):
+            tracemalloc.start()
+            start = time.perf_counter()
+            similar = SimilarRecipes.build(catalogue, block_size=block_size)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{len(catalogue):7d} recipes  block {block_size:5d}   build {elapsed:7.2f} s   "
+                  f"peak {peak / 2 ** 20:6.1f} MiB (neighbour arrays {output / 2 ** 20:5.2f} MiB)")
+
+    lookup = min(timeit.repeat(lambda: similar.similar(38), number=10_000, repeat=3)) / 10_000
+    print(f"similar(): {lookup * 1e6:.1f} us")
+
+
+if __name__ == '__main__':
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,47 @@
+"""Compares a hot reload after a one-row edit of recipes.csv with a full re-read and repopulate.
+
+Works on a temporary copy of the CSV. Run from the project directory: python -m benchmarks.bench_reload
+"""
+import csv
+import os
+import shutil
+import tempfile
+import time
+
+import recipe.adapters.repository as repo
+from recipe.adapters.datareader.csvdatareader import DEFAULT_CSV_FILE, CSVDataReader
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.reloader import CatalogueReloader
+from recipe.adapters.repository_populate import populate
+
+
+def full_load(csv_file: str) -> MemoryRepository:
+    repository = MemoryRepository()
+    populate(repository, CSVDataReader(csv_file, use_snapshot=False))
+    return repository
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        csv_file = os.path.join(directory, 'recipes.csv')
+        shutil.copyfile(DEFAULT_CSV_FILE, csv_file)
+        start = time.perf_counter()
+        repo.publish(full_load(csv_file), '')
+        print(f"full re-read and populate {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        reloader = CatalogueReloader(csv_file)
+        with open(csv_file, newline='', encoding='utf-8') as file:
+            rows = list(csv.reader(file))
+        rows[1][1] += ' (edited)'
+        with open(csv_file, 'w', newline='', encoding='utf-8') as file:
+            csv.writer(file).writerows(rows)
+        stat = os.stat(csv_file)
+        os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        start = time.perf_counter()
+        diff = reloader.check()
+        print(f"hot reload of one row     {(time.perf_counter() - start) * 1000:8.1f} ms  {diff}")
+
+
+if __name__ == '__main__':
+    main()
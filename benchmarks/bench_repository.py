@@ -0,0 +1,58 @@
+"""Measures MemoryRepository lookup latency on synthetic catalogues, against a linear scan of the recipe list.
+
+Run from the project directory: python -m benchmarks.bench_repository [sizes...]
+"""
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+
+
+def synthetic_recipes(count: int, seed: int = 235) -> list[Recipe]:
+    rng = random.Random(seed)
+    authors = [Author(author_id, f"Author {author_id}") for author_id in range(1, count // 20 + 2)]
+    categories = [Category(f"Category {category_id}", [], category_id) for category_id in range(1, 101)]
+    epoch = datetime(2000, 1, 1)
+    return [Recipe(recipe_id, f"Recipe {recipe_id}", rng.choice(authors), category=rng.choice(categories),
+                   created_date=epoch + timedelta(days=rng.randrange(9000)))
+            for recipe_id in rng.sample(range(1, count * 2), count)]
+
+
+def per_call(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e6
+
+
+def main(sizes=(10_000, 100_000, 1_000_000)):
+    start, end = datetime(2010, 1, 1), datetime(2010, 1, 7)
+    print(f"{'recipes':>9} {'lookup':>24} {'indexed us':>11} {'scan us':>11}")
+    for size in sizes:
+        recipes = synthetic_recipes(size)
+        repo = MemoryRepository()
+        for recipe in recipes:
+            repo.add_recipe(recipe)
+        repo.get_recipes()
+        target = recipes[len(recipes) // 2]
+
+        lookups = {
+            'get_recipe': (lambda: repo.get_recipe(target.id),
+                           lambda: next(r for r in recipes if r.id == target.id)),
+            'get_recipes_by_author': (lambda: repo.get_recipes_by_author(target.author.id),
+                                      lambda: [r for r in recipes if r.author.id == target.author.id]),
+            'get_recipes_by_category': (lambda: repo.get_recipes_by_category(target.category.id),
+                                        lambda: [r for r in recipes if r.category.id == target.category.id]),
+            'get_recipes_by_date_range': (lambda: repo.get_recipes_by_date_range(start, end),
+                                          lambda: [r for r in recipes if start <= r.date <= end]),
+            'get_recipes (page 50)': (lambda: repo.get_recipes(50, 20),
+                                      lambda: sorted(recipes)[980:1000]),
+        }
+        for label, (indexed, scan) in lookups.items():
+            print(f"{size:>9} {label:>24} {per_call(indexed, 1000):>11.2f} {per_call(scan, 1):>11.0f}")
+
+
+if __name__ == '__main__':
+    main(tuple(int(argument) for argument in sys.argv[1:]) or (10_000, 100_000, 1_000_000))
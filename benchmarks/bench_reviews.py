@@ -0,0 +1,49 @@
+"""Measures Recipe.add_review / remove_review cost as a recipe collects more reviews.
+
+The recipe belongs to an author and a category that list as many other recipes as it gets reviews, so the cost of
+keeping their aggregates up to date is measured too. Review is still a stub, so the benchmark gives it a rating
+attribute. Run from the project directory:
+python -m benchmarks.bench_reviews [sizes...]
+"""
+import random
+import sys
+import time
+
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+from recipe.domainmodel.review import Review
+
+
+class RatedReview(Review):
+    def __init__(self, rating: float):
+        self.rating = rating
+
+
+def main(sizes=(1_000, 10_000, 100_000)):
+    rng = random.Random(235)
+    print(f"{'reviews':>9} {'add us':>8} {'remove us':>10}")
+    for size in sizes:
+        author, category = Author(1, "Chef"), Category("Dinner", [], 1)
+        for recipe_id in range(2, size + 2):
+            other = Recipe(recipe_id, f"Recipe {recipe_id}", author, category=category, rating=3.0)
+            author.add_recipe(other)
+            category.add_recipe(other)
+        recipe = Recipe(1, "Popular", author, category=category)
+        author.add_recipe(recipe)
+        category.add_recipe(recipe)
+        reviews = [RatedReview(rng.randint(1, 5)) for _ in range(size)]
+        start = time.perf_counter()
+        for review in reviews:
+            recipe.add_review(review)
+        added = time.perf_counter() - start
+        rng.shuffle(reviews)
+        start = time.perf_counter()
+        for review in reviews:
+            recipe.remove_review(review)
+        removed = time.perf_counter() - start
+        print(f"{size:>9} {added / size * 1e6:>8.2f} {removed / size * 1e6:>10.2f}")
+
+
+if __name__ == '__main__':
+    main(tuple(int(argument) for argument in sys.argv[1:]) or (1_000, 10_000, 100_000))
@@ -0,0 +1,40 @@
+"""Measures build, load and query latency of the BM25 search index over recipes.csv.
+
+Run from the project directory: python -m benchmarks.bench_search
+"""
+import os
+import tempfile
+import time
+import timeit
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.searchindex import RecipeSearchIndex
+
+QUERIES = ('chocolate', 'chicken curry', 'banana muffins', 'low fat dessert', 'easy weeknight pasta with garlic')
+
+
+def main(number: int = 2000):
+    reader = CSVDataReader()
+    start = time.perf_counter()
+    index = RecipeSearchIndex.build(reader.recipes, reader.fingerprint)
+    print(f"build: {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'search.npz')
+        index.save(path)
+        start = time.perf_counter()
+        RecipeSearchIndex.load(path)
+        print(f"load:  {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    for query in QUERIES:
+        elapsed = timeit.timeit(lambda: index.search(query), number=number) / number
+        print(f"{query!r:36s} {elapsed * 1e6:7.1f} us ({index.search(query).total} matches)")
+
+    naive = timeit.timeit(lambda: [r.id for r in reader.recipes if 'chocolate' in r.name.lower()
+                                   or 'chocolate' in r.description.lower()
+                                   or any('chocolate' in i for i in r.ingredients)], number=20) / 20
+    print(f"naive substring scan for 'chocolate': {naive * 1e6:7.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""Compares a cold parse of recipes.csv with loading the binary snapshot.
+
+Run from the project directory: python -m benchmarks.bench_snapshot
+"""
+import os
+import tempfile
+import timeit
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+
+
+def main(repeat: int = 5):
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_file = os.path.join(directory, 'recipes.csv.snapshot')
+        CSVDataReader(snapshot_file=snapshot_file)
+
+        cold = min(timeit.repeat(lambda: CSVDataReader(use_snapshot=False), number=1, repeat=repeat))
+        warm = min(timeit.repeat(lambda: CSVDataReader(snapshot_file=snapshot_file), number=1, repeat=repeat))
+
+    print(f"cold parse:    {cold * 1000:8.1f} ms")
+    print(f"snapshot load: {warm * 1000:8.1f} ms")
+    print(f"speed-up:      {cold / warm:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Measures bulk-loading recipes.csv into SqliteRepository and its lookup latency against MemoryRepository.
+
+Run from the project directory: python -m benchmarks.bench_sqlite
+"""
+import os
+import tempfile
+import time
+import timeit
+from datetime import datetime
+
+from recipe.adapters.database_repository import SqliteRepository
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.repository_populate import populate
+
+
+def per_call(function, number: int = 1000) -> float:
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        database_file = os.path.join(directory, 'recipes.db')
+        started = time.perf_counter()
+        sqlite_repo = SqliteRepository(database_file)
+        count = sqlite_repo.load_csv()
+        load_seconds = time.perf_counter() - started
+        print(f"load_csv: {count} recipes in {load_seconds * 1000:.0f} ms "
+              f"({os.path.getsize(database_file) / 1e6:.1f} MB on disk)")
+
+        started = time.perf_counter()
+        memory_repo = MemoryRepository()
+        populate(memory_repo)
+        print(f"MemoryRepository populate: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        target = memory_repo.get_recipe(221)
+        start, end = datetime(2000, 1, 1), datetime(2000, 12, 31)
+        lookups = {
+            'get_recipe': lambda repo: repo.get_recipe(221),
+            'get_recipes_by_author': lambda repo: repo.get_recipes_by_author(target.author.id),
+            'get_recipes_by_category': lambda repo: repo.get_recipes_by_category(target.category.id),
+            'get_recipes_by_date_range': lambda repo: repo.get_recipes_by_date_range(start, end),
+            'get_recipes (page 50)': lambda repo: repo.get_recipes(50, 20),
+        }
+        print(f"{'lookup':>26} {'sqlite us':>11} {'memory us':>11}")
+        for label, lookup in lookups.items():
+            print(f"{label:>26} {per_call(lambda: lookup(sqlite_repo), 200):>11.1f} "
+                  f"{per_call(lambda: lookup(memory_repo)):>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,35 +1,121 @@
 """Initialize Flask app."""
-from datetime import datetime
-from flask import Flask, render_template
+import time
 
-# TODO: Access to the recipe should be implemented via the repository pattern and using blueprints, so this can not
-#  stay here!
+from flask import Flask, abort, make_response, render_template, request
 
-from recipe.domainmodel.recipe import Recipe
-from recipe.domainmodel.author import Author
+import recipe.adapters.repository as repo
+from recipe.adapters.catalogue_repository import CatalogueRepository
+from recipe.adapters.datareader.csvdatareader import DEFAULT_CSV_FILE, CSVDataReader
+from recipe.adapters.instrumentation import Instrumentation
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.pagecache import PageCache
+from recipe.adapters.reloader import CatalogueReloader
+from recipe.adapters.repository_populate import populate
 
+# The recipe shown on the home page.
+HOME_RECIPE_ID = 221
 
-# TODO: Access to the recipe should be implemented via the repository pattern and using blueprints, so this can not
-#  stay here!
-def create_some_recipe():
-    some_author = Author(1752, "Bob Ross")
-    some_recipe = Recipe(221, "Chocolate Chip Muffins", some_author)
-    some_recipe.description = "When I find my bananas getting too ripe I freeze them for later use.  Just thaw them in the microwave when you want to use.  Here is a recipe for chocolate chip muffins that uses one banana. They even taste healthy :-)"
-    some_recipe.images = ['https://img.sndimg.com/food/image/upload/w_555,h_416,c_fit,fl_progressive,q_95/v1/img/recipes/22/1/picmE4uiZ.jpg',
-     'https://img.sndimg.com/food/image/upload/w_555,h_416,c_fit,fl_progressive,q_95/v1/img/recipes/22/1/picjXaLFo.jpg']
-    return some_recipe
 
-
-def create_app():
+def create_app(test_config=None):
     """Construct the core application."""
 
     # Create the Flask app object.
     app = Flask(__name__)
+    app.config['PAGE_CACHE_MAX_BYTES'] = 16 * 1024 * 1024
+    # Seconds between checks of recipes.csv for changes; 0 turns hot reloading off.
+    app.config['RELOAD_INTERVAL'] = 5.0
+    # Request metrics at /metrics, Server-Timing headers and on-demand profiling; see Instrumentation.
+    app.config['INSTRUMENTATION'] = False
+    app.config['PROFILE_DIR'] = None
+    app.config['PROFILE_TOKEN'] = None
+    # 'memory' parses recipes.csv into a MemoryRepository in every worker process; 'catalogue' maps the compiled
+    # catalogue file instead, which starts at once and is shared by all workers through the page cache.
+    app.config['REPOSITORY'] = 'memory'
+    # Where the 'catalogue' repository keeps the compiled catalogue; None keeps it next to recipes.csv.
+    app.config['CATALOGUE_FILE'] = None
+    # Whether decoded rows are cached in recipes.csv.snapshot, so later starts skip parsing the CSV.
+    app.config['USE_SNAPSHOT'] = True
+    # Where the precomputed similar-recipe lists are kept between restarts; None keeps them in memory only.
+    app.config['SIMILAR_RECIPES_FILE'] = DEFAULT_CSV_FILE + '.similar.npz'
+    if test_config is not None:
+        app.config.update(test_config)
+
+    # Load the catalogue once; routes only do indexed lookups through the repository.
+    load_start = time.perf_counter()
+    if app.config['REPOSITORY'] == 'catalogue':
+        repository = CatalogueRepository.open(app.config['CATALOGUE_FILE'], DEFAULT_CSV_FILE)
+        data_version = repository.catalogue.fingerprint
+    elif app.config['REPOSITORY'] == 'memory':
+        reader = CSVDataReader(use_snapshot=app.config['USE_SNAPSHOT'])
+        repository = MemoryRepository()
+        populate(repository, reader)
+        data_version = reader.fingerprint
+    else:
+        raise ValueError(f"Unknown REPOSITORY: {app.config['REPOSITORY']!r}")
+    load_seconds = time.perf_counter() - load_start
+    page_cache = app.extensions['page_cache'] = PageCache(app.config['PAGE_CACHE_MAX_BYTES'])
+
+    instrumentation = None
+    if app.config['INSTRUMENTATION']:
+        instrumentation = Instrumentation(app)
+        repository = instrumentation.wrap_repository(repository)
+        instrumentation.metrics.add_collector(lambda: [
+            ('catalogue_load_seconds', 'gauge', "Time taken to read recipes.csv and populate the repository.",
+             [((), load_seconds)]),
+            *((f'page_cache_{name}_total', 'counter', f"Page cache {name}.", [((), value)])
+              for name, value in page_cache.stats().items() if name in ('hits', 'misses', 'evictions')),
+            ('page_cache_bytes', 'gauge', "Size of the cached page bodies.", [((), page_cache.size)]),
+        ])
+
+    # Rendered pages only change when the data does, so cache keys include the CSV fingerprint published with it.
+    repo.publish(repository, data_version)
+
+    def cached_page(template: str, recipe_id: int):
+        """ Serves a recipe page from the page cache, answering 304 when the client already has it. """
+        def render():
+            some_recipe = repository.get_recipe(recipe_id)
+            if some_recipe is None:
+                abort(404)
+            return render_template(template, recipe=some_recipe)
+
+        # Read the published pair once, so a concurrent reload cannot mix two data versions.
+        repository, data_version = repo.published
+        page = page_cache.get_or_render((template, recipe_id, data_version), render)
+        response = make_response(page.body)
+        response.content_type = 'text/html; charset=utf-8'
+        response.set_etag(page.etag)
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def reopen_catalogue(repository, source, changed) -> CatalogueRepository:
+        """ The reloader's rebuild for the 'catalogue' repository: recompiles the catalogue, unless another worker
+        already has, and maps the new file. """
+        reopened = CatalogueRepository.open(app.config['CATALOGUE_FILE'], DEFAULT_CSV_FILE)
+        if reopened.catalogue.fingerprint != source.fingerprint:
+            # The CSV changed again after the reloader read it; the next poll catches up.
+            raise ValueError("recipes.csv changed while its catalogue was compiled")
+        return reopened
+
+    with app.app_context():
+        # Register blueprints.
+        from recipe.api import api
+        app.register_blueprint(api.api_blueprint)
+
+    if not app.testing:
+        # Precompute the similar-recipe lists now, and after every reload, rather than in the first request for them.
+        api.prepare_similar_recipes(app, repo.published)
+
+    if app.config['RELOAD_INTERVAL'] and not app.testing:
+        reloader = app.extensions['catalogue_reloader'] = CatalogueReloader(
+            DEFAULT_CSV_FILE, app.config['RELOAD_INTERVAL'],
+            on_reload=lambda diff, fingerprint: api.prepare_similar_recipes(app, repo.published),
+            wrap_repository=instrumentation.wrap_repository if instrumentation is not None else None,
+            rebuild=reopen_catalogue if app.config['REPOSITORY'] == 'catalogue' else None)
+        reloader.start()
 
     @app.route('/')
     def home():
-        some_recipe = create_some_recipe()
         # Use Jinja to customize a predefined html page rendering the layout for showing a single recipe.
-        return render_template('recipeDescription.html', recipe=some_recipe)
+        return cached_page('recipeDescription.html', HOME_RECIPE_ID)
 
     return app
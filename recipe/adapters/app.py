@@ -5,10 +5,7 @@ import os
 
 app = Flask(__name__)
 
-# 添加 zip 过滤器到 Jinja2 环境
-app.jinja_env.filters['zip'] = zip
-
-# CSV 文件路径
+# CSV 文件路径；记录在启动时一次性解码，模板只做遍历
 csv_file_path = os.path.join('data', 'recipes.csv')
 data_reader = RandomCSVDataReader(csv_file_path)
 
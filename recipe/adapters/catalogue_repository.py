@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import Iterator
+
+from recipe.adapters.datareader.catalogue import RecipeCatalogue
+from recipe.adapters.repository import AbstractRepository, RepositoryException
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+
+
+class CatalogueRepository(AbstractRepository):
+    """ Read-only repository over a compiled, memory-mapped RecipeCatalogue.
+
+    Opening one maps the catalogue file rather than parsing recipes.csv, so a worker process starts serving almost at
+    once and every worker shares the same page-cache pages instead of holding its own copy of the catalogue. Every
+    query is a binary search or a slice of one of the catalogue's indexes. Recipes are LazyRecipe views created per
+    lookup; like SqliteRepository's, their Author and Category objects do not list their recipes, so use
+    get_recipes_by_author / get_recipes_by_category instead.
+    """
+
+    def __init__(self, catalogue: RecipeCatalogue):
+        self.__catalogue = catalogue
+        self.__categories_by_name: dict[str, Category] | None = None
+
+    @classmethod
+    def open(cls, catalogue_file: str = None, csv_file: str = None) -> "CatalogueRepository":
+        """ Opens the catalogue compiled from csv_file, compiling it first if it is missing or out of date. """
+        return cls(RecipeCatalogue.open(catalogue_file, csv_file))
+
+    @property
+    def catalogue(self) -> RecipeCatalogue:
+        return self.__catalogue
+
+    def add_recipe(self, recipe: Recipe):
+        raise RepositoryException("The recipe catalogue is read-only; recompile it from recipes.csv instead")
+
+    def get_recipe(self, recipe_id: int) -> Recipe | None:
+        return self.__catalogue.get_recipe(recipe_id)
+
+    def get_number_of_recipes(self) -> int:
+        return len(self.__catalogue)
+
+    def get_recipes(self, page: int = 1, per_page: int = 10) -> list[Recipe]:
+        if page < 1 or per_page < 1:
+            raise ValueError("page and per_page must be positive.")
+        start = (page - 1) * per_page
+        return list(self.__catalogue.recipes_by_rank(start, start + per_page))
+
+    def iter_recipes(self, after_id: int = None) -> Iterator[Recipe]:
+        return self.__catalogue.iter_by_id(after_id)
+
+    def get_recipes_by_author(self, author_id: int) -> list[Recipe]:
+        return self.__catalogue.recipes_by_author(author_id)
+
+    def get_recipes_by_category(self, category_id: int) -> list[Recipe]:
+        return self.__catalogue.recipes_by_category(category_id)
+
+    def get_recipes_by_date_range(self, start: datetime, end: datetime) -> list[Recipe]:
+        return self.__catalogue.recipes_by_date(start, end)
+
+    def get_author(self, author_id: int) -> Author | None:
+        return self.__catalogue.get_author(author_id)
+
+    def get_authors(self) -> list[Author]:
+        return self.__catalogue.authors
+
+    def get_category(self, category_id: int) -> Category | None:
+        return self.__catalogue.get_category(category_id)
+
+    def get_category_by_name(self, name: str) -> Category | None:
+        if self.__categories_by_name is None:
+            # A few dozen categories, so a name map per process costs next to nothing.
+            categories = {}
+            for category in self.__catalogue.categories:
+                categories.setdefault(category.name.lower(), category)
+            self.__categories_by_name = categories
+        return self.__categories_by_name.get(name.lower())
+
+    def get_categories(self) -> list[Category]:
+        return self.__catalogue.categories
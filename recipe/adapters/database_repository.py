@@ -0,0 +1,283 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator
+
+from recipe.adapters.datareader.csvdatareader import NUTRITION_COLUMNS, RecipeRecord, iter_recipes, make_nutrition
+from recipe.adapters.repository import AbstractRepository, RepositoryException
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+
+NUTRITION_FIELDS = tuple(attribute for attribute, _ in NUTRITION_COLUMNS)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS authors (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS recipes (
+    id INTEGER NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    author_id INTEGER NOT NULL REFERENCES authors (id),
+    category_id INTEGER REFERENCES categories (id),
+    cook_time INTEGER NOT NULL,
+    preparation_time INTEGER NOT NULL,
+    total_time INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    description TEXT NOT NULL,
+    images TEXT NOT NULL,
+    ingredient_quantities TEXT NOT NULL,
+    ingredients TEXT NOT NULL,
+    rating REAL,
+    {', '.join(f'{field} REAL' for field in NUTRITION_FIELDS)},
+    servings TEXT NOT NULL,
+    recipe_yield TEXT NOT NULL,
+    instructions TEXT NOT NULL
+);
+"""
+
+# Recipes are keyed by an implicit rowid so that it records insertion order, which the by-author and by-category
+# queries return like MemoryRepository does; the UNIQUE constraint on id gives the primary-key lookup its own index.
+INDEXES = (
+    ('recipes_author', 'author_id'),
+    ('recipes_category', 'category_id'),
+    ('recipes_date', 'date, id'),
+    ('recipes_rating', 'rating'),
+) + tuple((f'recipes_{field}', field) for field in NUTRITION_FIELDS)
+
+RECIPE_COLUMNS = ('id', 'name', 'author_id', 'category_id', 'cook_time', 'preparation_time', 'total_time', 'date',
+                  'description', 'images', 'ingredient_quantities', 'ingredients', 'rating') + NUTRITION_FIELDS + \
+                 ('servings', 'recipe_yield', 'instructions')
+
+# Statements are module constants so that sqlite3's per-connection statement cache prepares each one only once.
+INSERT_AUTHOR = "INSERT OR IGNORE INTO authors (id, name) VALUES (?, ?)"
+INSERT_CATEGORY = "INSERT OR IGNORE INTO categories (id, name) VALUES (?, ?)"
+INSERT_RECIPE = f"INSERT INTO recipes ({', '.join(RECIPE_COLUMNS)}) VALUES ({', '.join('?' * len(RECIPE_COLUMNS))})"
+SELECT_RECIPES = f"SELECT {', '.join(RECIPE_COLUMNS)} FROM recipes"
+SELECT_RECIPE = f"{SELECT_RECIPES} WHERE id = ?"
+SELECT_PAGE = f"{SELECT_RECIPES} ORDER BY id LIMIT ? OFFSET ?"
+SELECT_AFTER = f"{SELECT_RECIPES} WHERE id > ? ORDER BY id"
+SELECT_BY_AUTHOR = f"{SELECT_RECIPES} WHERE author_id = ? ORDER BY rowid"
+SELECT_BY_CATEGORY = f"{SELECT_RECIPES} WHERE category_id = ? ORDER BY rowid"
+SELECT_BY_DATE = f"{SELECT_RECIPES} WHERE date BETWEEN ? AND ? ORDER BY date, id"
+COUNT_RECIPES = "SELECT COUNT(*) FROM recipes"
+SELECT_AUTHOR = "SELECT id, name FROM authors WHERE id = ?"
+SELECT_AUTHORS = "SELECT id, name FROM authors ORDER BY rowid"
+SELECT_CATEGORY = "SELECT id, name FROM categories WHERE id = ?"
+SELECT_CATEGORY_BY_NAME = "SELECT id, name FROM categories WHERE name = ? COLLATE NOCASE ORDER BY id LIMIT 1"
+SELECT_CATEGORIES = "SELECT id, name FROM categories ORDER BY id"
+
+
+class SqliteRepository(AbstractRepository):
+    """ Repository backed by a local SQLite database file, so that worker processes share one copy of the catalogue.
+
+    Every thread gets its own connection. Rows are mapped back to Recipe, Author and Category objects on each
+    query; Author and Category objects are cached per repository so that recipes of the same author share one
+    instance. Those objects do not list their recipes, as that would mean loading the whole catalogue; use
+    get_recipes_by_author / get_recipes_by_category instead.
+    """
+
+    def __init__(self, database_file: str):
+        self.__database_file = database_file
+        self.__local = threading.local()
+        self.__authors: dict[int, Author] = {}
+        self.__categories: dict[int, Category] = {}
+        connection = self.__connection()
+        connection.executescript(SCHEMA)
+        self.__create_indexes(connection)
+
+    def __connection(self) -> sqlite3.Connection:
+        connection = getattr(self.__local, 'connection', None)
+        if connection is None:
+            # Autocommit mode: transactions are opened explicitly by __transaction, so that DDL such as the
+            # DROP INDEX statements of load_csv takes part in them instead of being committed on its own.
+            connection = sqlite3.connect(self.__database_file, cached_statements=64, isolation_level=None)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self.__local.connection = connection
+        return connection
+
+    @staticmethod
+    @contextmanager
+    def __transaction(connection: sqlite3.Connection):
+        connection.execute("BEGIN")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    @staticmethod
+    def __create_indexes(connection: sqlite3.Connection):
+        for name, columns in INDEXES:
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON recipes ({columns})")
+
+    def load_csv(self, csv_file: str = None) -> int:
+        """ Bulk loads recipes.csv in a single transaction and returns the number of recipes added.
+
+        Rows are streamed from iter_recipes straight into executemany, without building Recipe objects. Indexes are
+        dropped during the load and rebuilt afterwards, which is much faster than maintaining them row by row; the
+        drops are part of the same transaction, so a failed load leaves the indexes in place.
+        """
+        connection = self.__connection()
+        category_ids = {name: category_id for category_id, name in connection.execute(SELECT_CATEGORIES)}
+        next_category_id = max(category_ids.values(), default=0) + 1
+        new_categories = []
+        authors = {}
+
+        def recipe_rows():
+            nonlocal next_category_id
+            for values in iter_recipes(csv_file, fields=RecipeRecord._fields):
+                record = RecipeRecord(**values)
+                category_id = category_ids.get(record.category_name)
+                if category_id is None:
+                    category_id = category_ids[record.category_name] = next_category_id
+                    new_categories.append((category_id, record.category_name))
+                    next_category_id += 1
+                authors.setdefault(record.author_id, record.author_name)
+                yield self.__record_row(record, category_id)
+
+        with self.__transaction(connection):
+            for name, _ in INDEXES:
+                connection.execute(f"DROP INDEX IF EXISTS {name}")
+            count_before = connection.execute(COUNT_RECIPES).fetchone()[0]
+            try:
+                connection.executemany(INSERT_RECIPE, recipe_rows())
+            except sqlite3.IntegrityError as error:
+                raise RepositoryException(f"Could not load recipes: {error}") from error
+            connection.executemany(INSERT_AUTHOR, authors.items())
+            connection.executemany(INSERT_CATEGORY, new_categories)
+            self.__create_indexes(connection)
+            return connection.execute(COUNT_RECIPES).fetchone()[0] - count_before
+
+    @staticmethod
+    def __record_row(record: RecipeRecord, category_id: int | None) -> tuple:
+        return (record.id, record.name, record.author_id, category_id, record.cook_time, record.preparation_time,
+                record.total_time, (record.date if record.date else datetime.now()).isoformat(sep=' '),
+                record.description, json.dumps(record.images), json.dumps(record.ingredient_quantities),
+                json.dumps(record.ingredients), None, *record.nutrition,
+                record.servings if record.servings else "Not specified",
+                record.recipe_yield if record.recipe_yield else "Not specified", json.dumps(record.instructions))
+
+    @staticmethod
+    def __recipe_row(recipe: Recipe) -> tuple:
+        nutrition = recipe.nutrition
+        return (recipe.id, recipe.name, recipe.author.id, recipe.category.id if recipe.category else None,
+                recipe.cook_time, recipe.preparation_time, recipe.total_time, recipe.date.isoformat(sep=' '),
+                recipe.description, json.dumps(list(recipe.images)), json.dumps(list(recipe.ingredient_quantities)),
+                json.dumps(list(recipe.ingredients)), recipe.rating,
+                *(getattr(nutrition, field, None) for field in NUTRITION_FIELDS),
+                recipe.servings, recipe.recipe_yield, json.dumps(list(recipe.instructions)))
+
+    def __author(self, author_id: int, name: str = None) -> Author:
+        author = self.__authors.get(author_id)
+        if author is None:
+            if name is None:
+                row = self.__connection().execute(SELECT_AUTHOR, (author_id,)).fetchone()
+                name = row[1]
+            author = self.__authors.setdefault(author_id, Author(author_id, name))
+        return author
+
+    def __category(self, category_id: int | None, name: str = None) -> Category | None:
+        if category_id is None:
+            return None
+        category = self.__categories.get(category_id)
+        if category is None:
+            if name is None:
+                row = self.__connection().execute(SELECT_CATEGORY, (category_id,)).fetchone()
+                name = row[1]
+            category = self.__categories.setdefault(category_id, Category(name=name, category_id=category_id))
+        return category
+
+    def __to_recipe(self, row: tuple) -> Recipe:
+        values = dict(zip(RECIPE_COLUMNS, row))
+        return Recipe(
+            recipe_id=values['id'],
+            name=values['name'],
+            author=self.__author(values['author_id']),
+            cook_time=values['cook_time'],
+            preparation_time=values['preparation_time'],
+            total_time=values['total_time'],
+            created_date=datetime.fromisoformat(values['date']),
+            description=values['description'],
+            images=json.loads(values['images']),
+            category=self.__category(values['category_id']),
+            ingredient_quantities=json.loads(values['ingredient_quantities']),
+            ingredients=json.loads(values['ingredients']),
+            rating=values['rating'],
+            nutrition=make_nutrition(tuple(values[field] for field in NUTRITION_FIELDS)),
+            servings=values['servings'],
+            recipe_yield=values['recipe_yield'],
+            instructions=json.loads(values['instructions'])
+        )
+
+    def __query_recipes(self, sql: str, parameters: tuple) -> list[Recipe]:
+        return [self.__to_recipe(row) for row in self.__connection().execute(sql, parameters)]
+
+    def add_recipe(self, recipe: Recipe):
+        if not isinstance(recipe, Recipe):
+            raise TypeError("Expected a Recipe instance")
+        connection = self.__connection()
+        try:
+            with self.__transaction(connection):
+                connection.execute(INSERT_AUTHOR, (recipe.author.id, recipe.author.name))
+                if recipe.category is not None:
+                    connection.execute(INSERT_CATEGORY, (recipe.category.id, recipe.category.name))
+                connection.execute(INSERT_RECIPE, self.__recipe_row(recipe))
+        except sqlite3.IntegrityError as error:
+            raise RepositoryException(f"Recipe {recipe.id} could not be added: {error}") from error
+        self.__authors.setdefault(recipe.author.id, recipe.author)
+        if recipe.category is not None:
+            self.__categories.setdefault(recipe.category.id, recipe.category)
+
+    def get_recipe(self, recipe_id: int) -> Recipe | None:
+        row = self.__connection().execute(SELECT_RECIPE, (recipe_id,)).fetchone()
+        return self.__to_recipe(row) if row else None
+
+    def get_number_of_recipes(self) -> int:
+        return self.__connection().execute(COUNT_RECIPES).fetchone()[0]
+
+    def get_recipes(self, page: int = 1, per_page: int = 10) -> list[Recipe]:
+        if page < 1 or per_page < 1:
+            raise ValueError("page and per_page must be positive.")
+        return self.__query_recipes(SELECT_PAGE, (per_page, (page - 1) * per_page))
+
+    def iter_recipes(self, after_id: int = None) -> Iterator[Recipe]:
+        # Rows are fetched from the cursor as the caller iterates, never as one list.
+        for row in self.__connection().execute(SELECT_AFTER, (after_id if after_id is not None else -2 ** 63,)):
+            yield self.__to_recipe(row)
+
+    def get_recipes_by_author(self, author_id: int) -> list[Recipe]:
+        return self.__query_recipes(SELECT_BY_AUTHOR, (author_id,))
+
+    def get_recipes_by_category(self, category_id: int) -> list[Recipe]:
+        return self.__query_recipes(SELECT_BY_CATEGORY, (category_id,))
+
+    def get_recipes_by_date_range(self, start: datetime, end: datetime) -> list[Recipe]:
+        return self.__query_recipes(SELECT_BY_DATE, (start.isoformat(sep=' '), end.isoformat(sep=' ')))
+
+    def get_author(self, author_id: int) -> Author | None:
+        row = self.__connection().execute(SELECT_AUTHOR, (author_id,)).fetchone()
+        return self.__author(*row) if row else None
+
+    def get_authors(self) -> list[Author]:
+        return [self.__author(*row) for row in self.__connection().execute(SELECT_AUTHORS)]
+
+    def get_category(self, category_id: int) -> Category | None:
+        row = self.__connection().execute(SELECT_CATEGORY, (category_id,)).fetchone()
+        return self.__category(*row) if row else None
+
+    def get_category_by_name(self, name: str) -> Category | None:
+        row = self.__connection().execute(SELECT_CATEGORY_BY_NAME, (name,)).fetchone()
+        return self.__category(*row) if row else None
+
+    def get_categories(self) -> list[Category]:
+        return [self.__category(*row) for row in self.__connection().execute(SELECT_CATEGORIES)]
@@ -1,23 +1,150 @@
 # datareader/RandomCSVDataReader.py
-import pandas as pd
-import random
+import csv
 import os
+import random
+from array import array
+from itertools import zip_longest
+from typing import Callable, NamedTuple, Sequence
+
+# 只依赖同一包内的 decoders，这样 app.py 单独运行时也能导入本模块。
+from .decoders import NUTRITION_COLUMNS, float_or_none, int_or_zero, list_or_empty, text_or_none
+
+
+class AliasSampler:
+    """按权重抽样（Walker 别名法）：建表 O(n)，之后每次抽样 O(1)。"""
+
+    def __init__(self, weights: Sequence[float], rng: random.Random):
+        count = len(weights)
+        total = float(sum(weights))
+        if count == 0 or total <= 0 or any(weight < 0 for weight in weights):
+            raise ValueError("weights must be non-negative and have a positive sum.")
+        scaled = [weight * count / total for weight in weights]
+        self.__probability = array('d', [1.0]) * count
+        self.__alias = array('q', range(count))
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.__probability[less] = scaled[less]
+            self.__alias[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left over differs from 1.0 only by rounding error and keeps probability 1.0.
+        self.__rng = rng
+
+    def __len__(self) -> int:
+        return len(self.__alias)
+
+    def sample(self) -> int:
+        index = self.__rng.randrange(len(self.__alias))
+        return index if self.__rng.random() < self.__probability[index] else self.__alias[index]
+
+
+class RandomRecipe(NamedTuple):
+    """解码后的一条食谱：列表已解析、数字已转换，模板只需遍历。"""
+    id: int
+    name: str
+    author_name: str
+    category: str
+    description: str
+    images: tuple[str, ...]
+    preparation_time: int
+    cook_time: int
+    total_time: int
+    # (数量, 原料) 对；两列长度不一致时，缺的一边为空字符串。
+    ingredients: tuple[tuple[str, str], ...]
+    instructions: tuple[str, ...]
+    calories: float | None
+    fat_content: float | None
+    saturated_fat_content: float | None
+    cholesterol_content: float | None
+    sodium_content: float | None
+    carbohydrate_content: float | None
+    fiber_content: float | None
+    sugar_content: float | None
+    protein_content: float | None
+    servings: str | None
+    recipe_yield: str | None
+
+
+def _list(text: str) -> tuple[str, ...]:
+    return tuple(list_or_empty(text))
+
+
+def decode_random_recipe(row: dict) -> RandomRecipe:
+    """把 CSV 的一行（列名 -> 原始字符串）解码为 RandomRecipe。"""
+    return RandomRecipe(
+        int(row['RecipeId']),
+        row['Name'],
+        row['AuthorName'],
+        row['RecipeCategory'],
+        row['Description'],
+        _list(row['Images']),
+        int_or_zero(row['PrepTime']),
+        int_or_zero(row['CookTime']),
+        int_or_zero(row['TotalTime']),
+        tuple(zip_longest(_list(row['RecipeIngredientQuantities']), _list(row['RecipeIngredientParts']),
+                          fillvalue='')),
+        _list(row['RecipeInstructions']),
+        *(float_or_none(row[column]) for _, column in NUTRITION_COLUMNS),
+        text_or_none(row['RecipeServings']),
+        text_or_none(row['RecipeYield']),
+    )
+
 
 class RandomCSVDataReader:
-    def __init__(self, file_path):
+    """随机读取食谱。
+
+    加载时把每一行解码为不可变的 RandomRecipe 并常驻内存，所有请求共享同一批记录，
+    每次抽样只是一次下标访问，渲染时不再拆分字符串。
+    weights 可以是列名（如 'Rating'）或接收一行 dict、返回权重的函数；seed 相同则抽样序列相同。
+    """
+
+    def __init__(self, file_path, seed=None, weights: str | Callable[[dict], float] = None):
         self.file_path = file_path
-        self.data = None
+        self.fieldnames = None
+        self.weights = weights
+        self.rng = random.Random(seed)
+        self._records: list[RandomRecipe] = []
+        self._sampler = None
         self.load_data()
 
     def load_data(self):
         """加载 CSV 文件"""
-        if os.path.exists(self.file_path):
-            self.data = pd.read_csv(self.file_path)
-        else:
+        if not os.path.exists(self.file_path):
             raise FileNotFoundError(f"文件 {self.file_path} 不存在")
+        records = []
+        weights = []
+        with open(self.file_path, newline='', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            self.fieldnames = reader.fieldnames
+            for row in reader:
+                records.append(decode_random_recipe(row))
+                if self.weights:
+                    weights.append(self._weight(row))
+        self._records = records
+        self._sampler = AliasSampler(weights, self.rng) if self.weights else None
+
+    def _weight(self, row: dict) -> float:
+        if callable(self.weights):
+            return float(self.weights(row))
+        return float_or_none(row.get(self.weights)) or 0.0
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def get_recipe_at(self, index: int) -> RandomRecipe:
+        """返回第 index 条食谱记录（按文件顺序）"""
+        if not 0 <= index < len(self._records):
+            raise IndexError("recipe index out of range")
+        return self._records[index]
 
-    def get_random_recipe(self):
+    def get_random_recipe(self) -> RandomRecipe | None:
         """随机返回一条食谱记录"""
-        if self.data is None or self.data.empty:
+        if not self._records:
             return None
-        return self.data.sample(1).to_dict(orient='records')[0]
\ No newline at end of file
+        index = self._sampler.sample() if self._sampler else self.rng.randrange(len(self._records))
+        return self._records[index]
@@ -0,0 +1,370 @@
+import json
+import math
+import mmap
+import os
+import struct
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from recipe.adapters.datareader.csvdatareader import (DEFAULT_CSV_FILE, RecipeRecord, file_fingerprint,
+                                                      iter_recipes, make_nutrition, source_key)
+from recipe.adapters.datareader.lazyrecipe import LazyRecipe
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.nutrition import Nutrition
+
+# Bump whenever the file layout changes, so stale catalogues are recompiled.
+CATALOGUE_VERSION = 2
+MAGIC = b'RCAT'
+
+# magic, version, recipe/author/category counts, offsets of the author, category, author id, recipe id, group and
+# date tables and of the string heap, CSV size and mtime, CSV SHA-256.
+HEADER = struct.Struct('<4sHxxIIIQQQQQQQQq64s')
+
+# Variable-length fields live in the string heap and are referenced by (offset, length); lists are JSON arrays.
+STRING_FIELDS = ('name', 'description', 'images', 'ingredient_quantities', 'ingredients', 'servings',
+                 'recipe_yield', 'instructions')
+LIST_FIELDS = frozenset(('images', 'ingredient_quantities', 'ingredients', 'instructions'))
+
+# id, author index, category index, cook/preparation/total time, date in microseconds, nutrition, string refs.
+ROW = struct.Struct('<qIIiiiq9d' + 'QI' * len(STRING_FIELDS))
+# Rows of the recipe id index (id, row position) and of the author id index (id, author index), sorted by id.
+ID_ENTRY = struct.Struct('<qI')
+# Rows of the author and category tables: id, name offset, name length, and the slice of the group table that lists
+# the positions of their recipes: first slot, number of slots.
+NAME_ENTRY = struct.Struct('<qQIII')
+# Slots of the group table: a row position. Each author's and category's recipes are listed together, in CSV order.
+GROUP_SLOT = struct.Struct('<I')
+# Rows of the date index, sorted by date and then id: date in microseconds, id, row position.
+DATE_ENTRY = struct.Struct('<qqI')
+
+EPOCH = datetime(1970, 1, 1)
+NO_DATE = -2 ** 63
+NO_STRING = 0xFFFFFFFF
+
+
+class _StringHeap:
+    """ Append-only UTF-8 heap; identical strings are stored once. """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.__offsets: dict[str, tuple[int, int]] = {}
+
+    def add(self, text: str | None) -> tuple[int, int]:
+        if text is None:
+            return 0, NO_STRING
+        reference = self.__offsets.get(text)
+        if reference is None:
+            encoded = text.encode('utf-8')
+            reference = self.__offsets[text] = (len(self.data), len(encoded))
+            self.data += encoded
+        return reference
+
+
+def compile_catalogue(catalogue_file: str, csv_file: str = None) -> int:
+    """ Compiles recipes.csv into a read-only catalogue file and returns the number of recipes written.
+
+    Authors and categories are numbered like CSVDataReader numbers them (category ids in first-seen order). Besides
+    the rows, the file holds sorted indexes by recipe id, author id and date, and the recipe positions of every author
+    and category, so a CatalogueRepository answers each query from the mapped file. The file is written to a temporary
+    name and then renamed, so concurrent readers never see a partial catalogue.
+    """
+    csv_file = csv_file if csv_file else DEFAULT_CSV_FILE
+    size, mtime_ns = source_key(csv_file)
+    fingerprint = file_fingerprint(csv_file)
+
+    heap = _StringHeap()
+    rows = bytearray()
+    ids = []
+    dates = []
+    # index, id, name reference and the positions of its recipes, per author and per category in first-seen order.
+    authors: dict[int, tuple[int, int, tuple[int, int], list[int]]] = {}
+    categories: dict[str, tuple[int, int, tuple[int, int], list[int]]] = {}
+    for values in iter_recipes(csv_file, fields=RecipeRecord._fields):
+        position = len(ids)
+        author = authors.get(values['author_id'])
+        if author is None:
+            author = authors[values['author_id']] = \
+                (len(authors), values['author_id'], heap.add(values['author_name']), [])
+        author[3].append(position)
+        category = categories.get(values['category_name'])
+        if category is None:
+            category = categories[values['category_name']] = \
+                (len(categories), len(categories) + 1, heap.add(values['category_name']), [])
+        category[3].append(position)
+
+        date = values['date']
+        date = (date - EPOCH) // timedelta(microseconds=1) if date else NO_DATE
+        string_refs = []
+        for field in STRING_FIELDS:
+            value = values[field]
+            string_refs.extend(heap.add(json.dumps(value) if field in LIST_FIELDS else value))
+        ids.append((values['id'], position))
+        dates.append((date, values['id'], position))
+        rows += ROW.pack(
+            values['id'], author[0], category[0],
+            values['cook_time'], values['preparation_time'], values['total_time'], date,
+            *(math.nan if value is None else value for value in values['nutrition']),
+            *string_refs
+        )
+
+    groups = bytearray()
+    name_tables = []
+    for table in (authors, categories):
+        entries = bytearray()
+        for _, entry_id, name, positions in table.values():
+            entries += NAME_ENTRY.pack(entry_id, *name, len(groups) // GROUP_SLOT.size, len(positions))
+            groups += struct.pack(f'<{len(positions)}I', *positions)
+        name_tables.append(entries)
+    author_entries, category_entries = name_tables
+    author_ids = b''.join(ID_ENTRY.pack(author_id, author[0]) for author_id, author in sorted(authors.items()))
+    id_index = b''.join(ID_ENTRY.pack(recipe_id, position) for recipe_id, position in sorted(ids))
+    date_index = b''.join(DATE_ENTRY.pack(*entry) for entry in sorted(dates))
+
+    parts = (rows, author_entries, category_entries, author_ids, id_index, groups, date_index, heap.data)
+    offsets = [HEADER.size]
+    for part in parts:
+        offsets.append(offsets[-1] + len(part))
+    header = HEADER.pack(MAGIC, CATALOGUE_VERSION, len(ids), len(authors), len(categories), *offsets[1:-1],
+                         size, mtime_ns, fingerprint.encode('ascii'))
+
+    temp_file = f"{catalogue_file}.{os.getpid()}.tmp"
+    try:
+        with open(temp_file, 'wb') as file:
+            for part in (header, *parts):
+                file.write(part)
+        os.replace(temp_file, catalogue_file)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+    return len(ids)
+
+
+class RecipeCatalogue:
+    """ Read-only view of a compiled catalogue file, shared between processes through mmap.
+
+    Opening a catalogue maps the file and reads its header; nothing is decoded up front, so start-up is cheap and
+    every worker process shares the same page-cache pages. Recipes are returned as LazyRecipe views: the cheap fields
+    are unpacked from the fixed-width row when the view is created, and the text and list fields are decoded from the
+    string heap on first access. Views are created on each lookup and are not added to their author or category.
+    Lookups by recipe id, author id and date are binary searches of the file's sorted indexes.
+    """
+
+    def __init__(self, catalogue_file: str):
+        with open(catalogue_file, 'rb') as file:
+            self.__buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.__count, self.__author_count, self.__category_count, self.__authors_offset,
+             self.__categories_offset, self.__author_ids_offset, self.__id_index_offset, self.__groups_offset,
+             self.__date_index_offset, self.__heap_offset, self.__source_size, self.__source_mtime_ns,
+             fingerprint) = HEADER.unpack_from(self.__buffer, 0)
+        except struct.error:
+            self.__buffer.close()
+            raise ValueError(f"Not a recipe catalogue: {catalogue_file}") from None
+        if magic != MAGIC or version != CATALOGUE_VERSION:
+            self.__buffer.close()
+            raise ValueError(f"Unsupported recipe catalogue: {catalogue_file}")
+        self.__fingerprint = fingerprint.decode('ascii')
+        self.__authors: dict[int, Author] = {}
+        self.__categories: dict[int, Category] = {}
+
+    @classmethod
+    def open(cls, catalogue_file: str = None, csv_file: str = None) -> "RecipeCatalogue":
+        """ Opens the catalogue compiled from csv_file, compiling it first if it is missing or out of date. """
+        csv_file = csv_file if csv_file else DEFAULT_CSV_FILE
+        catalogue_file = catalogue_file if catalogue_file else csv_file + '.catalogue'
+        try:
+            catalogue = cls(catalogue_file)
+        except (OSError, ValueError):
+            catalogue = None
+        if catalogue is not None and not catalogue.__is_current(csv_file):
+            catalogue.close()
+            catalogue = None
+        if catalogue is None:
+            compile_catalogue(catalogue_file, csv_file)
+            catalogue = cls(catalogue_file)
+        return catalogue
+
+    def __is_current(self, csv_file: str) -> bool:
+        if source_key(csv_file) == (self.__source_size, self.__source_mtime_ns):
+            return True
+        return file_fingerprint(csv_file) == self.__fingerprint
+
+    @property
+    def fingerprint(self) -> str:
+        """ SHA-256 of the CSV file the catalogue was compiled from. """
+        return self.__fingerprint
+
+    def close(self) -> None:
+        self.__buffer.close()
+
+    def __enter__(self) -> "RecipeCatalogue":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __iter__(self) -> Iterator[LazyRecipe]:
+        return (self.recipe_at(position) for position in range(self.__count))
+
+    def __string(self, offset: int, length: int) -> str | None:
+        if length == NO_STRING:
+            return None
+        start = self.__heap_offset + offset
+        return self.__buffer[start:start + length].decode('utf-8')
+
+    def __name_entry(self, table_offset: int, index: int) -> tuple[int, str]:
+        entry_id, offset, length, _, _ = NAME_ENTRY.unpack_from(self.__buffer, table_offset + index * NAME_ENTRY.size)
+        return entry_id, self.__string(offset, length)
+
+    def __group(self, table_offset: int, index: int) -> list[LazyRecipe]:
+        """ The recipes listed in the group table for one author or category, in CSV order. """
+        _, _, _, first, count = NAME_ENTRY.unpack_from(self.__buffer, table_offset + index * NAME_ENTRY.size)
+        positions = struct.unpack_from(f'<{count}I', self.__buffer, self.__groups_offset + first * GROUP_SLOT.size)
+        return [self.recipe_at(position) for position in positions]
+
+    def __bisect(self, table_offset: int, count: int, entry: struct.Struct, key: tuple) -> int:
+        """ Binary search of a sorted table read straight from the mapped file: returns the index of the first entry
+        that is not less than key, comparing only as many fields as key has. """
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if entry.unpack_from(self.__buffer, table_offset + middle * entry.size)[:len(key)] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def author_at(self, index: int) -> Author:
+        author = self.__authors.get(index)
+        if author is None:
+            author = self.__authors[index] = Author(*self.__name_entry(self.__authors_offset, index))
+        return author
+
+    def category_at(self, index: int) -> Category:
+        category = self.__categories.get(index)
+        if category is None:
+            category_id, name = self.__name_entry(self.__categories_offset, index)
+            category = self.__categories[index] = Category(name=name, category_id=category_id)
+        return category
+
+    def __author_index(self, author_id: int) -> int | None:
+        rank = self.__bisect(self.__author_ids_offset, self.__author_count, ID_ENTRY, (author_id,))
+        if rank < self.__author_count:
+            entry_id, index = ID_ENTRY.unpack_from(self.__buffer, self.__author_ids_offset + rank * ID_ENTRY.size)
+            if entry_id == author_id:
+                return index
+        return None
+
+    def get_author(self, author_id: int) -> Author | None:
+        index = self.__author_index(author_id)
+        return self.author_at(index) if index is not None else None
+
+    def get_category(self, category_id: int) -> Category | None:
+        # Categories are numbered from 1 in table order.
+        return self.category_at(category_id - 1) if 0 < category_id <= self.__category_count else None
+
+    def recipes_by_author(self, author_id: int) -> list[LazyRecipe]:
+        index = self.__author_index(author_id)
+        return self.__group(self.__authors_offset, index) if index is not None else []
+
+    def recipes_by_category(self, category_id: int) -> list[LazyRecipe]:
+        if not 0 < category_id <= self.__category_count:
+            return []
+        return self.__group(self.__categories_offset, category_id - 1)
+
+    def recipes_by_date(self, start: datetime, end: datetime) -> list[LazyRecipe]:
+        """ Returns the recipes dated between start and end (both inclusive), ordered by date and then id. """
+        first = self.__bisect(self.__date_index_offset, self.__count, DATE_ENTRY,
+                              ((start - EPOCH) // timedelta(microseconds=1),))
+        last = self.__bisect(self.__date_index_offset, self.__count, DATE_ENTRY,
+                             ((end - EPOCH) // timedelta(microseconds=1) + 1,))
+        offset, size = self.__date_index_offset, DATE_ENTRY.size
+        return [self.recipe_at(DATE_ENTRY.unpack_from(self.__buffer, offset + rank * size)[2])
+                for rank in range(first, last)]
+
+    def iter_by_id(self, after_id: int = None) -> Iterator[LazyRecipe]:
+        """ Yields recipes in ascending id order, starting with the first id greater than after_id. """
+        start = self.__bisect(self.__id_index_offset, self.__count, ID_ENTRY, (after_id + 1,)) \
+            if after_id is not None else 0
+        return self.recipes_by_rank(start, self.__count)
+
+    def recipes_by_rank(self, start: int, stop: int) -> Iterator[LazyRecipe]:
+        """ Yields the recipes ranked start to stop (exclusive) in ascending id order. """
+        for rank in range(max(start, 0), min(stop, self.__count)):
+            _, position = ID_ENTRY.unpack_from(self.__buffer, self.__id_index_offset + rank * ID_ENTRY.size)
+            yield self.recipe_at(position)
+
+    @property
+    def authors(self) -> list[Author]:
+        return [self.author_at(index) for index in range(self.__author_count)]
+
+    @property
+    def categories(self) -> list[Category]:
+        return [self.category_at(index) for index in range(self.__category_count)]
+
+    def __position_of(self, recipe_id: int) -> int | None:
+        rank = self.__bisect(self.__id_index_offset, self.__count, ID_ENTRY, (recipe_id,))
+        if rank < self.__count:
+            entry_id, position = ID_ENTRY.unpack_from(self.__buffer, self.__id_index_offset + rank * ID_ENTRY.size)
+            if entry_id == recipe_id:
+                return position
+        return None
+
+    def get_recipe(self, recipe_id: int) -> LazyRecipe | None:
+        position = self.__position_of(recipe_id)
+        return self.recipe_at(position) if position is not None else None
+
+    def recipe_at(self, position: int) -> LazyRecipe:
+        """ Returns the recipe stored at the given position, in CSV order. """
+        if not 0 <= position < self.__count:
+            raise IndexError("catalogue position out of range")
+        offset = HEADER.size + position * ROW.size
+        values = ROW.unpack_from(self.__buffer, offset)
+        recipe_id, author_index, category_index, cook_time, preparation_time, total_time, date = values[:7]
+        refs = values[16:]
+        return LazyRecipe(
+            recipe_id=recipe_id,
+            name=self.__string(refs[0], refs[1]),
+            author=self.author_at(author_index),
+            cook_time=cook_time,
+            preparation_time=preparation_time,
+            total_time=total_time,
+            created_date=EPOCH + timedelta(microseconds=date) if date != NO_DATE else None,
+            category=self.category_at(category_index),
+            servings=self.__string(refs[10], refs[11]),
+            recipe_yield=self.__string(refs[12], refs[13]),
+            source=self,
+            offset=offset,
+            length=ROW.size
+        )
+
+    def load_record(self, offset: int, length: int) -> RecipeRecord:
+        """ Decodes the full row stored at the given byte range of the catalogue; used by LazyRecipe. """
+        values = ROW.unpack(self.__buffer[offset:offset + length])
+        (recipe_id, author_index, category_index, cook_time, preparation_time, total_time, date) = values[:7]
+        author = self.author_at(author_index)
+        refs = values[16:]
+        strings = {field: self.__string(refs[2 * index], refs[2 * index + 1])
+                   for index, field in enumerate(STRING_FIELDS)}
+        for field in LIST_FIELDS:
+            strings[field] = json.loads(strings[field])
+        return RecipeRecord(
+            id=recipe_id,
+            author_id=author.id,
+            author_name=author.name,
+            cook_time=cook_time,
+            preparation_time=preparation_time,
+            total_time=total_time,
+            date=EPOCH + timedelta(microseconds=date) if date != NO_DATE else None,
+            category_name=self.category_at(category_index).name,
+            nutrition=tuple(None if math.isnan(value) else value for value in values[7:16]),
+            **strings
+        )
+
+    @staticmethod
+    def make_nutrition(values: tuple) -> Nutrition:
+        return make_nutrition(values)
@@ -0,0 +1,133 @@
+from typing import Iterable
+
+import numpy as np
+
+from recipe.adapters.datareader.csvdatareader import NUTRITION_COLUMNS, iter_recipes
+
+TIME_COLUMNS = ('cook_time', 'preparation_time', 'total_time')
+NUTRITION_FIELDS = tuple(attribute for attribute, _ in NUTRITION_COLUMNS)
+FLOAT_COLUMNS = TIME_COLUMNS + NUTRITION_FIELDS + ('rating',)
+ID_COLUMNS = ('recipe_id', 'author_id', 'category_id')
+
+
+class RecipeColumnStore:
+    """ Numeric recipe attributes held column-wise in NumPy arrays, one array element per recipe.
+
+    Times, nutrition values and ratings are float64 columns with NaN for missing values; recipe, author and category
+    ids are integer columns. Queries are vectorised over whole columns and return arrays of recipe ids.
+    Range filters are given as keyword arguments, e.g. store.filter(total_time=(None, 30), calories=(100, 400)),
+    where each bound is inclusive and None leaves that side open. Rows whose value is NaN never satisfy a range.
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray]):
+        missing = set(ID_COLUMNS + FLOAT_COLUMNS) - set(columns)
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(sorted(missing))}")
+        self.__columns = dict(columns)
+        for array in self.__columns.values():
+            array.flags.writeable = False
+        self.__positions = {int(recipe_id): index for index, recipe_id in enumerate(columns['recipe_id'])}
+
+    @classmethod
+    def from_csv(cls, csv_file: str = None) -> "RecipeColumnStore":
+        """ Builds the store in one streaming pass over recipes.csv, decoding only the numeric columns.
+
+        Category ids are assigned in first-seen order, matching CSVDataReader. Ratings start as NaN because the CSV
+        has none; use set_rating to fill them in.
+        """
+        fields = ('id', 'author_id', 'category_name') + TIME_COLUMNS + ('nutrition',)
+        return cls.from_records(iter_recipes(csv_file, fields=fields))
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "RecipeColumnStore":
+        ids, author_ids, category_ids = [], [], []
+        times = {name: [] for name in TIME_COLUMNS}
+        nutrition = []
+        category_dict = {}
+        for record in records:
+            ids.append(record['id'])
+            author_ids.append(record['author_id'])
+            category_ids.append(category_dict.setdefault(record['category_name'], len(category_dict) + 1))
+            for name in TIME_COLUMNS:
+                times[name].append(record[name])
+            nutrition.append(record['nutrition'])
+
+        columns = {
+            'recipe_id': np.array(ids, dtype=np.int64),
+            'author_id': np.array(author_ids, dtype=np.int64),
+            'category_id': np.array(category_ids, dtype=np.int32),
+            'rating': np.full(len(ids), np.nan),
+        }
+        for name in TIME_COLUMNS:
+            columns[name] = np.array(times[name], dtype=np.float64)
+        # None becomes NaN when converting an object array to float.
+        nutrition_matrix = np.array(nutrition, dtype=np.float64).reshape(len(ids), len(NUTRITION_FIELDS))
+        for index, name in enumerate(NUTRITION_FIELDS):
+            columns[name] = np.ascontiguousarray(nutrition_matrix[:, index])
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self.__columns['recipe_id'])
+
+    @property
+    def column_names(self) -> tuple[str, ...]:
+        return tuple(self.__columns)
+
+    def column(self, name: str) -> np.ndarray:
+        """ Returns a read-only view of one column. """
+        try:
+            return self.__columns[name]
+        except KeyError:
+            raise KeyError(f"Unknown column: {name}") from None
+
+    def set_rating(self, recipe_id: int, rating: float | None) -> None:
+        position = self.__positions.get(recipe_id)
+        if position is None:
+            raise KeyError(f"Unknown recipe id: {recipe_id}")
+        ratings = self.__columns['rating']
+        ratings.flags.writeable = True
+        ratings[position] = np.nan if rating is None else rating
+        ratings.flags.writeable = False
+
+    def mask(self, **ranges: tuple[float | None, float | None]) -> np.ndarray:
+        """ Returns a boolean array selecting the rows whose values lie within every given range. """
+        selected = np.ones(len(self), dtype=bool)
+        for name, (low, high) in ranges.items():
+            values = self.column(name)
+            if low is not None:
+                selected &= values >= low
+            if high is not None:
+                selected &= values <= high
+            if low is None and high is None and values.dtype.kind == 'f':
+                selected &= ~np.isnan(values)
+        return selected
+
+    def filter(self, **ranges: tuple[float | None, float | None]) -> np.ndarray:
+        """ Returns the ids of the recipes that satisfy every range, in catalogue order. """
+        return self.__columns['recipe_id'][self.mask(**ranges)]
+
+    def sort(self, by: str, descending: bool = False, **ranges: tuple[float | None, float | None]) -> np.ndarray:
+        """ Returns the ids of the recipes that satisfy every range, ordered by one column (NaN last). """
+        positions = np.flatnonzero(self.mask(**ranges))
+        keys = self.column(by)[positions]
+        order = np.argsort(-keys if descending else keys, kind='stable')
+        return self.__columns['recipe_id'][positions[order]]
+
+    def top_k(self, by: str, k: int, descending: bool = True,
+              **ranges: tuple[float | None, float | None]) -> np.ndarray:
+        """ Returns the ids of the k recipes with the largest (or smallest) values of one column, best first.
+
+        Recipes without a value in that column are skipped. Uses a partial sort, so it is linear in the number of
+        matching recipes rather than n log n.
+        """
+        ranges.setdefault(by, (None, None))
+        positions = np.flatnonzero(self.mask(**ranges))
+        keys = self.column(by)[positions]
+        if descending:
+            keys = -keys
+        if k < len(positions):
+            candidates = np.argpartition(keys, k - 1)[:k]
+        else:
+            candidates = np.arange(len(positions))
+        best = candidates[np.argsort(keys[candidates], kind='stable')]
+        return self.__columns['recipe_id'][positions[best]]
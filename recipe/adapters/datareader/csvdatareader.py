@@ -1,107 +1,446 @@
-import ast
+import io
 import os
 import csv
+import hashlib
+import pickle
+import sys
+import warnings
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from typing import Callable, Iterable, Iterator, NamedTuple
 
+from recipe.adapters.datareader.dateparser import DateParser, describe_unparseable, unparseable_since
+from recipe.adapters.datareader.decoders import NUTRITION_COLUMNS, float_or_none, int_or_zero, list_or_empty, \
+    text_or_none
+from recipe.adapters.datareader.lazyrecipe import LazyRecipe
 from recipe.domainmodel.author import Author
 from recipe.domainmodel.category import Category
+from recipe.domainmodel.compacturls import CompactUrls, UrlPrefixes
 from recipe.domainmodel.nutrition import Nutrition
 from recipe.domainmodel.recipe import Recipe
 
+DEFAULT_CSV_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'recipes.csv')
+
+# Bump whenever the decoded row records change (their layout, or which strings they share), so stale snapshots
+# are rebuilt.
+SNAPSHOT_VERSION = 4
+
+# Prefixes of every image URL loaded in this process. A few hundred distinct prefixes cover the whole dataset.
+IMAGE_URL_PREFIXES = UrlPrefixes()
+
+
+class RecipeRecord(NamedTuple):
+    """ One decoded row of recipes.csv, holding plain values only. """
+    id: int
+    name: str
+    author_id: int
+    author_name: str
+    cook_time: int
+    preparation_time: int
+    total_time: int
+    date: datetime | None
+    description: str
+    images: list[str]
+    category_name: str
+    ingredient_quantities: list[str]
+    ingredients: list[str]
+    nutrition: tuple
+    servings: str | None
+    recipe_yield: str | None
+    instructions: list[str]
+
+
+# Shared by every reading mode, so each distinct DatePublished value is parsed once per process.
+DATE_PARSER = DateParser()
+
+
+def parse_date(date_str: str) -> datetime | None:
+    return DATE_PARSER.parse(date_str)
+
+
+def _interned_list(text: str) -> list[str]:
+    # A couple of thousand distinct ingredient and quantity strings make up some forty thousand list items.
+    return [sys.intern(item) for item in list_or_empty(text)]
+
+
+def _reinterned(record: RecipeRecord) -> RecipeRecord:
+    """ Interns again, in this process, the strings that decoding interned in another. """
+    return record._replace(category_name=sys.intern(record.category_name),
+                           ingredient_quantities=[sys.intern(item) for item in record.ingredient_quantities],
+                           ingredients=[sys.intern(item) for item in record.ingredients])
+
+
+def compact_urls(urls: Iterable[str]) -> CompactUrls:
+    return CompactUrls(urls, IMAGE_URL_PREFIXES)
+
+
+# How each RecipeRecord field is decoded from a csv.DictReader row. Every reading mode (eager, parallel, lazy,
+# streaming) goes through this table, so a column is converted the same way everywhere.
+FIELD_DECODERS: dict[str, Callable[[dict], object]] = {
+    'id': lambda row: int(row['RecipeId']),
+    'name': lambda row: row['Name'],
+    'author_id': lambda row: int(row['AuthorId']),
+    'author_name': lambda row: row['AuthorName'],
+    'cook_time': lambda row: int_or_zero(row['CookTime']),
+    'preparation_time': lambda row: int_or_zero(row['PrepTime']),
+    'total_time': lambda row: int_or_zero(row['TotalTime']),
+    'date': lambda row: parse_date(row['DatePublished']),
+    'description': lambda row: row['Description'],
+    'images': lambda row: list_or_empty(row['Images']),
+    'category_name': lambda row: sys.intern(row['RecipeCategory']),
+    'ingredient_quantities': lambda row: _interned_list(row['RecipeIngredientQuantities']),
+    'ingredients': lambda row: _interned_list(row['RecipeIngredientParts']),
+    'nutrition': lambda row: tuple(float_or_none(row[column]) for _, column in NUTRITION_COLUMNS),
+    'servings': lambda row: text_or_none(row['RecipeServings']),
+    'recipe_yield': lambda row: text_or_none(row['RecipeYield']),
+    'instructions': lambda row: list_or_empty(row['RecipeInstructions']),
+}
+_RECORD_DECODERS = tuple(FIELD_DECODERS[field] for field in RecipeRecord._fields)
+
+
+def decode_row(row: dict) -> RecipeRecord:
+    """ Converts one CSV row into a record of plain values (the form cached in snapshots). """
+    return RecipeRecord._make([decode(row) for decode in _RECORD_DECODERS])
+
+
+def source_key(path: str) -> tuple[int, int]:
+    """ The (size, mtime_ns) of a file: caches built from it are reused without hashing while these are unchanged. """
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def data_fingerprint(data: bytes) -> str:
+    """ The data version of a CSV file's content, which every cache built from the file is tagged with. """
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_fingerprint(path: str) -> str:
+    """ data_fingerprint of a file's content, read in blocks. """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def make_nutrition(values: tuple) -> Nutrition:
+    return Nutrition.from_values(values)
+
+
+def make_recipe(record: RecipeRecord, author: Author, category: Category) -> Recipe:
+    return Recipe(
+        recipe_id=record.id,
+        name=record.name,
+        author=author,
+        cook_time=record.cook_time,
+        preparation_time=record.preparation_time,
+        total_time=record.total_time,
+        created_date=record.date,
+        description=record.description,
+        images=compact_urls(record.images),
+        category=category,
+        ingredient_quantities=record.ingredient_quantities,
+        ingredients=record.ingredients,
+        nutrition=make_nutrition(record.nutrition),
+        servings=record.servings,
+        recipe_yield=record.recipe_yield,
+        instructions=record.instructions
+    )
+
+
+def iter_recipes(csv_file: str = None, fields: Iterable[str] = None,
+                 where: dict[str, Callable[[object], bool]] = None) -> Iterator[Recipe | dict]:
+    """ Streams recipes.csv one row at a time, keeping nothing but the current row in memory.
+
+    Without `fields`, yields Recipe objects. Their authors and categories are shared between rows (categories get the
+    same ids as in CSVDataReader) but do not collect the recipes. With `fields`, yields dicts holding only those
+    RecipeRecord fields, and only those columns are decoded. `where` maps field names to predicates on the decoded
+    value; they are evaluated in order before anything else in the row is decoded, and the first False skips the row.
+    """
+    fields = tuple(fields) if fields is not None else None
+    where = where if where else {}
+    unknown = (set(fields or ()) | set(where)) - set(FIELD_DECODERS)
+    if unknown:
+        raise ValueError(f"Unknown recipe fields: {', '.join(sorted(unknown))}")
+
+    authors = {}
+    categories = {}
+    with open(csv_file if csv_file else DEFAULT_CSV_FILE, 'r', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            if fields is None:
+                category_name = row['RecipeCategory']
+                if category_name not in categories:
+                    categories[category_name] = Category(name=category_name, category_id=len(categories) + 1)
+
+            values = {}
+            for field, predicate in where.items():
+                value = values[field] = FIELD_DECODERS[field](row)
+                if not predicate(value):
+                    break
+            else:
+                if fields is not None:
+                    yield {field: values[field] if field in values else FIELD_DECODERS[field](row) for field in fields}
+                    continue
+
+                record = RecipeRecord._make([values[field] if field in values else decode(row)
+                                             for field, decode in zip(RecipeRecord._fields, _RECORD_DECODERS)])
+                author = authors.get(record.author_id)
+                if author is None:
+                    author = authors[record.author_id] = Author(record.author_id, record.author_name)
+                yield make_recipe(record, author, categories[record.category_name])
+
+
 class CSVDataReader:
-    def __init__(self):
-        self.csv_file = os.path.join(os.path.dirname(__file__), '..', 'data', 'recipes.csv')
+    def __init__(self, csv_file: str = None, snapshot_file: str = None, use_snapshot: bool = True,
+                 parallel: bool = False, workers: int = None, lazy: bool = False):
+        self.csv_file = csv_file if csv_file else DEFAULT_CSV_FILE
+        self.snapshot_file = snapshot_file if snapshot_file else self.csv_file + '.snapshot'
+        self.use_snapshot = use_snapshot
+        self.parallel = parallel
+        self.workers = workers if workers else os.cpu_count() or 1
+        self.lazy = lazy
         self.authors = []
         self.categories = []
         self.recipes = []
+        self._fieldnames = None
+        self._author_dict = {}
+        self._category_dict = {}
+        self._fingerprint = None
+        # DatePublished values that could not be parsed during this load, with how many rows had each.
+        self.unparseable_dates: dict[str, int] = {}
         self._read_csv()
 
+    @property
+    def fingerprint(self) -> str:
+        """ SHA-256 of the CSV file, identifying the data version for caches built from this reader. """
+        if self._fingerprint is None:
+            self._fingerprint = self._source_hash()
+        return self._fingerprint
+
     def _read_csv(self):
         if not os.path.exists(self.csv_file):
             raise FileNotFoundError(f"CSV file not found: {self.csv_file}")
 
-        author_dict = {}
-        category_dict = {}
-        category_id_counter = 1
+        if self.lazy:
+            before = DATE_PARSER.unparseable
+            self._build_index()
+            self.unparseable_dates = unparseable_since(before, DATE_PARSER.unparseable)
+        else:
+            records = self._load_snapshot() if self.use_snapshot else None
+            if records is None:
+                records = self._parse_records()
+                if self.use_snapshot:
+                    self._save_snapshot(records)
+            self._build(records)
+
+        if self.unparseable_dates:
+            # One warning per load rather than one per row; the full list is in unparseable_dates.
+            warnings.warn(describe_unparseable(self.unparseable_dates, os.path.basename(self.csv_file)),
+                          stacklevel=3)
 
+    def _parse_records(self) -> list[RecipeRecord]:
+        if self.parallel and self.workers > 1:
+            return self._parse_records_parallel()
+        before = DATE_PARSER.unparseable
         with open(self.csv_file, 'r', encoding='utf-8') as file:
             reader = csv.DictReader(file)
-            for row in reader:
-                recipe_id = int(row['RecipeId'])
-                name = row['Name']
-                author_id = int(row['AuthorId'])
-                author_name = row['AuthorName']
-                cook_time = int(row['CookTime']) if row['CookTime'] and row['CookTime'] != 'NA' else 0
-                prep_time = int(row['PrepTime']) if row['PrepTime'] and row['PrepTime'] != 'NA' else 0
-                date_published = self._parse_date(row['DatePublished'])
-                description = row['Description']
-                images_str = row['Images']
-                images = ast.literal_eval(images_str) if images_str and images_str != 'NA' else []
-                category_name = row['RecipeCategory']
-                ingredient_quantities_str = row['RecipeIngredientQuantities']
-                ingredient_quantities = ast.literal_eval(ingredient_quantities_str) if ingredient_quantities_str and ingredient_quantities_str != 'NA' else []
-                ingredient_parts_str = row['RecipeIngredientParts']
-                ingredients = ast.literal_eval(ingredient_parts_str) if ingredient_parts_str and ingredient_parts_str != 'NA' else []
-                nutrition = Nutrition()
-                nutrition.calories = float(row['Calories']) if row['Calories'] and row['Calories'] != 'NA' else None
-                nutrition.fat_content = float(row['FatContent']) if row['FatContent'] and row['FatContent'] != 'NA' else None
-                nutrition.saturated_fat_content = float(row['SaturatedFatContent']) if row['SaturatedFatContent'] and row['SaturatedFatContent'] != 'NA' else None
-                nutrition.cholesterol_content = float(row['CholesterolContent']) if row['CholesterolContent'] and row['CholesterolContent'] != 'NA' else None
-                nutrition.sodium_content = float(row['SodiumContent']) if row['SodiumContent'] and row['SodiumContent'] != 'NA' else None
-                nutrition.carbohydrate_content = float(row['CarbohydrateContent']) if row['CarbohydrateContent'] and row['CarbohydrateContent'] != 'NA' else None
-                nutrition.fiber_content = float(row['FiberContent']) if row['FiberContent'] and row['FiberContent'] != 'NA' else None
-                nutrition.sugar_content = float(row['SugarContent']) if row['SugarContent'] and row['SugarContent'] != 'NA' else None
-                nutrition.protein_content = float(row['ProteinContent']) if row['ProteinContent'] and row['ProteinContent'] != 'NA' else None
-                servings = row['RecipeServings'] if row['RecipeServings'] != 'NA' else None
-                recipe_yield = row['RecipeYield'] if row['RecipeYield'] != 'NA' else None
-                instructions_str = row['RecipeInstructions']
-                instructions = ast.literal_eval(instructions_str) if instructions_str and instructions_str != 'NA' else []
-
-                if author_id not in author_dict:
-                    author = Author(author_id, author_name)
-                    author_dict[author_id] = author
-                    self.authors.append(author)
-                else:
-                    author = author_dict[author_id]
-
-                if category_name not in category_dict:
-                    category = Category(name=category_name, category_id=category_id_counter)
-                    category_dict[category_name] = category
-                    self.categories.append(category)
-                    category_id_counter += 1
-                else:
-                    category = category_dict[category_name]
-
-                recipe = Recipe(
-                    recipe_id=recipe_id,
-                    name=name,
-                    author=author,
-                    cook_time=cook_time,
-                    preparation_time=prep_time,
-                    created_date=date_published,
-                    description=description,
-                    images=images,
-                    category=category,
-                    ingredient_quantities=ingredient_quantities,
-                    ingredients=ingredients,
-                    nutrition=nutrition,
-                    servings=servings,
-                    recipe_yield=recipe_yield,
-                    instructions=instructions
+            records = [self._decode_row(row) for row in reader]
+        self.unparseable_dates = unparseable_since(before, DATE_PARSER.unparseable)
+        return records
+
+    def _parse_records_parallel(self) -> list[RecipeRecord]:
+        """ Parses byte-range chunks of the CSV in a process pool and concatenates the records in file order. """
+        with open(self.csv_file, 'rb') as file:
+            data = file.read()
+        header_end = data.find(b'\n') + 1
+        fieldnames = next(csv.reader([data[:header_end].decode('utf-8')]))
+        boundaries = self._chunk_boundaries(data, header_end, self.workers * 4)
+        del data
+
+        chunks = list(zip(boundaries, boundaries[1:]))
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks))) as executor:
+            results = executor.map(self._parse_chunk, [start for start, _ in chunks], [end for _, end in chunks],
+                                   [fieldnames] * len(chunks))
+            records = []
+            unparseable = Counter()
+            for chunk_records, chunk_unparseable in results:
+                # Unpickling gives every chunk its own copy of each string its worker interned.
+                records.extend(map(_reinterned, chunk_records))
+                unparseable.update(chunk_unparseable)
+        self.unparseable_dates = dict(unparseable)
+        return records
+
+    @staticmethod
+    def _chunk_boundaries(data: bytes, start: int, chunk_count: int) -> list[int]:
+        """ Splits data[start:] into roughly equal ranges that begin and end on row boundaries.
+
+        A newline ends a row only when it lies outside a quoted field, i.e. when an even number of quote characters
+        precede it. Quoted fields may span lines, so candidate split points are advanced until that holds.
+        """
+        size = len(data)
+        boundaries = [start]
+        quotes = 0
+        previous = start
+        for index in range(1, chunk_count):
+            target = start + (size - start) * index // chunk_count
+            if target <= boundaries[-1]:
+                continue
+            position = data.find(b'\n', target)
+            while position != -1:
+                quotes += data.count(b'"', previous, position)
+                previous = position
+                if quotes % 2 == 0:
+                    break
+                position = data.find(b'\n', position + 1)
+            if position == -1:
+                break
+            boundaries.append(position + 1)
+        if boundaries[-1] != size:
+            boundaries.append(size)
+        return boundaries
+
+    def _parse_chunk(self, start: int, end: int, fieldnames: list[str]) -> tuple[list[RecipeRecord], dict[str, int]]:
+        """ Runs in a worker process; returns the chunk's records and the dates it could not parse. """
+        with open(self.csv_file, 'rb') as file:
+            file.seek(start)
+            chunk = file.read(end - start)
+        before = DATE_PARSER.unparseable
+        with io.TextIOWrapper(io.BytesIO(chunk), encoding='utf-8') as text:
+            records = [self._decode_row(row) for row in csv.DictReader(text, fieldnames=fieldnames)]
+        return records, unparseable_since(before, DATE_PARSER.unparseable)
+
+    def _decode_row(self, row: dict) -> RecipeRecord:
+        return decode_row(row)
+
+    def _build(self, records: list[RecipeRecord]):
+        for record in records:
+            author = self._get_author(record.author_id, record.author_name)
+            category = self._get_category(record.category_name)
+            self._add_recipe(make_recipe(record, author, category))
+
+    def _build_index(self):
+        """ Builds LazyRecipe objects from the cheap columns, remembering the byte range of each row. """
+        with open(self.csv_file, 'rb') as file:
+            line_offsets = []
+            reader = csv.reader(self._tracked_lines(file, line_offsets))
+            self._fieldnames = next(reader)
+
+            start_line = reader.line_num
+            for values in reader:
+                offset = line_offsets[start_line]
+                end_line = reader.line_num
+                length = line_offsets[end_line] - offset if end_line < len(line_offsets) else file.tell() - offset
+                start_line = end_line
+
+                row = dict(zip(self._fieldnames, values))
+                recipe = LazyRecipe(
+                    recipe_id=FIELD_DECODERS['id'](row),
+                    name=FIELD_DECODERS['name'](row),
+                    author=self._get_author(FIELD_DECODERS['author_id'](row), FIELD_DECODERS['author_name'](row)),
+                    cook_time=FIELD_DECODERS['cook_time'](row),
+                    preparation_time=FIELD_DECODERS['preparation_time'](row),
+                    total_time=FIELD_DECODERS['total_time'](row),
+                    created_date=FIELD_DECODERS['date'](row),
+                    category=self._get_category(FIELD_DECODERS['category_name'](row)),
+                    servings=FIELD_DECODERS['servings'](row),
+                    recipe_yield=FIELD_DECODERS['recipe_yield'](row),
+                    source=self,
+                    offset=offset,
+                    length=length
                 )
+                self._add_recipe(recipe)
+
+    @staticmethod
+    def _tracked_lines(file, line_offsets: list[int]):
+        """ Yields the decoded lines of a binary file, appending the byte offset of each line to line_offsets. """
+        offset = file.tell()
+        for line in file:
+            line_offsets.append(offset)
+            offset += len(line)
+            yield line.decode('utf-8')
+
+    def load_record(self, offset: int, length: int) -> RecipeRecord:
+        """ Decodes the single row stored at the given byte range of the CSV file. """
+        with open(self.csv_file, 'rb') as file:
+            file.seek(offset)
+            raw = file.read(length)
+        with io.TextIOWrapper(io.BytesIO(raw), encoding='utf-8') as text:
+            return self._decode_row(next(csv.DictReader(text, fieldnames=self._fieldnames)))
+
+    @staticmethod
+    def make_nutrition(values: tuple) -> Nutrition:
+        return make_nutrition(values)
+
+    def iter_recipes(self, fields: Iterable[str] = None,
+                     where: dict[str, Callable[[object], bool]] = None) -> Iterator[Recipe | dict]:
+        """ Streams this reader's CSV file row by row; see the module-level iter_recipes. """
+        return iter_recipes(self.csv_file, fields, where)
 
-                self.recipes.append(recipe)
-                author.add_recipe(recipe)
-                category.add_recipe(recipe)
+    def _get_author(self, author_id: int, author_name: str) -> Author:
+        author = self._author_dict.get(author_id)
+        if author is None:
+            author = Author(author_id, author_name)
+            self._author_dict[author_id] = author
+            self.authors.append(author)
+        return author
 
-    def _parse_date(self, date_str: str) -> datetime:
-        if not date_str:
+    def _get_category(self, category_name: str) -> Category:
+        category = self._category_dict.get(category_name)
+        if category is None:
+            category = Category(name=category_name, category_id=len(self.categories) + 1)
+            self._category_dict[category_name] = category
+            self.categories.append(category)
+        return category
+
+    def _add_recipe(self, recipe: Recipe):
+        self.recipes.append(recipe)
+        recipe.author.add_recipe(recipe)
+        recipe.category.add_recipe(recipe)
+
+    def _source_key(self) -> dict:
+        size, mtime_ns = source_key(self.csv_file)
+        return {'version': SNAPSHOT_VERSION, 'size': size, 'mtime_ns': mtime_ns}
+
+    def _source_hash(self) -> str:
+        return file_fingerprint(self.csv_file)
+
+    def _load_snapshot(self) -> list[RecipeRecord] | None:
+        """ Returns the cached records if the snapshot still matches the CSV file, otherwise None. """
+        try:
+            with open(self.snapshot_file, 'rb') as file:
+                header = pickle.load(file)
+                key = self._source_key()
+                if header.get('version') != key['version'] or header.get('size') != key['size']:
+                    return None
+                touched = header.get('mtime_ns') != key['mtime_ns']
+                if touched and header.get('sha256') != self._source_hash():
+                    return None
+                records = [RecipeRecord._make(values) for values in pickle.load(file)]
+                self._fingerprint = header.get('sha256')
+                self.unparseable_dates = header.get('unparseable_dates', {})
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
             return None
-        date_str = date_str.replace('st ', ' ').replace('nd ', ' ').replace('rd ', ' ').replace('th ', ' ')
+        if touched:
+            # Same content under a new mtime: refresh the header so the next start skips hashing.
+            self._save_snapshot(records)
+        return records
+
+    def _save_snapshot(self, records: list[RecipeRecord]):
+        header = self._source_key()
+        header['sha256'] = self._fingerprint = self._source_hash()
+        header['unparseable_dates'] = self.unparseable_dates
+        temp_file = f"{self.snapshot_file}.{os.getpid()}.tmp"
         try:
-            return datetime.strptime(date_str, '%d %b %Y')
-        except ValueError:
-            try:
-                return datetime.strptime(date_str, '%Y-%m-%d')
-            except ValueError:
-                return None
\ No newline at end of file
+            with open(temp_file, 'wb') as file:
+                pickle.dump(header, file, protocol=pickle.HIGHEST_PROTOCOL)
+                # Plain tuples unpickle considerably faster than named tuples.
+                pickle.dump([tuple(record) for record in records], file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, self.snapshot_file)
+        except OSError:
+            # The snapshot is only an optimisation; a read-only data directory just means parsing every time.
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+
+    def _parse_date(self, date_str: str) -> datetime | None:
+        return DATE_PARSER.parse(date_str)
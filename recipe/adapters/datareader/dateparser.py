@@ -0,0 +1,107 @@
+import threading
+from collections import Counter
+from datetime import datetime
+
+MONTHS = {name: number for number, names in enumerate(
+    (('jan', 'january'), ('feb', 'february'), ('mar', 'march'), ('apr', 'april'), ('may',), ('jun', 'june'),
+     ('jul', 'july'), ('aug', 'august'), ('sep', 'september'), ('oct', 'october'), ('nov', 'november'),
+     ('dec', 'december')), start=1) for name in names}
+DAY_SUFFIXES = frozenset(('', 'st', 'nd', 'rd', 'th'))
+
+
+def _parse_day_month_year(text: str) -> datetime | None:
+    """ Parses '9th Aug 2009' (any ordinal suffix or none; abbreviated or full month name, in any case). """
+    tokens = text.split()
+    if len(tokens) != 3:
+        return None
+    day_token, month_token, year_token = tokens
+    digits = 0
+    while digits < len(day_token) and day_token[digits].isdigit():
+        digits += 1
+    if not 1 <= digits <= 2 or day_token[digits:].lower() not in DAY_SUFFIXES:
+        return None
+    month = MONTHS.get(month_token.lower())
+    if month is None or len(year_token) != 4 or not year_token.isdigit():
+        return None
+    return datetime(int(year_token), month, int(day_token[:digits]))
+
+
+def _parse_iso(text: str) -> datetime | None:
+    """ Parses '2009-08-09' (month and day may also be written with one digit). """
+    tokens = text.split('-')
+    if len(tokens) != 3:
+        return None
+    year, month, day = tokens
+    if len(year) != 4 or not 1 <= len(month) <= 2 or not 1 <= len(day) <= 2 or \
+            not (year.isdigit() and month.isdigit() and day.isdigit()):
+        return None
+    return datetime(int(year), int(month), int(day))
+
+
+def parse_date_uncached(text: str) -> datetime | None:
+    """ Parses one DatePublished value without caching; returns None when it matches neither known format. """
+    text = text.strip()
+    if not text.isascii():
+        # str.isdigit accepts non-ASCII digits, which int() would then read; neither format uses any.
+        return None
+    try:
+        return _parse_iso(text) if text[:1].isdigit() and '-' in text else _parse_day_month_year(text)
+    except ValueError:
+        # Well-formed but impossible, e.g. '31st Feb 2009'.
+        return None
+
+
+class DateParser:
+    """ Parses DatePublished values, caching the result for each distinct string.
+
+    recipes.csv has about a thousand distinct dates across its rows, so nearly every call is a dictionary hit. Values
+    that match neither the '9th Aug 2009' nor the ISO format parse to None, and are counted in `unparseable` so that a
+    load can report them all at once. Up to max_cache_size distinct strings are cached; later ones are still parsed,
+    just not remembered.
+    """
+
+    def __init__(self, max_cache_size: int = 65536):
+        self.max_cache_size = max_cache_size
+        self.__cache: dict[str, datetime | None] = {}
+        self.__unparseable: Counter[str] = Counter()
+        self.__lock = threading.Lock()
+
+    def parse(self, text: str) -> datetime | None:
+        if not text:
+            return None
+        try:
+            value = self.__cache[text]
+        except KeyError:
+            value = parse_date_uncached(text)
+            if len(self.__cache) < self.max_cache_size:
+                self.__cache[text] = value
+        if value is None:
+            with self.__lock:
+                self.__unparseable[text] += 1
+        return value
+
+    @property
+    def unparseable(self) -> dict[str, int]:
+        """ How often each unparseable value has been seen since this parser was created. """
+        with self.__lock:
+            return dict(self.__unparseable)
+
+    def cache_size(self) -> int:
+        return len(self.__cache)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__cache.clear()
+            self.__unparseable.clear()
+
+
+def unparseable_since(before: dict[str, int], after: dict[str, int]) -> dict[str, int]:
+    """ The unparseable values counted between two snapshots of DateParser.unparseable. """
+    return {text: count - before.get(text, 0) for text, count in after.items() if count > before.get(text, 0)}
+
+
+def describe_unparseable(unparseable: dict[str, int], source: str, limit: int = 5) -> str:
+    """ One summary line for a bulk report, e.g. "3 rows of recipes.csv have unparseable dates: 'soon' (2), ...". """
+    examples = ', '.join(f"{text!r} ({count})" for text, count in Counter(unparseable).most_common(limit))
+    more = f", and {len(unparseable) - limit} more" if len(unparseable) > limit else ''
+    return f"{sum(unparseable.values())} rows of {source} have unparseable dates: {examples}{more}"
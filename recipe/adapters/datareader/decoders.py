@@ -0,0 +1,34 @@
+from .listparser import parse_list_literal
+
+# Decoders for the raw column values of recipes.csv, which writes 'NA' for a missing value. Both CSVDataReader and
+# RandomCSVDataReader decode through them, so a row reads the same in either. Only same-package imports, so that
+# adapters/app.py can still import RandomCSVDataReader when it is run on its own.
+
+# (attribute, column) pairs, in the order of the recipes.csv columns and of Nutrition's fields.
+NUTRITION_COLUMNS = (
+    ('calories', 'Calories'),
+    ('fat_content', 'FatContent'),
+    ('saturated_fat_content', 'SaturatedFatContent'),
+    ('cholesterol_content', 'CholesterolContent'),
+    ('sodium_content', 'SodiumContent'),
+    ('carbohydrate_content', 'CarbohydrateContent'),
+    ('fiber_content', 'FiberContent'),
+    ('sugar_content', 'SugarContent'),
+    ('protein_content', 'ProteinContent'),
+)
+
+
+def int_or_zero(text: str) -> int:
+    return int(text) if text and text != 'NA' else 0
+
+
+def float_or_none(text: str) -> float | None:
+    return float(text) if text and text != 'NA' else None
+
+
+def text_or_none(text: str) -> str | None:
+    return text if text != 'NA' else None
+
+
+def list_or_empty(text: str) -> list[str]:
+    return parse_list_literal(text) if text and text != 'NA' else []
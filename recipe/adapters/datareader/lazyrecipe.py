@@ -0,0 +1,87 @@
+from recipe.domainmodel.nutrition import Nutrition
+from recipe.domainmodel.recipe import Recipe
+
+
+class LazyRecipe(Recipe):
+    """ A Recipe whose heavy columns are decoded from the CSV only when one of them is first accessed.
+
+    The cheap fields (id, name, author, category, times, date, servings, yield) are set at construction. The
+    description, images, ingredients, quantities, nutrition and instructions are read back from the CSV file through
+    `source.load_record(offset, length)` on demand.
+    """
+    __slots__ = ('_source', '_offset', '_length')
+
+    def __init__(self, *args, source, offset: int, length: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._source = source
+        self._offset = offset
+        self._length = length
+
+    @property
+    def is_materialised(self) -> bool:
+        return self._source is None
+
+    def _materialise(self) -> None:
+        source = self._source
+        if source is None:
+            return
+        record = source.load_record(self._offset, self._length)
+        # Write the Recipe fields directly: the public setters normalise values (e.g. strip the description),
+        # which would make lazily and eagerly loaded recipes differ.
+        self._Recipe__description = record.description
+        self._Recipe__images = record.images if record.images else []
+        self._Recipe__ingredient_quantities = record.ingredient_quantities if record.ingredient_quantities else []
+        self._Recipe__ingredients = record.ingredients if record.ingredients else []
+        self._Recipe__nutrition = source.make_nutrition(record.nutrition)
+        self._Recipe__instructions = record.instructions if record.instructions else []
+        self._source = None
+
+    @property
+    def description(self) -> str:
+        self._materialise()
+        return Recipe.description.fget(self)
+
+    @description.setter
+    def description(self, text: str):
+        self._materialise()
+        Recipe.description.fset(self, text)
+
+    @property
+    def images(self) -> list[str]:
+        self._materialise()
+        return Recipe.images.fget(self)
+
+    @images.setter
+    def images(self, value: list[str]):
+        self._materialise()
+        Recipe.images.fset(self, value)
+
+    @property
+    def ingredient_quantities(self) -> list[str]:
+        self._materialise()
+        return Recipe.ingredient_quantities.fget(self)
+
+    @property
+    def ingredients(self) -> list[str]:
+        self._materialise()
+        return Recipe.ingredients.fget(self)
+
+    @property
+    def nutrition(self) -> Nutrition:
+        self._materialise()
+        return Recipe.nutrition.fget(self)
+
+    @nutrition.setter
+    def nutrition(self, value: Nutrition):
+        self._materialise()
+        Recipe.nutrition.fset(self, value)
+
+    @property
+    def instructions(self) -> list[str]:
+        self._materialise()
+        return Recipe.instructions.fget(self)
+
+    @instructions.setter
+    def instructions(self, steps: list[str]):
+        self._materialise()
+        Recipe.instructions.fset(self, steps)
@@ -0,0 +1,81 @@
+import ast
+import re
+
+# Escape sequences that appear in the list columns of recipes.csv. Anything else is left to ast.literal_eval.
+_ESCAPES = {'\\': '\\', "'": "'", '"': '"', 'n': '\n', 'r': '\r', 't': '\t'}
+_ESCAPE_PATTERN = re.compile(r'\\(.)', re.DOTALL)
+_WHITESPACE = ' \t\r\n'
+
+
+class _UnsupportedLiteral(ValueError):
+    pass
+
+
+def parse_list_literal(text: str) -> list[str]:
+    """ Parses a Python-style list of string literals, e.g. "['1', '1/4', \"baker's yeast\"]".
+
+    Produces the same result as ast.literal_eval for the list columns of recipes.csv without building an AST.
+    Literals outside the supported subset fall back to ast.literal_eval.
+    """
+    try:
+        return _parse(text)
+    except _UnsupportedLiteral:
+        return ast.literal_eval(text)
+
+
+def _parse(text: str) -> list[str]:
+    length = len(text)
+    if length < 2 or text[0] != '[' or text[-1] != ']':
+        raise _UnsupportedLiteral(text)
+
+    find = text.find
+    items = []
+    pos = 1
+    while True:
+        while text[pos] in _WHITESPACE:
+            pos += 1
+        quote = text[pos]
+        if quote == ']':
+            break
+        if quote != "'" and quote != '"':
+            raise _UnsupportedLiteral(text)
+
+        start = pos + 1
+        end = find(quote, start)
+        while end > 0 and text[end - 1] == '\\':
+            backslash = end - 1
+            while text[backslash - 1] == '\\':
+                backslash -= 1
+            if (end - backslash) % 2 == 0:
+                break
+            end = find(quote, end + 1)
+        if end < 0:
+            raise _UnsupportedLiteral(text)
+
+        item = text[start:end]
+        items.append(_unescape(item) if '\\' in item else item)
+
+        pos = end + 1
+        while text[pos] in _WHITESPACE:
+            pos += 1
+        if text[pos] == ',':
+            pos += 1
+        elif text[pos] == ']':
+            break
+        else:
+            raise _UnsupportedLiteral(text)
+
+    if pos != length - 1:
+        raise _UnsupportedLiteral(text)
+    return items
+
+
+def _replace_escape(match: re.Match) -> str:
+    try:
+        return _ESCAPES[match.group(1)]
+    except KeyError:
+        raise _UnsupportedLiteral(match.group(0)) from None
+
+
+def _unescape(item: str) -> str:
+    return _ESCAPE_PATTERN.sub(_replace_escape, item)
@@ -0,0 +1,145 @@
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from recipe.adapters.searchindex import tokenise
+from recipe.domainmodel.recipe import Recipe
+
+
+def normalise_ingredient(name: str) -> str:
+    """ Maps spellings of the same ingredient to one key, e.g. 'Lemons, rind of' and 'lemon rind' to 'lemon rind'. """
+    return ' '.join(tokenise(name))
+
+
+class PantryMatch(NamedTuple):
+    recipe_id: int
+    matched: int
+    missing: int
+
+    @property
+    def coverage(self) -> float:
+        return self.matched / (self.matched + self.missing)
+
+
+class IngredientIndex:
+    """ Ingredient vocabulary plus one bitset per ingredient over the whole catalogue.
+
+    Bit i of an ingredient's bitset is set when the recipe at position i uses it. Bitsets are Python ints, so AND/OR
+    over the catalogue run in C a machine word at a time. Pantry queries count matched ingredients per recipe with a
+    bit-sliced counter: counter plane k holds bit k of every recipe's count, and adding an ingredient's bitset is a
+    ripple-carry addition over the planes. Thresholds on those counts are again whole-catalogue bitwise operations.
+    """
+
+    def __init__(self, recipes: Iterable[Recipe]):
+        recipe_ids = []
+        sizes = []
+        self.__vocabulary: dict[str, int] = {}
+        positions_by_ingredient: list[list[int]] = []
+        for position, recipe in enumerate(recipes):
+            recipe_ids.append(recipe.id)
+            ingredient_ids = set()
+            for name in recipe.ingredients:
+                key = normalise_ingredient(name)
+                if not key:
+                    continue
+                ingredient_id = self.__vocabulary.setdefault(key, len(self.__vocabulary))
+                if ingredient_id == len(positions_by_ingredient):
+                    positions_by_ingredient.append([])
+                if ingredient_id not in ingredient_ids:
+                    ingredient_ids.add(ingredient_id)
+                    positions_by_ingredient[ingredient_id].append(position)
+            sizes.append(len(ingredient_ids))
+
+        self.__recipe_ids = np.array(recipe_ids, dtype=np.int64)
+        self.__sizes = np.array(sizes, dtype=np.int64)
+        self.__bitsets = [self.__to_bitset(positions) for positions in positions_by_ingredient]
+        self.__recipes_by_size = {int(size): self.__to_bitset(np.flatnonzero(self.__sizes == size))
+                                  for size in np.unique(self.__sizes) if size}
+
+    def __to_bitset(self, positions) -> int:
+        bits = np.zeros(len(self.__recipe_ids), dtype=bool)
+        bits[positions] = True
+        return int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+
+    def __to_bits(self, bitset: int) -> np.ndarray:
+        """ Unpacks a bitset into a boolean array with one element per recipe. """
+        count = len(self.__recipe_ids)
+        packed = np.frombuffer(bitset.to_bytes((count + 7) // 8, 'little'), dtype=np.uint8)
+        return np.unpackbits(packed, count=count, bitorder='little').view(bool)
+
+    def __len__(self) -> int:
+        return len(self.__recipe_ids)
+
+    @property
+    def vocabulary(self) -> list[str]:
+        """ Normalised ingredient names, indexed by ingredient id. """
+        return list(self.__vocabulary)
+
+    def ingredient_id(self, name: str) -> int | None:
+        return self.__vocabulary.get(normalise_ingredient(name))
+
+    def __bitset(self, name: str) -> int:
+        ingredient_id = self.ingredient_id(name)
+        return self.__bitsets[ingredient_id] if ingredient_id is not None else 0
+
+    def __recipe_ids_of(self, bitset: int) -> list[int]:
+        return self.__recipe_ids[self.__to_bits(bitset)].tolist()
+
+    def containing_all(self, ingredients: Iterable[str]) -> list[int]:
+        """ Returns the ids of the recipes that use every one of the given ingredients, in catalogue order. """
+        result = None
+        for name in ingredients:
+            bitset = self.__bitset(name)
+            result = bitset if result is None else result & bitset
+            if not result:
+                return []
+        return self.__recipe_ids_of(result) if result else []
+
+    def cookable(self, pantry: Iterable[str], max_missing: int = 0, limit: int = None) -> list[PantryMatch]:
+        """ Ranks the recipes that use at least one pantry ingredient and need at most max_missing others.
+
+        Results are ordered by coverage (share of the recipe's ingredients in the pantry), then by fewest missing
+        ingredients, then by catalogue order.
+        """
+        if max_missing < 0:
+            raise ValueError("max_missing cannot be negative.")
+        bitsets = {self.ingredient_id(name): self.__bitset(name) for name in pantry}
+        bitsets.pop(None, None)
+
+        planes: list[int] = []
+        for bitset in bitsets.values():
+            carry = bitset
+            for index, plane in enumerate(planes):
+                planes[index], carry = plane ^ carry, plane & carry
+                if not carry:
+                    break
+            if carry:
+                planes.append(carry)
+
+        selected = 0
+        for size, recipes in self.__recipes_by_size.items():
+            selected |= recipes & self.__at_least(planes, max(size - max_missing, 1))
+
+        positions = np.flatnonzero(self.__to_bits(selected))
+        matched = np.zeros(len(positions), dtype=np.int64)
+        for index, plane in enumerate(planes):
+            matched += self.__to_bits(plane)[positions].astype(np.int64) << index
+        sizes = self.__sizes[positions]
+        order = np.lexsort((positions, sizes - matched, -matched / sizes))
+        if limit is not None:
+            order = order[:limit]
+        return [PantryMatch(int(self.__recipe_ids[positions[i]]), int(matched[i]), int(sizes[i] - matched[i]))
+                for i in order]
+
+    def __at_least(self, planes: list[int], threshold: int) -> int:
+        """ Returns the bitset of recipes whose bit-sliced count in planes is >= threshold. """
+        all_recipes = (1 << len(self.__recipe_ids)) - 1
+        greater, equal = 0, all_recipes
+        for bit in range(max(len(planes), threshold.bit_length()) - 1, -1, -1):
+            plane = planes[bit] if bit < len(planes) else 0
+            if (threshold >> bit) & 1:
+                equal &= plane
+            else:
+                greater |= equal & plane
+                equal &= ~plane
+        return greater | equal
@@ -0,0 +1,252 @@
+import cProfile
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+from flask import Flask, Response, g, request, template_rendered, before_render_template
+
+# Upper bounds, in seconds, of the latency histogram buckets. Finer than Prometheus' defaults at the low end, as
+# repository lookups and cached pages take microseconds.
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HISTOGRAMS = {
+    'http_request_duration_seconds': "Time to produce a response, by endpoint, method and status.",
+    'template_render_duration_seconds': "Jinja rendering time, by template.",
+    'repository_call_duration_seconds': "Time spent in repository methods, by method.",
+}
+
+PROFILE_HEADER = 'X-Profile'
+
+
+class Histogram:
+    """ Cumulative-bucket histogram in the Prometheus style: counts per upper bound, plus a sum and a count. """
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        # Bucket bounds are inclusive, so a value equal to a bound belongs to that bound's bucket.
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    escaped = (f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+               for name, value in labels)
+    return '{' + ','.join(escaped) + '}'
+
+
+class Metrics:
+    """ Thread-safe registry of labelled latency histograms, plus collectors for values owned elsewhere.
+
+    A collector is a callable returning (name, type, help, [(labels, value), ...]) tuples; it is called on each
+    render, so counters such as the page cache's never have to be copied into the registry.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__histograms: dict[str, dict[tuple, Histogram]] = {name: {} for name in HISTOGRAMS}
+        self.__collectors: list[Callable[[], list[tuple]]] = []
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.__lock:
+            series = self.__histograms[name]
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(seconds)
+
+    def histogram(self, name: str, **labels: str) -> Histogram | None:
+        return self.__histograms[name].get(tuple(sorted(labels.items())))
+
+    def add_collector(self, collector: Callable[[], list[tuple]]) -> None:
+        self.__collectors.append(collector)
+
+    def render(self) -> str:
+        """ Returns every metric in the Prometheus text exposition format. """
+        lines = []
+        with self.__lock:
+            for name, series in self.__histograms.items():
+                lines.append(f"# HELP {name} {HISTOGRAMS[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum!r}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        for collector in self.__collectors:
+            for name, kind, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(tuple(labels))} {value!r}")
+        return '\n'.join(lines) + '\n'
+
+
+def _request_timings() -> dict[str, float] | None:
+    """ Per-request accumulated seconds by phase, for the Server-Timing header; None outside a request. """
+    try:
+        return g.setdefault('instrumentation_timings', {})
+    except RuntimeError:
+        return None
+
+
+class TimedRepository:
+    """ Wraps a repository, timing every public method call into repository_call_duration_seconds.
+
+    Generators (iter_recipes) are timed across their whole iteration, counting only the time spent inside them.
+    """
+
+    def __init__(self, repository, metrics: Metrics):
+        self.__repository = repository
+        self.__metrics = metrics
+
+    @property
+    def wrapped(self):
+        return self.__repository
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.__repository, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+        metrics = self.__metrics
+
+        def record(elapsed: float) -> None:
+            metrics.observe('repository_call_duration_seconds', elapsed, method=name)
+            timings = _request_timings()
+            if timings is not None:
+                timings['repository'] = timings.get('repository', 0.0) + elapsed
+
+        @functools.wraps(attribute)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = attribute(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            if hasattr(result, '__next__') and hasattr(result, 'send'):
+                return _timed_generator(result, elapsed, record)
+            record(elapsed)
+            return result
+
+        return timed
+
+
+def _timed_generator(generator, elapsed: float, record: Callable[[float], None]):
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(generator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        generator.close()
+        record(elapsed)
+
+
+class Instrumentation:
+    """ Opt-in request instrumentation for the Flask app.
+
+    Records per-route latency, template render time and repository call time into Prometheus histograms served at
+    /metrics, and adds a Server-Timing header breaking each response down into repository, template and total time.
+    When PROFILE_DIR is configured, a request carrying the X-Profile header (matching PROFILE_TOKEN, if one is set)
+    runs under cProfile and its stats are written to PROFILE_DIR as a .prof file named in the X-Profile-File header;
+    only one request is profiled at a time.
+    """
+
+    def __init__(self, app: Flask, metrics: Metrics = None):
+        self.app = app
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.__profile_lock = threading.Lock()
+        app.extensions['instrumentation'] = self
+        app.before_request(self.__before_request)
+        app.after_request(self.__after_request)
+        before_render_template.connect(self.__before_render, app)
+        template_rendered.connect(self.__after_render, app)
+        app.add_url_rule('/metrics', 'metrics', self.__metrics_view)
+
+    def wrap_repository(self, repository):
+        """ Returns repository wrapped in a TimedRepository (unwrapping it first if it already is one). """
+        if isinstance(repository, TimedRepository):
+            repository = repository.wrapped
+        return TimedRepository(repository, self.metrics)
+
+    def __metrics_view(self):
+        return Response(self.metrics.render(), mimetype='text/plain; version=0.0.4')
+
+    def __wants_profile(self) -> bool:
+        header = request.headers.get(PROFILE_HEADER)
+        if not header or not self.app.config.get('PROFILE_DIR'):
+            return False
+        token = self.app.config.get('PROFILE_TOKEN')
+        return token is None or header == token
+
+    def __before_request(self):
+        g.instrumentation_start = time.perf_counter()
+        if self.__wants_profile() and self.__profile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is active in this interpreter.
+                self.__profile_lock.release()
+            else:
+                g.instrumentation_profiler = profiler
+
+    def __after_request(self, response):
+        profiler = g.pop('instrumentation_profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            try:
+                response.headers['X-Profile-File'] = self.__dump_profile(profiler)
+            finally:
+                self.__profile_lock.release()
+
+        start = g.pop('instrumentation_start', None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = request.endpoint or 'unmatched'
+        self.metrics.observe('http_request_duration_seconds', elapsed, endpoint=endpoint, method=request.method,
+                             status=str(response.status_code))
+        timings = _request_timings() or {}
+        parts = [f"{phase};dur={seconds * 1000:.3f}" for phase, seconds in sorted(timings.items())]
+        parts.append(f"total;dur={elapsed * 1000:.3f}")
+        response.headers['Server-Timing'] = ', '.join(parts)
+        return response
+
+    def __dump_profile(self, profiler: cProfile.Profile) -> str:
+        directory = self.app.config['PROFILE_DIR']
+        os.makedirs(directory, exist_ok=True)
+        endpoint = (request.endpoint or 'unmatched').replace('.', '_')
+        file_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{threading.get_ident()}-{endpoint}.prof"
+        profiler.dump_stats(os.path.join(directory, file_name))
+        return file_name
+
+    def __before_render(self, sender, template, context, **extra):
+        g.setdefault('instrumentation_render_starts', []).append(time.perf_counter())
+
+    def __after_render(self, sender, template, context, **extra):
+        starts = g.get('instrumentation_render_starts')
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        self.metrics.observe('template_render_duration_seconds', elapsed, template=template.name or 'string')
+        timings = _request_timings()
+        if timings is not None:
+            timings['template'] = timings.get('template', 0.0) + elapsed
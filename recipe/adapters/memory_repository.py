@@ -0,0 +1,103 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Iterator
+
+from recipe.adapters.repository import AbstractRepository, RepositoryException
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+
+
+class MemoryRepository(AbstractRepository):
+    """ Keeps the catalogue in memory, with hash maps and sorted indexes so that every lookup avoids a full scan.
+
+    - recipes, authors and categories are held in dicts keyed by id;
+    - recipes per author and per category are held in dicts of lists, in insertion order;
+    - recipe ids (for paging) and (date, id) pairs (for date-range queries) are kept in sorted lists. Additions only
+      append; the lists are re-sorted once, on the first query after a change.
+    """
+
+    def __init__(self):
+        self.__recipes: dict[int, Recipe] = {}
+        self.__authors: dict[int, Author] = {}
+        self.__categories: dict[int, Category] = {}
+        self.__categories_by_name: dict[str, Category] = {}
+        self.__recipes_by_author: dict[int, list[Recipe]] = {}
+        self.__recipes_by_category: dict[int, list[Recipe]] = {}
+        self.__sorted_ids: list[int] = []
+        self.__date_index: list[tuple[datetime, int]] = []
+        self.__indexes_sorted = True
+
+    def add_recipe(self, recipe: Recipe):
+        if not isinstance(recipe, Recipe):
+            raise TypeError("Expected a Recipe instance")
+        if recipe.id in self.__recipes:
+            raise RepositoryException(f"Recipe {recipe.id} is already in the repository")
+        self.__recipes[recipe.id] = recipe
+
+        author = recipe.author
+        self.__authors.setdefault(author.id, author)
+        self.__recipes_by_author.setdefault(author.id, []).append(recipe)
+        category = recipe.category
+        if category is not None:
+            self.__categories.setdefault(category.id, category)
+            self.__categories_by_name.setdefault(category.name.lower(), category)
+            self.__recipes_by_category.setdefault(category.id, []).append(recipe)
+
+        self.__sorted_ids.append(recipe.id)
+        self.__date_index.append((recipe.date, recipe.id))
+        self.__indexes_sorted = False
+
+    def __sort_indexes(self):
+        if not self.__indexes_sorted:
+            self.__sorted_ids = sorted(self.__sorted_ids)
+            self.__date_index = sorted(self.__date_index)
+            self.__indexes_sorted = True
+
+    def get_recipe(self, recipe_id: int) -> Recipe | None:
+        return self.__recipes.get(recipe_id)
+
+    def get_number_of_recipes(self) -> int:
+        return len(self.__recipes)
+
+    def get_recipes(self, page: int = 1, per_page: int = 10) -> list[Recipe]:
+        if page < 1 or per_page < 1:
+            raise ValueError("page and per_page must be positive.")
+        self.__sort_indexes()
+        start = (page - 1) * per_page
+        return [self.__recipes[recipe_id] for recipe_id in self.__sorted_ids[start:start + per_page]]
+
+    def iter_recipes(self, after_id: int = None) -> Iterator[Recipe]:
+        self.__sort_indexes()
+        sorted_ids = self.__sorted_ids
+        start = bisect_right(sorted_ids, after_id) if after_id is not None else 0
+        for index in range(start, len(sorted_ids)):
+            yield self.__recipes[sorted_ids[index]]
+
+    def get_recipes_by_author(self, author_id: int) -> list[Recipe]:
+        return list(self.__recipes_by_author.get(author_id, ()))
+
+    def get_recipes_by_category(self, category_id: int) -> list[Recipe]:
+        return list(self.__recipes_by_category.get(category_id, ()))
+
+    def get_recipes_by_date_range(self, start: datetime, end: datetime) -> list[Recipe]:
+        self.__sort_indexes()
+        # Recipe ids are positive, so (date, 0) sorts before and (date, inf) after every entry on that date.
+        first = bisect_left(self.__date_index, (start, 0))
+        last = bisect_right(self.__date_index, (end, float('inf')))
+        return [self.__recipes[recipe_id] for _, recipe_id in self.__date_index[first:last]]
+
+    def get_author(self, author_id: int) -> Author | None:
+        return self.__authors.get(author_id)
+
+    def get_authors(self) -> list[Author]:
+        return list(self.__authors.values())
+
+    def get_category(self, category_id: int) -> Category | None:
+        return self.__categories.get(category_id)
+
+    def get_category_by_name(self, name: str) -> Category | None:
+        return self.__categories_by_name.get(name.lower())
+
+    def get_categories(self) -> list[Category]:
+        return list(self.__categories.values())
@@ -0,0 +1,206 @@
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from recipe.domainmodel.nutrition import NUTRITION_FIELDS
+from recipe.domainmodel.recipe import Recipe
+
+DEFAULT_LEAF_SIZE = 16
+# Nodes followed side by side when nearest() looks for its first k candidates.
+BEAM_WIDTH = 4
+
+
+class NutritionMatch(NamedTuple):
+    recipe_id: int
+    distance: float
+
+
+class NutritionIndex:
+    """ KD-tree over the nutrition values of a catalogue, for nearest-target and range queries.
+
+    Every dimension is centred on its median and scaled by its interquartile range, so a distance of 1 is one
+    "typical spread" of calories, of protein, of sodium and so on, whatever the unit. A missing value is placed at its
+    dimension's median for distance queries and never satisfies a range. Nodes split at the median of the dimension
+    with the widest interquartile range and keep the bounding box of their points, which is what lets queries skip
+    whole subtrees: a k-nearest query first follows the few boxes nearest the target down to the leaves to find a
+    radius holding k matches, then only visits boxes within that radius, and a range query descends only into boxes
+    that intersect the ranges. Both take logarithmic time in the catalogue size for selective queries. The tree is
+    walked a level at a time, pruning all nodes of a level in one vectorised step.
+    """
+
+    def __init__(self, recipe_ids: np.ndarray, values: np.ndarray, leaf_size: int = DEFAULT_LEAF_SIZE):
+        if values.shape != (len(recipe_ids), len(NUTRITION_FIELDS)):
+            raise ValueError("values must have one row per recipe and one column per nutrition field.")
+        if leaf_size < 1:
+            raise ValueError("leaf_size must be positive.")
+        values = np.asarray(values, dtype=np.float64)
+        with np.errstate(all='ignore'):
+            present = ~np.isnan(values)
+            self.__centre = np.array([np.median(column[mask]) if mask.any() else 0.0
+                                      for column, mask in zip(values.T, present.T)])
+            spread = np.array([np.subtract(*np.percentile(column[mask], [75, 25])) if mask.any() else 0.0
+                               for column, mask in zip(values.T, present.T)])
+        # A dimension with no spread (e.g. mostly zero fibre) falls back to unit scale rather than dividing by zero.
+        self.__scale = np.where(spread > 0, spread, 1.0)
+
+        points = (np.where(present, values, self.__centre) - self.__centre) / self.__scale
+        self.__leaf_size = leaf_size
+        self.__order = np.arange(len(recipe_ids))
+        self.__starts, self.__ends, self.__lefts, self.__rights, lows, highs = [], [], [], [], [], []
+        if len(recipe_ids):
+            self.__split(points, 0, len(recipe_ids), lows, highs)
+        self.__low_bounds = np.array(lows).reshape(-1, len(NUTRITION_FIELDS))
+        self.__high_bounds = np.array(highs).reshape(-1, len(NUTRITION_FIELDS))
+        self.__starts, self.__ends = np.array(self.__starts, dtype=np.int64), np.array(self.__ends, dtype=np.int64)
+        self.__lefts, self.__rights = np.array(self.__lefts, dtype=np.int64), np.array(self.__rights, dtype=np.int64)
+
+        # Store points in tree order, so every node covers one contiguous slice; __order maps back to the catalogue.
+        self.__points = points[self.__order]
+        self.__values = values[self.__order]
+        self.__recipe_ids = np.asarray(recipe_ids, dtype=np.int64)
+
+    @classmethod
+    def build(cls, recipes: Iterable[Recipe], leaf_size: int = DEFAULT_LEAF_SIZE) -> "NutritionIndex":
+        recipe_ids, rows = [], []
+        for recipe in recipes:
+            recipe_ids.append(recipe.id)
+            nutrition = recipe.nutrition
+            rows.append(nutrition.as_tuple() if nutrition is not None else (None,) * len(NUTRITION_FIELDS))
+        values = np.array(rows, dtype=np.float64).reshape(len(rows), len(NUTRITION_FIELDS))
+        return cls(np.array(recipe_ids, dtype=np.int64), values, leaf_size)
+
+    def __split(self, points: np.ndarray, start: int, end: int, lows: list, highs: list) -> int:
+        """ Adds the node covering self.__order[start:end] and, recursively, its children; returns its number. """
+        node = len(self.__starts)
+        segment = self.__order[start:end]
+        low, high = points[segment].min(axis=0), points[segment].max(axis=0)
+        self.__starts.append(start)
+        self.__ends.append(end)
+        self.__lefts.append(-1)
+        self.__rights.append(-1)
+        lows.append(low)
+        highs.append(high)
+        # Split the dimension with the widest interquartile range: a few outliers (sodium runs to tens of grams)
+        # would otherwise win every split while barely separating the bulk of the points.
+        quartiles = np.percentile(points[segment], [25, 75], axis=0)
+        spread = np.where(quartiles[1] > quartiles[0], quartiles[1] - quartiles[0], (high - low) * 1e-9)
+        dimension = int(np.argmax(spread))
+        if end - start <= self.__leaf_size or high[dimension] == low[dimension]:
+            return node
+        middle = (start + end) // 2
+        self.__order[start:end] = segment[np.argpartition(points[segment, dimension], middle - start)]
+        self.__lefts[node] = self.__split(points, start, middle, lows, highs)
+        self.__rights[node] = self.__split(points, middle, end, lows, highs)
+        return node
+
+    def __len__(self) -> int:
+        return len(self.__recipe_ids)
+
+    @staticmethod
+    def __field_index(field: str) -> int:
+        try:
+            return NUTRITION_FIELDS.index(field)
+        except ValueError:
+            raise ValueError(f"Unknown nutrition field: {field}") from None
+
+    def __positions(self, nodes: np.ndarray) -> np.ndarray:
+        """ Returns the tree-order positions covered by the given nodes. """
+        starts, lengths = self.__starts[nodes], self.__ends[nodes] - self.__starts[nodes]
+        offsets = np.cumsum(lengths) - lengths
+        return np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+
+    def __collect(self, keep, is_final) -> np.ndarray:
+        """ Walks the tree a level at a time and returns the positions under the nodes it stops at.
+
+        keep(nodes) says which nodes may hold matches; is_final(nodes) which of those to take whole (leaves always
+        are). Each level is a handful of whole-array operations, whatever the number of nodes on it.
+        """
+        nodes = np.zeros(1, dtype=np.int64)
+        taken = []
+        while len(nodes):
+            nodes = nodes[keep(nodes)]
+            final = (self.__lefts[nodes] < 0) | is_final(nodes)
+            taken.append(nodes[final])
+            inner = nodes[~final]
+            nodes = np.concatenate((self.__lefts[inner], self.__rights[inner]))
+        return self.__positions(np.concatenate(taken))
+
+    def __bounds(self, nodes, query: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """ Squared weighted distance from query to the bounding box of each node (0 inside the box). """
+        below = np.maximum(self.__low_bounds[nodes] - query, 0.0)
+        above = np.maximum(query - self.__high_bounds[nodes], 0.0)
+        return ((below + above) ** 2) @ weights
+
+    def nearest(self, k: int = 10, **targets: float) -> list[NutritionMatch]:
+        """ Returns the k recipes closest to the targets, e.g. nearest(5, calories=500, protein_content=30).
+
+        Only the given fields count towards the distance. Matches are ordered by distance, then catalogue order.
+        """
+        if k < 1:
+            raise ValueError("k must be positive.")
+        if not targets:
+            raise ValueError("At least one nutrition target is required.")
+        weights = np.zeros(len(NUTRITION_FIELDS))
+        query = np.zeros(len(NUTRITION_FIELDS))
+        for field, target in targets.items():
+            index = self.__field_index(field)
+            weights[index] = 1.0
+            query[index] = (float(target) - self.__centre[index]) / self.__scale[index]
+        if not len(self):
+            return []
+
+        # Follow the few nodes nearest the query down to the leaves; the k-th distance among their points bounds the
+        # search radius.
+        # Leaves hold between leaf_size / 2 and leaf_size points, so a wide enough beam always reaches k of them.
+        width = max(BEAM_WIDTH, -(-2 * k // self.__leaf_size))
+        nodes = np.zeros(1, dtype=np.int64)
+        while True:
+            inner = nodes[self.__lefts[nodes] >= 0]
+            if not len(inner):
+                break
+            nodes = np.concatenate((nodes[self.__lefts[nodes] < 0], self.__lefts[inner], self.__rights[inner]))
+            nodes = nodes[np.argsort(self.__bounds(nodes, query, weights), kind='stable')[:width]]
+        positions = self.__positions(nodes)
+        distances = ((self.__points[positions] - query) ** 2) @ weights
+        radius = np.partition(distances, k - 1)[k - 1] if len(positions) >= k else np.inf
+
+        positions = self.__collect(lambda nodes: self.__bounds(nodes, query, weights) <= radius,
+                                   lambda nodes: np.zeros(len(nodes), dtype=bool))
+        distances = ((self.__points[positions] - query) ** 2) @ weights
+        catalogue = self.__order[positions]
+        best = np.lexsort((catalogue, distances))[:k]
+        return [NutritionMatch(int(recipe_id), float(distance)) for recipe_id, distance in
+                zip(self.__recipe_ids[catalogue[best]], np.sqrt(distances[best]))]
+
+    def within(self, **ranges: tuple[float | None, float | None]) -> list[int]:
+        """ Returns the ids of the recipes inside every range, in catalogue order.
+
+        Ranges are given as keyword arguments, e.g. within(calories=(400, 600), protein_content=(30, None)), where
+        each bound is inclusive and None leaves that side open. Recipes missing a ranged value never match.
+        """
+        if not ranges:
+            raise ValueError("At least one nutrition range is required.")
+        fields = []
+        lows = np.full(len(NUTRITION_FIELDS), -np.inf)
+        highs = np.full(len(NUTRITION_FIELDS), np.inf)
+        for field, (low, high) in ranges.items():
+            index = self.__field_index(field)
+            fields.append(index)
+            if low is not None:
+                lows[index] = low
+            if high is not None:
+                highs[index] = high
+        if not len(self):
+            return []
+        normalised_lows = (lows - self.__centre) / self.__scale
+        normalised_highs = (highs - self.__centre) / self.__scale
+
+        positions = self.__collect(
+            lambda nodes: ~np.any((self.__high_bounds[nodes] < normalised_lows) |
+                                  (self.__low_bounds[nodes] > normalised_highs), axis=1),
+            lambda nodes: np.all((self.__low_bounds[nodes] >= normalised_lows) &
+                                 (self.__high_bounds[nodes] <= normalised_highs), axis=1))
+        # Boxes are in normalised, imputed units; the final test is on the original values, so NaN never matches.
+        values = self.__values[positions][:, fields]
+        matched = positions[np.all((values >= lows[fields]) & (values <= highs[fields]), axis=1)]
+        return self.__recipe_ids[np.sort(self.__order[matched])].tolist()
@@ -0,0 +1,91 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, NamedTuple
+
+
+class CachedPage(NamedTuple):
+    body: bytes
+    etag: str
+
+
+class PageCache:
+    """ LRU cache of rendered pages, bounded by the total size of the cached bodies.
+
+    Keys should identify everything a page depends on, e.g. (template, recipe id, data version), so that cached pages
+    never need explicit invalidation: a data reload changes the version and old entries simply age out. Each page
+    carries a strong ETag, the SHA-256 of its body, so conditional requests can be answered without rendering.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        if max_bytes < 0:
+            raise ValueError("max_bytes cannot be negative.")
+        self.__max_bytes = max_bytes
+        self.__pages: OrderedDict[Hashable, CachedPage] = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.__pages)
+
+    @property
+    def size(self) -> int:
+        """ Total size in bytes of the cached page bodies. """
+        return self.__size
+
+    def get(self, key: Hashable) -> CachedPage | None:
+        with self.__lock:
+            page = self.__pages.get(key)
+            if page is None:
+                self.misses += 1
+                return None
+            self.__pages.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def put(self, key: Hashable, body: str | bytes) -> CachedPage:
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        page = CachedPage(body, hashlib.sha256(body).hexdigest())
+        if len(body) > self.__max_bytes:
+            return page
+        with self.__lock:
+            previous = self.__pages.pop(key, None)
+            if previous is not None:
+                self.__size -= len(previous.body)
+            self.__pages[key] = page
+            self.__size += len(body)
+            while self.__size > self.__max_bytes:
+                _, evicted = self.__pages.popitem(last=False)
+                self.__size -= len(evicted.body)
+                self.evictions += 1
+        return page
+
+    def get_or_render(self, key: Hashable, render: Callable[[], str | bytes]) -> CachedPage:
+        """ Returns the cached page for key, rendering and caching it first on a miss.
+
+        Rendering happens outside the lock, so two threads missing on the same key may both render it; the second
+        result simply replaces the first.
+        """
+        page = self.get(key)
+        if page is None:
+            page = self.put(key, render())
+        return page
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__pages.clear()
+            self.__size = 0
+
+    def stats(self) -> dict[str, int]:
+        with self.__lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self.__pages),
+                'bytes': self.__size,
+            }
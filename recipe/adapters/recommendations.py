@@ -0,0 +1,243 @@
+import os
+import zipfile
+from contextlib import contextmanager
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # fcntl is POSIX only; on Windows every process that finds the file missing or stale builds its own lists.
+    fcntl = None
+
+from recipe.adapters.ingredientindex import normalise_ingredient
+from recipe.domainmodel.recipe import Recipe
+
+# Bump whenever the features, their weights or the file layout change, so stale neighbour files are rebuilt.
+RECOMMENDATIONS_VERSION = 1
+
+DEFAULT_NEIGHBOURS = 10
+# Recipes compared per side of a block; the working set of a block is a few block_size x block_size float32 arrays,
+# whatever the size of the catalogue.
+DEFAULT_BLOCK_SIZE = 1024
+
+
+@contextmanager
+def build_lock(path: str):
+    """ Holds an exclusive lock on path + '.lock' for as long as the block runs, so that of several processes (for
+    example the workers of one server) only one builds the neighbour lists at a time. """
+    try:
+        lock_file = open(path + '.lock', 'a') if fcntl is not None else None
+    except OSError:
+        lock_file = None
+    if lock_file is None:
+        yield
+        return
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class Neighbour(NamedTuple):
+    recipe_id: int
+    score: float
+
+
+def recipe_features(recipe: Recipe) -> set[str]:
+    """ The features a recipe is compared on: its normalised ingredients and its category. """
+    features = {key for key in map(normalise_ingredient, recipe.ingredients) if key}
+    if recipe.category is not None:
+        features.add('category:' + recipe.category.name.lower())
+    return features
+
+
+class SimilarRecipes:
+    """ The most similar recipes of every recipe in a catalogue, precomputed.
+
+    Each recipe is a sparse TF-IDF vector over its ingredients and its category (recipe_features), normalised to unit
+    length, so similarity is the cosine of two vectors. build() ranks every pair of recipes in blocks: the rows of one
+    block are densified over just the features that block uses, multiplied against each block of candidates, and the
+    running top k of every row is merged with the new scores. Memory use therefore depends on the block size, not on
+    the number of recipes.
+
+    The result is two (recipes, k) arrays, int32 neighbour positions and float16 scores, best first, padded with -1
+    where a recipe shares no feature with enough others: six bytes per neighbour. A lookup is one row read.
+    """
+
+    def __init__(self, recipe_ids: np.ndarray, neighbours: np.ndarray, scores: np.ndarray, fingerprint: str = ''):
+        self.__recipe_ids = recipe_ids
+        self.__neighbours = neighbours
+        self.__scores = scores
+        self.__fingerprint = fingerprint
+        # Recipe ids are small positive integers, so a dense table maps an id to its row without hashing.
+        self.__rows = np.full(int(recipe_ids.max()) + 1 if len(recipe_ids) else 0, -1, dtype=np.int32)
+        self.__rows[recipe_ids] = np.arange(len(recipe_ids), dtype=np.int32)
+
+    @classmethod
+    def build(cls, recipes: Iterable[Recipe], fingerprint: str = '', k: int = DEFAULT_NEIGHBOURS,
+              block_size: int = DEFAULT_BLOCK_SIZE, category_weight: float = 1.0) -> "SimilarRecipes":
+        if k < 1 or block_size < 1:
+            raise ValueError("k and block_size must be positive.")
+        recipe_ids = []
+        vocabulary: dict[str, int] = {}
+        indptr = [0]
+        indices = []
+        for recipe in recipes:
+            recipe_ids.append(recipe.id)
+            for feature in recipe_features(recipe):
+                indices.append(vocabulary.setdefault(feature, len(vocabulary)))
+            indptr.append(len(indices))
+
+        recipe_ids = np.array(recipe_ids, dtype=np.int64)
+        indptr = np.array(indptr, dtype=np.int64)
+        indices = np.array(indices, dtype=np.int32)
+        data = cls.__tf_idf(vocabulary, indptr, indices, category_weight)
+        neighbours, scores = cls.__top_k(indptr, indices, data, len(vocabulary), k, block_size)
+        return cls(recipe_ids, neighbours, scores, fingerprint)
+
+    @staticmethod
+    def __tf_idf(vocabulary: dict[str, int], indptr: np.ndarray, indices: np.ndarray,
+                 category_weight: float) -> np.ndarray:
+        """ Returns the unit-length TF-IDF weights of the CSR matrix (indptr, indices); every tf is 1. """
+        count = len(indptr) - 1
+        document_frequency = np.bincount(indices, minlength=len(vocabulary))
+        idf = np.log((1 + count) / (1 + document_frequency)) + 1
+        is_category = np.zeros(len(vocabulary), dtype=bool)
+        is_category[[index for feature, index in vocabulary.items() if feature.startswith('category:')]] = True
+        idf[is_category] *= category_weight
+        data = idf[indices]
+        lengths = np.sqrt(np.add.reduceat(data ** 2, indptr[:-1])) if len(data) else np.zeros(count)
+        # reduceat reads an empty row's slot from the next row; empty rows have no data to scale anyway.
+        lengths[indptr[:-1] == indptr[1:]] = 1.0
+        return (data / np.repeat(lengths, np.diff(indptr))).astype(np.float32)
+
+    @staticmethod
+    def __top_k(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, feature_count: int, k: int,
+                block_size: int) -> tuple[np.ndarray, np.ndarray]:
+        count = len(indptr) - 1
+        neighbours = np.full((count, k), -1, dtype=np.int32)
+        # Scores are only shown, never ranked again, so half precision is plenty.
+        scores = np.zeros((count, k), dtype=np.float16)
+        columns = np.full(feature_count, -1, dtype=np.int64)
+
+        def block(start: int, end: int):
+            """ Returns the rows, features and weights of the CSR entries of rows start to end. """
+            first, last = indptr[start], indptr[end]
+            rows = np.repeat(np.arange(end - start), np.diff(indptr[start:end + 1]))
+            return rows, indices[first:last], data[first:last]
+
+        for start in range(0, count, block_size):
+            end = min(start + block_size, count)
+            rows, features, weights = block(start, end)
+            used = np.unique(features)
+            columns[used] = np.arange(len(used))
+            queries = np.zeros((end - start, len(used)), dtype=np.float32)
+            queries[rows, columns[features]] = weights
+
+            best_scores = np.full((end - start, k), -np.inf, dtype=np.float32)
+            best_positions = np.full((end - start, k), -1, dtype=np.int64)
+            for candidate_start in range(0, count, block_size):
+                candidate_end = min(candidate_start + block_size, count)
+                candidate_rows, candidate_features, candidate_weights = block(candidate_start, candidate_end)
+                shared = columns[candidate_features] >= 0
+                candidates = np.zeros((candidate_end - candidate_start, len(used)), dtype=np.float32)
+                candidates[candidate_rows[shared], columns[candidate_features[shared]]] = candidate_weights[shared]
+
+                similarity = queries @ candidates.T
+                # Only recipes sharing a feature are similar, and no recipe is its own neighbour.
+                similarity[similarity <= 0] = -np.inf
+                overlap_start, overlap_end = max(start, candidate_start), min(end, candidate_end)
+                if overlap_start < overlap_end:
+                    diagonal = np.arange(overlap_start, overlap_end)
+                    similarity[diagonal - start, diagonal - candidate_start] = -np.inf
+
+                merged_scores = np.concatenate((best_scores, similarity), axis=1)
+                merged_positions = np.concatenate((best_positions, np.broadcast_to(
+                    np.arange(candidate_start, candidate_end), similarity.shape)), axis=1)
+                top = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(merged_scores, top, axis=1)
+                best_positions = np.take_along_axis(merged_positions, top, axis=1)
+            columns[used] = -1
+
+            # Best first; equal scores in catalogue order.
+            order = np.lexsort((best_positions, -best_scores), axis=1)
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+            best_positions = np.take_along_axis(best_positions, order, axis=1)
+            found = np.isfinite(best_scores)
+            neighbours[start:end] = np.where(found, best_positions, -1)
+            scores[start:end] = np.where(found, best_scores, 0)
+        return neighbours, scores
+
+    @property
+    def fingerprint(self) -> str:
+        return self.__fingerprint
+
+    @property
+    def k(self) -> int:
+        return self.__neighbours.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.__recipe_ids)
+
+    def similar(self, recipe_id: int, limit: int = None) -> list[Neighbour]:
+        """ Returns up to limit (at most k) recipes most similar to recipe_id, best first; [] for unknown ids. """
+        row = self.__rows[recipe_id] if 0 <= recipe_id < len(self.__rows) else -1
+        if row < 0:
+            return []
+        positions = self.__neighbours[row, :limit]
+        found = positions >= 0
+        return [Neighbour(int(recipe_id), float(score)) for recipe_id, score in
+                zip(self.__recipe_ids[positions[found]], self.__scores[row, :limit][found])]
+
+    def save(self, path: str) -> None:
+        """ Writes the neighbour lists as an uncompressed .npz archive, atomically replacing any existing file. """
+        temp_file = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            temp_file,
+            version=np.array(RECOMMENDATIONS_VERSION),
+            fingerprint=np.array(self.__fingerprint),
+            recipe_ids=self.__recipe_ids,
+            neighbours=self.__neighbours,
+            scores=self.__scores,
+        )
+        os.replace(temp_file, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SimilarRecipes":
+        with np.load(path, allow_pickle=False) as archive:
+            if int(archive['version']) != RECOMMENDATIONS_VERSION:
+                raise ValueError(f"Unsupported recommendations version in {path}")
+            return cls(archive['recipe_ids'], archive['neighbours'], archive['scores'], str(archive['fingerprint']))
+
+    @classmethod
+    def __load_current(cls, path: str, fingerprint: str) -> "SimilarRecipes | None":
+        try:
+            similar = cls.load(path)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return None
+        return similar if similar.fingerprint == fingerprint else None
+
+    @classmethod
+    def load_or_build(cls, recipes: Iterable[Recipe], fingerprint: str, path: str) -> "SimilarRecipes":
+        """ Loads the neighbour lists at path if they were built from the same data version, otherwise rebuilds them.
+
+        The build runs under build_lock(path): when several processes start on new data at once, one builds and saves
+        the lists while the others wait for it and then load its file, instead of each running the block job.
+        """
+        similar = cls.__load_current(path, fingerprint)
+        if similar is not None:
+            return similar
+        with build_lock(path):
+            # Another process may have saved them while this one waited for the lock.
+            similar = cls.__load_current(path, fingerprint)
+            if similar is None:
+                similar = cls.build(recipes, fingerprint)
+                try:
+                    similar.save(path)
+                except OSError:
+                    pass
+        return similar
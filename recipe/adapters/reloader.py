@@ -0,0 +1,215 @@
+import csv
+import io
+import logging
+import threading
+from typing import Callable, NamedTuple
+
+import recipe.adapters.repository as repo
+from recipe.adapters.datareader.csvdatareader import DEFAULT_CSV_FILE, RecipeRecord, compact_urls, \
+    data_fingerprint, decode_row, make_recipe, source_key
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.repository import AbstractRepository
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+
+logger = logging.getLogger(__name__)
+
+
+class RecordDiff(NamedTuple):
+    inserted: list[int]
+    updated: list[int]
+    deleted: list[int]
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.inserted or self.updated or self.deleted)
+
+
+class CsvRows(NamedTuple):
+    """ The raw (undecoded) rows of one version of recipes.csv, keyed by RecipeId in file order. """
+    fingerprint: str
+    fieldnames: list[str]
+    rows: dict[int, list[str]]
+
+
+def read_rows(csv_file: str) -> CsvRows:
+    """ Reads csv_file's rows; raises ValueError for a row whose length differs from the header's, e.g. a cut-off
+    last row of a file that is still being written. """
+    with open(csv_file, 'rb') as file:
+        data = file.read()
+    reader = csv.reader(io.StringIO(data.decode('utf-8'), newline=''))
+    fieldnames = next(reader)
+    id_column = fieldnames.index('RecipeId')
+    rows = {}
+    for values in reader:
+        if not values:
+            continue
+        if len(values) != len(fieldnames):
+            raise ValueError(f"Line {reader.line_num} has {len(values)} columns, expected {len(fieldnames)}")
+        rows[int(values[id_column])] = values
+    return CsvRows(data_fingerprint(data), fieldnames, rows)
+
+
+def diff_rows(previous: dict[int, int], current: dict[int, int]) -> RecordDiff:
+    """ Compares two {recipe id: row hash} maps; ids are listed in the order of the map they come from. """
+    return RecordDiff(
+        inserted=[recipe_id for recipe_id in current if recipe_id not in previous],
+        updated=[recipe_id for recipe_id, row_hash in current.items()
+                 if recipe_id in previous and previous[recipe_id] != row_hash],
+        deleted=[recipe_id for recipe_id in previous if recipe_id not in current],
+    )
+
+
+def copy_recipe(recipe: Recipe, author: Author, category: Category) -> Recipe:
+    """ Returns a new Recipe sharing recipe's field values but linked to the given author and category. """
+    copy = Recipe(
+        recipe_id=recipe.id,
+        name=recipe.name,
+        author=author,
+        cook_time=recipe.cook_time,
+        preparation_time=recipe.preparation_time,
+        total_time=recipe.total_time,
+        created_date=recipe.date,
+        description=recipe.description,
+        images=compact_urls(recipe.images),
+        category=category,
+        ingredient_quantities=recipe.ingredient_quantities,
+        ingredients=recipe.ingredients,
+        rating=recipe.rating,
+        nutrition=recipe.nutrition,
+        servings=recipe.servings,
+        recipe_yield=recipe.recipe_yield,
+        instructions=recipe.instructions
+    )
+    for review in recipe.reviews:
+        copy.add_review(review)
+    return copy
+
+
+def rebuild_repository(repository: AbstractRepository, source: CsvRows, changed: set[int]) -> MemoryRepository:
+    """ Builds a new MemoryRepository for source, leaving repository and every object it holds untouched.
+
+    Only the rows in changed are decoded; every other recipe is copied from repository, sharing its already decoded
+    values. Recipes, authors and categories all refer to each other, so a consistent snapshot needs new objects for
+    the whole graph, but copying a recipe costs far less than decoding its row. Category ids are kept by name, and
+    new categories are numbered after the existing ones.
+    """
+    category_ids = {category.name: category.id for category in repository.get_categories()}
+    next_category_id = max(category_ids.values(), default=0) + 1
+    authors: dict[int, Author] = {}
+    categories: dict[str, Category] = {}
+
+    def get_author(author_id: int, name: str) -> Author:
+        author = authors.get(author_id)
+        if author is None:
+            author = authors[author_id] = Author(author_id, name)
+        return author
+
+    def get_category(name: str) -> Category:
+        nonlocal next_category_id
+        category = categories.get(name)
+        if category is None:
+            category_id = category_ids.get(name)
+            if category_id is None:
+                category_id = category_ids[name] = next_category_id
+                next_category_id += 1
+            category = categories[name] = Category(name=name, category_id=category_id)
+        return category
+
+    new_repository = MemoryRepository()
+    for recipe_id, values in source.rows.items():
+        old = repository.get_recipe(recipe_id) if recipe_id not in changed else None
+        if old is None:
+            record: RecipeRecord = decode_row(dict(zip(source.fieldnames, values)))
+            recipe = make_recipe(record, get_author(record.author_id, record.author_name),
+                                 get_category(record.category_name))
+        else:
+            recipe = copy_recipe(old, get_author(old.author.id, old.author.name), get_category(old.category.name))
+        recipe.author.add_recipe(recipe)
+        recipe.category.add_recipe(recipe)
+        new_repository.add_recipe(recipe)
+    return new_repository
+
+
+class CatalogueReloader:
+    """ Watches recipes.csv and publishes an updated copy of the repository whenever the file's content changes.
+
+    The file is polled with os.stat. On a change, its rows are compared by RecipeId against the previous version
+    (by row hash), only inserted and updated rows are decoded, and a new repository is built off to the side, passed
+    through wrap_repository if given, and then published together with the new fingerprint by repo.publish. The new
+    repository comes from rebuild(published repository, new rows, ids of the changed rows), rebuild_repository by
+    default. Requests that already hold the old (repository, version) pair keep a consistent snapshot until they
+    finish. A file that fails to parse or decode, e.g. one still being written, leaves the published repository as it
+    is and is retried on the next poll; publishing the file with an atomic rename avoids that altogether.
+    """
+
+    def __init__(self, csv_file: str = None, interval: float = 5.0,
+                 on_reload: Callable[[RecordDiff, str], None] = None,
+                 wrap_repository: Callable[[AbstractRepository], AbstractRepository] = None,
+                 rebuild: Callable[[AbstractRepository, CsvRows, set[int]], AbstractRepository] = None):
+        self.csv_file = csv_file if csv_file else DEFAULT_CSV_FILE
+        self.interval = interval
+        self.on_reload = on_reload
+        self.wrap_repository = wrap_repository
+        self.rebuild = rebuild if rebuild is not None else rebuild_repository
+        self.__lock = threading.Lock()
+        self.__stopped = threading.Event()
+        self.__thread = None
+        self.__source_key = self.__stat()
+        self.__row_hashes = self.__hash_rows(read_rows(self.csv_file))
+
+    def __stat(self) -> tuple[int, int] | None:
+        try:
+            return source_key(self.csv_file)
+        except OSError:
+            return None
+
+    @staticmethod
+    def __hash_rows(source: CsvRows) -> dict[int, int]:
+        return {recipe_id: hash(tuple(values)) for recipe_id, values in source.rows.items()}
+
+    def check(self) -> RecordDiff | None:
+        """ Polls the file once; returns the applied diff, or None when the file is unchanged or unreadable. """
+        with self.__lock:
+            key = self.__stat()
+            if key is None or key == self.__source_key:
+                return None
+            try:
+                source = read_rows(self.csv_file)
+                row_hashes = self.__hash_rows(source)
+                diff = diff_rows(self.__row_hashes, row_hashes)
+                repository = None
+                if not diff.is_empty:
+                    repository = self.rebuild(repo.published.repository, source, set(diff.inserted + diff.updated))
+            except (OSError, UnicodeDecodeError, csv.Error, ValueError, KeyError, IndexError, StopIteration):
+                return None
+            if repository is not None:
+                if self.wrap_repository is not None:
+                    repository = self.wrap_repository(repository)
+                repo.publish(repository, source.fingerprint)
+            self.__source_key = key
+            self.__row_hashes = row_hashes
+        if not diff.is_empty and self.on_reload is not None:
+            self.on_reload(diff, source.fingerprint)
+        return diff
+
+    def start(self) -> None:
+        if self.__thread is None:
+            self.__stopped.clear()
+            self.__thread = threading.Thread(target=self.__run, name='catalogue-reloader', daemon=True)
+            self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def __run(self) -> None:
+        while not self.__stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                # Keep polling: a failure here must not switch hot reload off for the rest of the process.
+                logger.exception("Reloading %s failed", self.csv_file)
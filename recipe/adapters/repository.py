@@ -0,0 +1,93 @@
+import abc
+from datetime import datetime
+from typing import Iterator, NamedTuple
+
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+
+repo_instance = None
+
+
+class RepositoryException(Exception):
+    def __init__(self, message=None):
+        super().__init__(message)
+
+
+class AbstractRepository(abc.ABC):
+
+    @abc.abstractmethod
+    def add_recipe(self, recipe: Recipe):
+        """ Adds a Recipe, together with its author and category, to the repository. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_recipe(self, recipe_id: int) -> Recipe | None:
+        """ Returns the Recipe with the given id, or None if there is none. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_number_of_recipes(self) -> int:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_recipes(self, page: int = 1, per_page: int = 10) -> list[Recipe]:
+        """ Returns one page of recipes in ascending id order. Pages are numbered from 1. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def iter_recipes(self, after_id: int = None) -> Iterator[Recipe]:
+        """ Yields recipes in ascending id order, starting with the first id greater than after_id. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_recipes_by_author(self, author_id: int) -> list[Recipe]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_recipes_by_category(self, category_id: int) -> list[Recipe]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_recipes_by_date_range(self, start: datetime, end: datetime) -> list[Recipe]:
+        """ Returns the recipes published between start and end (both inclusive), oldest first. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_author(self, author_id: int) -> Author | None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_authors(self) -> list[Author]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_category(self, category_id: int) -> Category | None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_category_by_name(self, name: str) -> Category | None:
+        """ Returns the Category with the given name, ignoring case, or None if there is none. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_categories(self) -> list[Category]:
+        raise NotImplementedError
+
+
+class PublishedRepository(NamedTuple):
+    """ The repository the app serves, together with the version (CSV fingerprint) of the data it holds. """
+    repository: AbstractRepository
+    version: str
+
+
+# Swapped as a single reference by publish(), so code that reads it once per request never pairs one repository
+# with another's version. repo_instance always names the same repository, for code that needs no version.
+published: PublishedRepository | None = None
+
+
+def publish(repository: AbstractRepository, version: str) -> None:
+    """ Makes repository, holding data of the given version, the one the app serves. """
+    global published, repo_instance
+    published = PublishedRepository(repository, version)
+    repo_instance = repository
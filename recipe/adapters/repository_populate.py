@@ -0,0 +1,10 @@
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.repository import AbstractRepository
+
+
+def populate(repo: AbstractRepository, reader: CSVDataReader = None):
+    """ Loads every recipe read from recipes.csv into the repository. """
+    if reader is None:
+        reader = CSVDataReader()
+    for recipe in reader.recipes:
+        repo.add_recipe(recipe)
@@ -0,0 +1,203 @@
+import os
+import re
+import zipfile
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from recipe.domainmodel.recipe import Recipe
+
+# Bump whenever tokenisation, field weights or the file layout change, so stale index files are rebuilt.
+INDEX_VERSION = 1
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into', 'is', 'it', 'of', 'on', 'or',
+    'that', 'the', 'this', 'to', 'with',
+))
+
+# Term frequencies are weighted by the field a term occurs in (a simple BM25F).
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'category': 2.0,
+    'author': 2.0,
+    'ingredients': 1.5,
+    'description': 1.0,
+}
+
+
+def tokenise(text: str) -> list[str]:
+    """ Lower-cases text, splits it into alphanumeric words, drops stop words and folds simple plurals. """
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def recipe_fields(recipe: Recipe) -> dict[str, str]:
+    return {
+        'name': recipe.name,
+        'category': recipe.category.name if recipe.category else '',
+        'author': recipe.author.name,
+        'ingredients': ' '.join(recipe.ingredients),
+        'description': recipe.description or '',
+    }
+
+
+class SearchPage(NamedTuple):
+    total: int
+    page: int
+    per_page: int
+    recipe_ids: list[int]
+    scores: list[float]
+
+    @property
+    def page_count(self) -> int:
+        return (self.total + self.per_page - 1) // self.per_page
+
+
+class RecipeSearchIndex:
+    """ Inverted index over recipe text, ranked with Okapi BM25.
+
+    Each term maps to a slice of two parallel arrays: the positions of the recipes containing it and its BM25 weight
+    in each of them. Weights do not depend on the query, so they are computed once at build time and a search only
+    sums the postings of its terms.
+    """
+
+    def __init__(self, recipe_ids: np.ndarray, terms: list[str], term_offsets: np.ndarray, postings: np.ndarray,
+                 weights: np.ndarray, fingerprint: str = ''):
+        self.__recipe_ids = recipe_ids
+        self.__term_positions = {term: index for index, term in enumerate(terms)}
+        self.__terms = terms
+        self.__term_offsets = term_offsets
+        self.__postings = postings
+        self.__weights = weights
+        self.__fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, recipes: Iterable[Recipe], fingerprint: str = '', k1: float = 1.2,
+              b: float = 0.75) -> "RecipeSearchIndex":
+        recipe_ids = []
+        document_lengths = []
+        frequencies: dict[str, dict[int, float]] = {}
+        for position, recipe in enumerate(recipes):
+            recipe_ids.append(recipe.id)
+            length = 0.0
+            for field, text in recipe_fields(recipe).items():
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenise(text):
+                    documents = frequencies.setdefault(token, {})
+                    documents[position] = documents.get(position, 0.0) + weight
+                    length += weight
+            document_lengths.append(length)
+
+        document_count = len(recipe_ids)
+        lengths = np.array(document_lengths, dtype=np.float64)
+        average_length = lengths.mean() if document_count else 0.0
+        length_norm = k1 * (1 - b + b * lengths / average_length) if document_count else lengths
+
+        terms = sorted(frequencies)
+        term_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        postings_chunks, weight_chunks = [], []
+        for index, term in enumerate(terms):
+            documents = frequencies[term]
+            positions = np.fromiter(documents.keys(), dtype=np.int32, count=len(documents))
+            tf = np.fromiter(documents.values(), dtype=np.float64, count=len(documents))
+            idf = np.log(1 + (document_count - len(documents) + 0.5) / (len(documents) + 0.5))
+            postings_chunks.append(positions)
+            weight_chunks.append((idf * tf * (k1 + 1) / (tf + length_norm[positions])).astype(np.float32))
+            term_offsets[index + 1] = term_offsets[index] + len(documents)
+
+        return cls(
+            np.array(recipe_ids, dtype=np.int64),
+            terms,
+            term_offsets,
+            np.concatenate(postings_chunks) if postings_chunks else np.zeros(0, dtype=np.int32),
+            np.concatenate(weight_chunks) if weight_chunks else np.zeros(0, dtype=np.float32),
+            fingerprint,
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        return self.__fingerprint
+
+    def __len__(self) -> int:
+        return len(self.__recipe_ids)
+
+    def search(self, query: str, page: int = 1, per_page: int = 10) -> SearchPage:
+        """ Returns one page of the recipes matching any query term, best BM25 score first. """
+        if page < 1 or per_page < 1:
+            raise ValueError("page and per_page must be positive.")
+        scores = None
+        for token in set(tokenise(query)):
+            index = self.__term_positions.get(token)
+            if index is None:
+                continue
+            start, end = self.__term_offsets[index], self.__term_offsets[index + 1]
+            if scores is None:
+                scores = np.zeros(len(self.__recipe_ids), dtype=np.float32)
+            scores[self.__postings[start:end]] += self.__weights[start:end]
+        if scores is None:
+            return SearchPage(0, page, per_page, [], [])
+
+        matches = np.flatnonzero(scores)
+        needed = min(page * per_page, len(matches))
+        first = (page - 1) * per_page
+        if first >= needed:
+            return SearchPage(len(matches), page, per_page, [], [])
+        match_scores = -scores[matches]
+        if needed < len(matches):
+            # Keep every match tied with the last needed score so that pages never overlap or skip a recipe.
+            threshold = np.partition(match_scores, needed - 1)[needed - 1]
+            top = np.flatnonzero(match_scores <= threshold)
+        else:
+            top = np.arange(len(matches))
+        ranked = top[np.lexsort((matches[top], match_scores[top]))][first:needed]
+        return SearchPage(
+            len(matches), page, per_page,
+            self.__recipe_ids[matches[ranked]].tolist(),
+            (-match_scores[ranked]).astype(float).tolist(),
+        )
+
+    def save(self, path: str) -> None:
+        """ Writes the index as an uncompressed .npz archive, atomically replacing any existing file. """
+        temp_file = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            temp_file,
+            version=np.array(INDEX_VERSION),
+            fingerprint=np.array(self.__fingerprint),
+            recipe_ids=self.__recipe_ids,
+            terms=np.array(self.__terms, dtype=str),
+            term_offsets=self.__term_offsets,
+            postings=self.__postings,
+            weights=self.__weights,
+        )
+        os.replace(temp_file, path)
+
+    @classmethod
+    def load(cls, path: str) -> "RecipeSearchIndex":
+        with np.load(path, allow_pickle=False) as archive:
+            if int(archive['version']) != INDEX_VERSION:
+                raise ValueError(f"Unsupported search index version in {path}")
+            return cls(archive['recipe_ids'], archive['terms'].tolist(), archive['term_offsets'],
+                       archive['postings'], archive['weights'], str(archive['fingerprint']))
+
+    @classmethod
+    def load_or_build(cls, recipes: Iterable[Recipe], fingerprint: str, path: str) -> "RecipeSearchIndex":
+        """ Loads the index at path if it was built from the same data version, otherwise rebuilds and saves it. """
+        try:
+            index = cls.load(path)
+            if index.fingerprint == fingerprint:
+                return index
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            pass
+        index = cls.build(recipes, fingerprint)
+        try:
+            index.save(path)
+        except OSError:
+            pass
+        return index
@@ -0,0 +1,276 @@
+import json
+import math
+import threading
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+import recipe.adapters.repository as repo
+from recipe.adapters.datareader.csvdatareader import NUTRITION_COLUMNS
+from recipe.adapters.nutritionindex import NutritionIndex
+from recipe.adapters.recommendations import SimilarRecipes
+from recipe.adapters.repository import AbstractRepository, PublishedRepository
+from recipe.domainmodel.nutrition import NUTRITION_FIELDS
+from recipe.domainmodel.recipe import Recipe
+
+api_blueprint = Blueprint('api_bp', __name__, url_prefix='/api')
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+_similar_recipes_lock = threading.Lock()
+_nutrition_index_lock = threading.Lock()
+
+
+def _nutrition(recipe: Recipe) -> dict:
+    nutrition = recipe.nutrition
+    return {attribute: getattr(nutrition, attribute, None) for attribute, _ in NUTRITION_COLUMNS}
+
+
+# Each field reads straight from the Recipe's properties; lists are serialised in place, never copied first.
+FIELD_SERIALISERS: dict[str, Callable[[Recipe], object]] = {
+    'id': lambda recipe: recipe.id,
+    'name': lambda recipe: recipe.name,
+    'author': lambda recipe: {'id': recipe.author.id, 'name': recipe.author.name},
+    'category': lambda recipe: {'id': recipe.category.id, 'name': recipe.category.name} if recipe.category else None,
+    'cook_time': lambda recipe: recipe.cook_time,
+    'preparation_time': lambda recipe: recipe.preparation_time,
+    'total_time': lambda recipe: recipe.total_time,
+    'date': lambda recipe: recipe.date.isoformat() if recipe.date else None,
+    'description': lambda recipe: recipe.description,
+    'images': lambda recipe: recipe.images,
+    'ingredient_quantities': lambda recipe: recipe.ingredient_quantities,
+    'ingredients': lambda recipe: recipe.ingredients,
+    'rating': lambda recipe: recipe.rating,
+    'nutrition': _nutrition,
+    'servings': lambda recipe: recipe.servings,
+    'recipe_yield': lambda recipe: recipe.recipe_yield,
+    'instructions': lambda recipe: recipe.instructions,
+}
+
+
+class InvalidArgument(ValueError):
+    pass
+
+
+def serialise(recipe: Recipe, fields: Iterable[str]) -> dict:
+    return {field: FIELD_SERIALISERS[field](recipe) for field in fields}
+
+
+def _int_argument(name: str, default: int = None) -> int | None:
+    value = request.args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise InvalidArgument(f"{name} must be an integer.") from None
+
+
+def _float_argument(name: str) -> float | None:
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        raise InvalidArgument(f"{name} must be a number.") from None
+    # float() also accepts 'nan' and 'inf', which match nothing or everything and cannot be written as JSON.
+    if not math.isfinite(number):
+        raise InvalidArgument(f"{name} must be a finite number.")
+    return number
+
+
+def _selected_fields() -> tuple[str, ...]:
+    value = request.args.get('fields')
+    if not value:
+        return tuple(FIELD_SERIALISERS)
+    fields = tuple(field.strip() for field in value.split(',') if field.strip())
+    unknown = [field for field in fields if field not in FIELD_SERIALISERS]
+    if unknown:
+        raise InvalidArgument(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def _matching_recipes(repository: AbstractRepository, after_id: int | None) -> Iterator[Recipe]:
+    """ Returns an iterator over the recipes matching the filter arguments, in ascending id order, after the cursor.
+
+    Arguments are validated here, before iteration starts, so that a streamed response never fails halfway.
+    """
+    category_name = request.args.get('category')
+    author_id = _int_argument('author')
+    max_total_time = _int_argument('max_total_time')
+    min_calories = _float_argument('min_calories')
+    max_calories = _float_argument('max_calories')
+
+    # Narrow the candidates with the repository's author or category index where possible.
+    candidates = None
+    if category_name:
+        category = repository.get_category_by_name(category_name)
+        candidates = repository.get_recipes_by_category(category.id) if category else []
+    if author_id is not None:
+        by_author = repository.get_recipes_by_author(author_id)
+        if candidates is None:
+            candidates = by_author
+        else:
+            in_category = set(candidates)
+            candidates = [recipe for recipe in by_author if recipe in in_category]
+    if candidates is None:
+        candidates = repository.iter_recipes(after_id)
+    else:
+        candidates = sorted(recipe for recipe in candidates if after_id is None or recipe.id > after_id)
+
+    predicates = []
+    if max_total_time is not None:
+        predicates.append(lambda recipe: recipe.total_time <= max_total_time)
+    if min_calories is not None or max_calories is not None:
+        low = min_calories if min_calories is not None else float('-inf')
+        high = max_calories if max_calories is not None else float('inf')
+
+        def calories_in_range(recipe: Recipe) -> bool:
+            calories = getattr(recipe.nutrition, 'calories', None)
+            return calories is not None and low <= calories <= high
+
+        predicates.append(calories_in_range)
+
+    return (recipe for recipe in candidates if all(predicate(recipe) for predicate in predicates))
+
+
+def _wants_ndjson() -> bool:
+    if request.args.get('format') == 'ndjson':
+        return True
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+@api_blueprint.errorhandler(InvalidArgument)
+def bad_request(error: InvalidArgument):
+    return jsonify({'error': str(error)}), 400
+
+
+@api_blueprint.route('/recipes', methods=['GET'])
+def list_recipes():
+    """ Lists recipes in ascending id order.
+
+    Query arguments: cursor (the next_cursor of the previous page), limit, fields (comma separated), category (name),
+    author (id), max_total_time (minutes), min_calories and max_calories. With format=ndjson, or when the client
+    prefers application/x-ndjson, every match after the cursor is streamed one JSON object per line (up to limit, if
+    given) instead of returning one page.
+    """
+    after_id = _int_argument('cursor')
+    fields = _selected_fields()
+    # Keep one repository for the whole request, so a hot reload cannot switch data halfway through a stream.
+    repository = repo.repo_instance
+
+    if _wants_ndjson():
+        limit = _int_argument('limit')
+        if limit is not None and limit < 1:
+            raise InvalidArgument("limit must be positive.")
+        recipes = islice(_matching_recipes(repository, after_id), limit)
+
+        # The generator pulls recipes from the repository one at a time, so memory use does not grow with the result.
+        def generate():
+            for recipe in recipes:
+                yield json.dumps(serialise(recipe, fields), ensure_ascii=False) + '\n'
+
+        return Response(generate(), mimetype=NDJSON_MIMETYPE)
+
+    limit = _int_argument('limit', DEFAULT_LIMIT)
+    if not 1 <= limit <= MAX_LIMIT:
+        raise InvalidArgument(f"limit must be between 1 and {MAX_LIMIT}.")
+    page = list(islice(_matching_recipes(repository, after_id), limit + 1))
+    next_cursor = str(page[limit - 1].id) if len(page) > limit else None
+    return jsonify({
+        'recipes': [serialise(recipe, fields) for recipe in page[:limit]],
+        'next_cursor': next_cursor,
+    })
+
+
+def _nutrition_index(published: PublishedRepository) -> NutritionIndex:
+    """ Returns the nutrition index of the published data, building it on first use after each reload. """
+    built = current_app.extensions.get('nutrition_index')
+    if built is None or built[0] != published.version:
+        with _nutrition_index_lock:
+            built = current_app.extensions.get('nutrition_index')
+            if built is None or built[0] != published.version:
+                built = current_app.extensions['nutrition_index'] = \
+                    (published.version, NutritionIndex.build(published.repository.iter_recipes()))
+    return built[1]
+
+
+@api_blueprint.route('/recipes/nearest-nutrition', methods=['GET'])
+def nearest_nutrition():
+    """ Lists the recipes whose nutrition is closest to the given targets, nearest first, each with its distance.
+
+    Query arguments: one or more nutrition targets by field name (e.g. calories=500&protein_content=30), limit and
+    fields (comma separated). Distances are in interquartile ranges of each field across the catalogue.
+    """
+    fields = _selected_fields()
+    limit = _int_argument('limit', DEFAULT_LIMIT)
+    if not 1 <= limit <= MAX_LIMIT:
+        raise InvalidArgument(f"limit must be between 1 and {MAX_LIMIT}.")
+    targets = {field: target for field in NUTRITION_FIELDS if (target := _float_argument(field)) is not None}
+    if not targets:
+        raise InvalidArgument(f"At least one nutrition target is required: {', '.join(NUTRITION_FIELDS)}.")
+
+    # One read of the published pair, so the index always belongs to the repository the recipes are looked up in.
+    published = repo.published
+    repository = published.repository
+    results = []
+    for match in _nutrition_index(published).nearest(limit, **targets):
+        some_recipe = repository.get_recipe(match.recipe_id)
+        if some_recipe is not None:
+            results.append(dict(serialise(some_recipe, fields), distance=round(match.distance, 3)))
+    return jsonify({'targets': targets, 'recipes': results})
+
+
+@api_blueprint.route('/recipes/<int:recipe_id>', methods=['GET'])
+def get_recipe(recipe_id: int):
+    some_recipe = repo.repo_instance.get_recipe(recipe_id)
+    if some_recipe is None:
+        return jsonify({'error': f"Recipe {recipe_id} not found."}), 404
+    return jsonify(serialise(some_recipe, _selected_fields()))
+
+
+def prepare_similar_recipes(app, published: PublishedRepository) -> SimilarRecipes:
+    """ Returns the neighbour lists of the published data, loading or building them on first use of each version.
+
+    The app calls this at startup and after every reload, so requests normally find the lists ready. They are saved
+    to SIMILAR_RECIPES_FILE if that is set, so a restart only rebuilds them when recipes.csv has changed.
+    """
+    similar = app.extensions.get('similar_recipes')
+    if similar is None or similar.fingerprint != published.version:
+        with _similar_recipes_lock:
+            similar = app.extensions.get('similar_recipes')
+            if similar is None or similar.fingerprint != published.version:
+                recipes, path = published.repository.iter_recipes(), app.config.get('SIMILAR_RECIPES_FILE')
+                similar = app.extensions['similar_recipes'] = \
+                    SimilarRecipes.load_or_build(recipes, published.version, path) if path else \
+                    SimilarRecipes.build(recipes, published.version)
+    return similar
+
+
+@api_blueprint.route('/recipes/<int:recipe_id>/similar', methods=['GET'])
+def similar_recipes(recipe_id: int):
+    """ Lists the recipes most similar to one recipe by ingredients and category, best first, each with its score.
+
+    Query arguments: limit (at most the number of precomputed neighbours) and fields (comma separated).
+    """
+    fields = _selected_fields()
+    # One read of the published pair, so the lists always belong to the repository the recipes are looked up in.
+    published = repo.published
+    repository = published.repository
+    if repository.get_recipe(recipe_id) is None:
+        return jsonify({'error': f"Recipe {recipe_id} not found."}), 404
+    similar = prepare_similar_recipes(current_app, published)
+    limit = _int_argument('limit', similar.k)
+    if not 1 <= limit <= similar.k:
+        raise InvalidArgument(f"limit must be between 1 and {similar.k}.")
+
+    results = []
+    for neighbour in similar.similar(recipe_id, limit):
+        some_recipe = repository.get_recipe(neighbour.recipe_id)
+        if some_recipe is not None:
+            results.append(dict(serialise(some_recipe, fields), score=round(neighbour.score, 3)))
+    return jsonify({'recipe_id': recipe_id, 'similar': results})
@@ -1,10 +1,18 @@
+from recipe.domainmodel.indexedlist import IndexedList
 from recipe.domainmodel.recipe import Recipe
+from recipe.domainmodel.recipestats import RecipeStats
 
 class Author:
+    __slots__ = ('__id', '__name', '__recipes', '__stats')
+
     def __init__(self, author_id: int, name: str, recipes: list["Recipe"] = None):
         self.__id = author_id
         self.__name = name
-        self.__recipes = recipes if recipes is not None else []
+        # Insertion-ordered with an O(1) membership index; recipes passed in keep any duplicates.
+        self.__recipes: IndexedList = IndexedList()
+        self.__stats = RecipeStats()
+        for recipe in recipes if recipes is not None else []:
+            self.__list_recipe(recipe)
 
     def __repr__(self) -> str:
         return f"<Author {self.id}: {self.name}>"
@@ -31,14 +39,29 @@ class Author:
         return self.__name
 
     @property
-    def recipes(self) -> list["Recipe"]:
+    def recipes(self) -> IndexedList:
+        """ The author's recipes in the order they were added, as a read-only sequence. """
         return self.__recipes
 
+    @property
+    def stats(self) -> RecipeStats:
+        """ Aggregates over this author's recipes, kept up to date as recipes are added and re-rated. """
+        return self.__stats
+
     def add_recipe(self, recipe: "Recipe") -> None:
         from recipe.domainmodel.recipe import Recipe
         if not isinstance(recipe, Recipe):
             raise TypeError("Expected a Recipe instance")
         if recipe not in self.__recipes:
-            self.__recipes.append(recipe)
+            self.__list_recipe(recipe)
         else:
             raise ValueError("Recipe already exists for this author")
+
+    def __list_recipe(self, recipe: "Recipe") -> None:
+        self.__recipes._append(recipe)
+        self.__stats.add(recipe)
+
+    def _recipe_rating_changed(self, recipe: "Recipe", previous: float | None, rating: float | None) -> None:
+        """ Called by Recipe when its rating changes, so the aggregates can follow. """
+        for _ in range(self.__recipes.count(recipe)):
+            self.__stats.rating_changed(previous, rating)
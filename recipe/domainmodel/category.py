@@ -1,10 +1,18 @@
+from recipe.domainmodel.indexedlist import IndexedList
 from recipe.domainmodel.recipe import Recipe
+from recipe.domainmodel.recipestats import RecipeStats
 
 class Category:
+    __slots__ = ('__id', '__name', '__recipes', '__stats')
+
     def __init__(self, name: str, recipes: list[Recipe] = None, category_id: int = None):
         self.__id = category_id
         self.__name = name
-        self.__recipes = recipes if recipes is not None else []
+        # Indexed, so a rating change finds a recipe's entries without scanning the list.
+        self.__recipes: IndexedList = IndexedList()
+        self.__stats = RecipeStats()
+        for recipe in recipes if recipes is not None else []:
+            self.__list_recipe(recipe)
 
     def __repr__(self) -> str:
         return f"<Category {self.id}: {self.name}>"
@@ -31,12 +39,28 @@ class Category:
         return self.__name
 
     @property
-    def recipes(self) -> list[Recipe]:
+    def recipes(self) -> IndexedList:
+        """ The category's recipes in the order they were added, as a read-only sequence. """
         return self.__recipes
 
+    @property
+    def stats(self) -> RecipeStats:
+        """ Aggregates over this category's recipes, kept up to date as recipes are added and re-rated. """
+        return self.__stats
+
     def add_recipe(self, recipe: Recipe) -> None:
         from recipe.domainmodel.recipe import Recipe
         if isinstance(recipe, Recipe):
-            self.__recipes.append(recipe)
+            self.__list_recipe(recipe)
         else:
             raise TypeError("Expected a Recipe instance")
+
+    def __list_recipe(self, recipe: Recipe) -> None:
+        self.__recipes._append(recipe)
+        self.__stats.add(recipe)
+
+    def _recipe_rating_changed(self, recipe: Recipe, previous: float | None, rating: float | None) -> None:
+        """ Called by Recipe when its rating changes, so the aggregates can follow. """
+        # A recipe added twice is counted twice, like it is listed twice.
+        for _ in range(self.__recipes.count(recipe)):
+            self.__stats.rating_changed(previous, rating)
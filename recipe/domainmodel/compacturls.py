@@ -0,0 +1,72 @@
+from typing import Iterable, Iterator
+
+
+def split_url(url: str) -> tuple[str, str]:
+    """ Splits a URL before its last two path segments, e.g. '.../img/recipes/' and '38/picuaETeN.jpg'.
+
+    The directory above the file's own is where image URLs stop repeating, so that is where the prefix ends.
+    """
+    end = url.rfind('/', 0, url.rfind('/')) + 1
+    return url[:end], url[end:]
+
+
+class UrlPrefixes:
+    """ A table of URL prefixes, each stored once and referred to by its index. Prefixes are never removed. """
+    __slots__ = ('__prefixes', '__ids')
+
+    def __init__(self):
+        self.__prefixes: list[str] = []
+        self.__ids: dict[str, int] = {}
+
+    def id_of(self, prefix: str) -> int:
+        prefix_id = self.__ids.get(prefix)
+        if prefix_id is None:
+            prefix_id = self.__ids[prefix] = len(self.__prefixes)
+            self.__prefixes.append(prefix)
+        return prefix_id
+
+    def __getitem__(self, prefix_id: int) -> str:
+        return self.__prefixes[prefix_id]
+
+    def __len__(self) -> int:
+        return len(self.__prefixes)
+
+
+class CompactUrls:
+    """ An immutable list of URLs held as (prefix id, suffix) pairs against a shared UrlPrefixes table.
+
+    The pairs are kept in one flat tuple, so each URL costs a tuple slot, a small int and its suffix string rather than
+    a full copy of the long, shared CDN prefix. URLs are rebuilt when iterated or expanded.
+    """
+    __slots__ = ('__prefixes', '__parts')
+
+    def __init__(self, urls: Iterable[str], prefixes: UrlPrefixes):
+        parts = []
+        for url in urls:
+            prefix, suffix = split_url(url)
+            parts.append(prefixes.id_of(prefix))
+            parts.append(suffix)
+        self.__prefixes = prefixes
+        self.__parts = tuple(parts)
+
+    def __len__(self) -> int:
+        return len(self.__parts) // 2
+
+    def __iter__(self) -> Iterator[str]:
+        prefixes, parts = self.__prefixes, self.__parts
+        return (prefixes[parts[index]] + parts[index + 1] for index in range(0, len(parts), 2))
+
+    def expand(self) -> list[str]:
+        return list(self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompactUrls):
+            return self.expand() == other.expand()
+        if isinstance(other, list):
+            return self.expand() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"CompactUrls({self.expand()!r})"
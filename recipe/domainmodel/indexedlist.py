@@ -0,0 +1,83 @@
+from typing import Any, Callable, Hashable, Iterable, Iterator, Sequence
+
+# Marks the slot of a removed entry until the next compaction.
+_REMOVED = object()
+
+
+class IndexedList(Sequence):
+    """ An insertion-ordered list with a hash index over its entries, for the collections the domain model exposes.
+
+    Appending, membership tests, counting and removing an entry are all O(1): each key maps to the positions of its
+    entries, and a removal only marks its slot, so the list never shifts. Marked slots are dropped in one pass once
+    they outnumber the live entries, or before the first positional read after a removal. An entry may be listed more
+    than once; remove takes out the first. key(entry) gives the hashable identity entries are indexed by; by default
+    it is the entry itself.
+
+    To callers it is a read-only sequence. Only the owning object changes it, through _append and _remove, so the list
+    and its index cannot drift apart.
+    """
+    __slots__ = ('__entries', '__positions', '__removed', '__key')
+
+    def __init__(self, entries: Iterable = (), key: Callable[[Any], Hashable] = None):
+        self.__entries: list = []
+        self.__positions: dict[Hashable, list[int]] = {}
+        self.__removed = 0
+        self.__key = key
+        for entry in entries:
+            self._append(entry)
+
+    def __key_of(self, entry) -> Hashable:
+        return entry if self.__key is None else self.__key(entry)
+
+    def __len__(self) -> int:
+        return len(self.__entries) - self.__removed
+
+    def __iter__(self) -> Iterator:
+        return (entry for entry in self.__entries if entry is not _REMOVED)
+
+    def __contains__(self, entry: Any) -> bool:
+        return self.__key_of(entry) in self.__positions
+
+    def __getitem__(self, index: int | slice):
+        if self.__removed:
+            self.__compact()
+        return self.__entries[index]
+
+    def count(self, entry: Any) -> int:
+        return len(self.__positions.get(self.__key_of(entry), ()))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (IndexedList, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def _append(self, entry) -> None:
+        self.__positions.setdefault(self.__key_of(entry), []).append(len(self.__entries))
+        self.__entries.append(entry)
+
+    def _remove(self, entry) -> Any:
+        """ Removes the first entry listed under entry's key and returns it; raises ValueError if there is none. """
+        key = self.__key_of(entry)
+        positions = self.__positions.get(key)
+        if not positions:
+            raise ValueError(f"{entry!r} is not in the list")
+        position = positions.pop(0)
+        if not positions:
+            del self.__positions[key]
+        removed, self.__entries[position] = self.__entries[position], _REMOVED
+        self.__removed += 1
+        if self.__removed > len(self):
+            self.__compact()
+        return removed
+
+    def __compact(self) -> None:
+        entries = [entry for entry in self.__entries if entry is not _REMOVED]
+        positions: dict[Hashable, list[int]] = {}
+        for position, entry in enumerate(entries):
+            positions.setdefault(self.__key_of(entry), []).append(position)
+        self.__entries, self.__positions, self.__removed = entries, positions, 0
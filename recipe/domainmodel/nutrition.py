@@ -1,3 +1,143 @@
+import math
+from array import array
+from typing import Iterable
+
+# Per-serving values, in the order of the recipes.csv columns: kcal, then grams, except cholesterol and sodium in mg.
+NUTRITION_FIELDS = ('calories', 'fat_content', 'saturated_fat_content', 'cholesterol_content', 'sodium_content',
+                    'carbohydrate_content', 'fiber_content', 'sugar_content', 'protein_content')
+
+_MISSING = math.nan
+
+
+def _checked(field: str, value: float | None) -> float:
+    """ Validates one nutrition value, returning it as a float with NaN standing for a missing value. """
+    if value is None:
+        return _MISSING
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(f"{field} must be a number or None.")
+    if value < 0:
+        raise ValueError(f"{field} cannot be negative.")
+    return float(value)
+
+
 class Nutrition:
-# TODO: Complete the implementation of the Nutrition class.
-    pass
\ No newline at end of file
+    """ Per-serving nutrition values of a recipe; any of them may be missing (None).
+
+    The nine values live in one array of doubles, with NaN marking a missing value, rather than as nine float objects,
+    as the catalogue holds one Nutrition per recipe. Two Nutrition objects are equal when all their values are.
+    """
+    __slots__ = ('__values',)
+
+    def __init__(self, calories: float | None = None, fat_content: float | None = None,
+                 saturated_fat_content: float | None = None, cholesterol_content: float | None = None,
+                 sodium_content: float | None = None, carbohydrate_content: float | None = None,
+                 fiber_content: float | None = None, sugar_content: float | None = None,
+                 protein_content: float | None = None):
+        values = (calories, fat_content, saturated_fat_content, cholesterol_content, sodium_content,
+                  carbohydrate_content, fiber_content, sugar_content, protein_content)
+        self.__values = array('d', [_checked(field, value) for field, value in zip(NUTRITION_FIELDS, values)])
+
+    @classmethod
+    def from_values(cls, values: Iterable[float | None]) -> "Nutrition":
+        """ Builds a Nutrition from values given in NUTRITION_FIELDS order. """
+        return cls(*values)
+
+    def as_tuple(self) -> tuple[float | None, ...]:
+        """ The values in NUTRITION_FIELDS order, with None for missing ones. """
+        return tuple(None if value != value else value for value in self.__values)
+
+    def __get(self, index: int) -> float | None:
+        value = self.__values[index]
+        return None if value != value else value
+
+    def __set(self, index: int, value: float | None) -> None:
+        self.__values[index] = _checked(NUTRITION_FIELDS[index], value)
+
+    def __copy__(self) -> "Nutrition":
+        # The default shallow copy would share the value array, so setting a value on the copy would change both.
+        return Nutrition.from_values(self.as_tuple())
+
+    def __repr__(self) -> str:
+        values = ', '.join(f"{field}={value}" for field, value in zip(NUTRITION_FIELDS, self.as_tuple())
+                           if value is not None)
+        return f"<Nutrition {values}>"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Nutrition):
+            return False
+        return self.as_tuple() == other.as_tuple()
+
+    def __hash__(self) -> int:
+        return hash(self.as_tuple())
+
+    @property
+    def calories(self) -> float | None:
+        return self.__get(0)
+
+    @calories.setter
+    def calories(self, value: float | None):
+        self.__set(0, value)
+
+    @property
+    def fat_content(self) -> float | None:
+        return self.__get(1)
+
+    @fat_content.setter
+    def fat_content(self, value: float | None):
+        self.__set(1, value)
+
+    @property
+    def saturated_fat_content(self) -> float | None:
+        return self.__get(2)
+
+    @saturated_fat_content.setter
+    def saturated_fat_content(self, value: float | None):
+        self.__set(2, value)
+
+    @property
+    def cholesterol_content(self) -> float | None:
+        return self.__get(3)
+
+    @cholesterol_content.setter
+    def cholesterol_content(self, value: float | None):
+        self.__set(3, value)
+
+    @property
+    def sodium_content(self) -> float | None:
+        return self.__get(4)
+
+    @sodium_content.setter
+    def sodium_content(self, value: float | None):
+        self.__set(4, value)
+
+    @property
+    def carbohydrate_content(self) -> float | None:
+        return self.__get(5)
+
+    @carbohydrate_content.setter
+    def carbohydrate_content(self, value: float | None):
+        self.__set(5, value)
+
+    @property
+    def fiber_content(self) -> float | None:
+        return self.__get(6)
+
+    @fiber_content.setter
+    def fiber_content(self, value: float | None):
+        self.__set(6, value)
+
+    @property
+    def sugar_content(self) -> float | None:
+        return self.__get(7)
+
+    @sugar_content.setter
+    def sugar_content(self, value: float | None):
+        self.__set(7, value)
+
+    @property
+    def protein_content(self) -> float | None:
+        return self.__get(8)
+
+    @protein_content.setter
+    def protein_content(self, value: float | None):
+        self.__set(8, value)
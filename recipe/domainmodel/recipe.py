@@ -7,16 +7,24 @@ if TYPE_CHECKING:
 
 from datetime import datetime
 
+from recipe.domainmodel.compacturls import CompactUrls
+from recipe.domainmodel.indexedlist import IndexedList
 from recipe.domainmodel.nutrition import Nutrition
 from recipe.domainmodel.review import Review
 
 class Recipe:
+    # Slots instead of a per-instance __dict__: the catalogue holds one Recipe per CSV row.
+    __slots__ = ('__id', '__name', '__author', '__cook_time', '__preparation_time', '__total_time', '__date',
+                 '__description', '__images', '__category', '__ingredient_quantities', '__ingredients', '__rating',
+                 '__nutrition', '__servings', '__recipe_yield', '__instructions', '__reviews', '__review_ratings',
+                 '__rating_sum', '__rating_count', '__rating_histogram')
+
     def __init__(self, recipe_id: int, name: str, author: "Author",
                  cook_time: int = 0,
                  preparation_time: int = 0,
                  created_date: datetime = None,
                  description: str = "",
-                 images: list[str] = None,
+                 images: list[str] | CompactUrls = None,
                  category: "Category" = None,
                  ingredient_quantities: list[str] = None,
                  ingredients: list[str] = None,
@@ -24,7 +32,8 @@ class Recipe:
                  nutrition: "Nutrition" = None,
                  servings: str | None = None,
                  recipe_yield: str | None = None,
-                 instructions: list[str] = None):
+                 instructions: list[str] = None,
+                 total_time: int | None = None):
 
         if not isinstance(recipe_id, int) or recipe_id <= 0:
             raise ValueError("id must be a positive int.")
@@ -38,6 +47,7 @@ class Recipe:
         self.__author = author
         self.__cook_time = cook_time
         self.__preparation_time = preparation_time
+        self.__total_time = total_time
         self.__date = created_date if created_date else datetime.now()
         self.__description = description
         self.__images = images if images else []
@@ -49,7 +59,13 @@ class Recipe:
         self.__servings = servings if servings else "Not specified"
         self.__recipe_yield = recipe_yield if recipe_yield else "Not specified"
         self.__instructions = instructions if instructions else []
-        self.__reviews = []
+        # Reviews have no id of their own, so they are indexed by object identity, as User's are. The rating each
+        # listing contributed is kept by the same identity, so removing it undoes exactly that contribution.
+        self.__reviews = IndexedList(key=id)
+        self.__review_ratings: dict[int, list[float | None]] = {}
+        self.__rating_sum = 0.0
+        self.__rating_count = 0
+        self.__rating_histogram = None
 
     def __repr__(self) -> str:
         return (f"<Recipe {self.__name} with id: {self.id} was created by {self.__author.name} "
@@ -100,6 +116,19 @@ class Recipe:
             raise ValueError("Preparation time cannot be negative.")
         self.__preparation_time = value
 
+    @property
+    def total_time(self) -> int:
+        """ The published total time, which can differ from cook plus preparation time; that sum if none was given. """
+        if self.__total_time is None:
+            return self.__cook_time + self.__preparation_time
+        return self.__total_time
+
+    @total_time.setter
+    def total_time(self, value: int | None):
+        if value is not None and value < 0:
+            raise ValueError("Total time cannot be negative.")
+        self.__total_time = value
+
     @property
     def date(self) -> datetime:
         return self.__date
@@ -120,7 +149,9 @@ class Recipe:
 
     @property
     def images(self) -> list[str]:
-        return self.__images
+        images = self.__images
+        # Loaded recipes keep their URLs prefix-compressed and hand out a fresh list on each access.
+        return images.expand() if type(images) is CompactUrls else images
 
     @images.setter
     def images(self, value: list[str]):
@@ -152,7 +183,15 @@ class Recipe:
     def rating(self, value: float):
         if value is not None and (value < 0 or value > 5):
             raise ValueError("Rating must be between 0 and 5.")
-        self.__rating = value
+        self.__set_rating(value)
+
+    def __set_rating(self, value: float | None) -> None:
+        previous, self.__rating = self.__rating, value
+        if previous != value:
+            # Let the author's and category's aggregates follow the change.
+            for owner in (self.__author, self.__category):
+                if owner is not None:
+                    owner._recipe_rating_changed(self, previous, value)
 
     @property
     def nutrition(self) -> "Nutrition":
@@ -189,31 +228,50 @@ class Recipe:
         self.__instructions = steps
 
     @property
-    def reviews(self) -> list[Review]:
+    def reviews(self) -> IndexedList:
+        """ The reviews in the order they were added, as a read-only sequence. """
         return self.__reviews
 
+    @property
+    def rating_histogram(self) -> dict[int, int]:
+        """ Number of rated reviews per star, 1 to 5; ratings are rounded half up and 0 counts as 1 star. """
+        histogram = self.__rating_histogram
+        return {stars: histogram[stars - 1] if histogram else 0 for stars in range(1, 6)}
+
     def add_review(self, review: Review) -> None:
-        if isinstance(review, Review):
-            self.__reviews.append(review)
-            self.__update_rating()
-        else:
+        """ Adds a review and folds its current rating into the average. The rating is read once, here: setting
+        review.rating afterwards does not change the recipe's rating until the review is removed and added again. """
+        if not isinstance(review, Review):
             raise TypeError("Expected a Review instance")
+        rating = getattr(review, "rating", None)
+        self.__reviews._append(review)
+        self.__review_ratings.setdefault(id(review), []).append(rating)
+        self.__count_rating(rating, 1)
 
     def remove_review(self, review: Review) -> None:
-        if review in self.__reviews:
-            self.__reviews.remove(review)
-            self.__update_rating()
-        else:
+        if review not in self.__reviews:
             raise ValueError("Review not found in recipe's reviews")
+        self.__reviews._remove(review)
+        ratings = self.__review_ratings[id(review)]
+        rating = ratings.pop(0)
+        if not ratings:
+            del self.__review_ratings[id(review)]
+        self.__count_rating(rating, -1)
+
+    def __count_rating(self, rating: float | None, step: int) -> None:
+        """ Adds (step 1) or removes (step -1) one review's rating from the running totals. """
+        if rating is not None:
+            self.__rating_count += step
+            self.__rating_sum += step * rating
+            if self.__rating_histogram is None:
+                self.__rating_histogram = [0] * 5
+            self.__rating_histogram[min(max(int(rating + 0.5), 1), 5) - 1] += step
+        self.__update_rating()
 
     def __update_rating(self) -> None:
-        if self.__reviews:
-            ratings = [r.rating for r in self.__reviews if
-                       hasattr(r, "rating") and r.rating is not None]
-            if ratings:
-                average_rating = sum(ratings) / len(ratings)
-                self.__rating = round(average_rating, 1)
-            else:
-                self.__rating = None
+        if self.__rating_count:
+            self.__set_rating(round(self.__rating_sum / self.__rating_count, 1))
         else:
-            self.__rating = None
\ No newline at end of file
+            # Start the next sum from exactly zero rather than from accumulated rounding error.
+            self.__rating_sum = 0.0
+            self.__set_rating(None)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from recipe.domainmodel.nutrition import NUTRITION_FIELDS
+
+if TYPE_CHECKING:
+    from recipe.domainmodel.recipe import Recipe
+
+TIME_FIELDS = ('cook_time', 'preparation_time', 'total_time')
+
+
+class RecipeStats:
+    """ Running aggregates over a group of recipes, such as an author's or a category's.
+
+    Counts, the rating sum and the time ranges are updated as each recipe is added, and the rating sum again whenever
+    a recipe's rating changes, so every statistic reads in O(1). Nutrition values are folded in on the first read
+    after an addition rather than in add(): reading a recipe's nutrition would force lazily loaded recipes to decode
+    their whole row.
+    """
+    __slots__ = ('__count', '__rated_count', '__rating_sum', '__time_ranges', '__fastest_recipe', '__nutrition_sums',
+                 '__nutrition_counts', '__pending')
+
+    def __init__(self):
+        self.__count = 0
+        self.__rated_count = 0
+        self.__rating_sum = 0.0
+        self.__time_ranges: dict[str, tuple[int, int]] = {}
+        self.__fastest_recipe: Recipe | None = None
+        self.__nutrition_sums = dict.fromkeys(NUTRITION_FIELDS, 0.0)
+        self.__nutrition_counts = dict.fromkeys(NUTRITION_FIELDS, 0)
+        self.__pending: list[Recipe] = []
+
+    def add(self, recipe: Recipe) -> None:
+        self.__count += 1
+        self.rating_changed(None, recipe.rating)
+        times = {
+            'cook_time': recipe.cook_time,
+            'preparation_time': recipe.preparation_time,
+            'total_time': recipe.total_time,
+        }
+        for field, value in times.items():
+            low, high = self.__time_ranges.get(field, (value, value))
+            self.__time_ranges[field] = (min(low, value), max(high, value))
+        fastest = self.__fastest_recipe
+        if fastest is None or times['total_time'] < fastest.total_time:
+            self.__fastest_recipe = recipe
+        self.__pending.append(recipe)
+
+    def rating_changed(self, previous: float | None, rating: float | None) -> None:
+        """ Replaces one recipe's previous rating with its new one; None means unrated. """
+        if previous is not None:
+            self.__rated_count -= 1
+            self.__rating_sum -= previous
+        if rating is not None:
+            self.__rated_count += 1
+            self.__rating_sum += rating
+        if not self.__rated_count:
+            # Reset, so floating point drift cannot leave a residue behind.
+            self.__rating_sum = 0.0
+
+    def __fold_nutrition(self) -> None:
+        for recipe in self.__pending:
+            nutrition = recipe.nutrition
+            for field in NUTRITION_FIELDS:
+                value = getattr(nutrition, field, None)
+                if value is not None:
+                    self.__nutrition_sums[field] += value
+                    self.__nutrition_counts[field] += 1
+        self.__pending.clear()
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+    @property
+    def rated_count(self) -> int:
+        return self.__rated_count
+
+    @property
+    def average_rating(self) -> float | None:
+        return round(self.__rating_sum / self.__rated_count, 1) if self.__rated_count else None
+
+    @property
+    def average_nutrition(self) -> dict[str, float | None]:
+        """ Mean of each nutrition value over the recipes that have one. """
+        self.__fold_nutrition()
+        return {field: self.__nutrition_sums[field] / self.__nutrition_counts[field]
+                if self.__nutrition_counts[field] else None for field in NUTRITION_FIELDS}
+
+    @property
+    def average_calories(self) -> float | None:
+        return self.average_nutrition['calories']
+
+    def time_range(self, field: str) -> tuple[int, int] | None:
+        """ Returns (shortest, longest) of 'cook_time', 'preparation_time' or 'total_time', or None if empty. """
+        if field not in TIME_FIELDS:
+            raise ValueError(f"Unknown time field: {field}")
+        return self.__time_ranges.get(field)
+
+    @property
+    def fastest_recipe(self) -> Recipe | None:
+        """ The recipe with the shortest total time; the first added wins ties. """
+        return self.__fastest_recipe
@@ -1,13 +1,18 @@
 from recipe.domainmodel.favourite import Favourite
+from recipe.domainmodel.indexedlist import IndexedList
 from recipe.domainmodel.review import Review
 
 class User:
+    __slots__ = ('__id', '__username', '__password', '__favourite_recipes', '__reviews')
+
     def __init__(self, username: str, password: str, user_id: int = None):
         self.__id = user_id
         self.__username = username
         self.__password = password
-        self.__favourite_recipes = []
-        self.__reviews = []
+        # Insertion-ordered and indexed, so membership checks and removals do not scan a list. A review may be
+        # added more than once. Reviews have no id of their own, so they are indexed by object identity.
+        self.__favourite_recipes = IndexedList()
+        self.__reviews = IndexedList(key=id)
 
     def __repr__(self) -> str:
         return f"<User {self.id}: {self.username}>"
@@ -38,35 +43,37 @@ class User:
         return self.__password
 
     @property
-    def favourite_recipes(self) -> list["Favourite"]:
+    def favourite_recipes(self) -> IndexedList:
+        """ The favourites in the order they were added, as a read-only sequence. """
         return self.__favourite_recipes
 
     @property
-    def reviews(self) -> list["Review"]:
+    def reviews(self) -> IndexedList:
+        """ The reviews in the order they were added, as a read-only sequence. """
         return self.__reviews
 
     def add_favourite_recipe(self, recipe: "Favourite") -> None:
         if not isinstance(recipe, Favourite):
             raise TypeError("Expected a Favourite instance")
         if recipe not in self.__favourite_recipes:
-            self.__favourite_recipes.append(recipe)
+            self.__favourite_recipes._append(recipe)
         else:
             raise ValueError("Recipe already in user's favourites")
 
     def remove_favourite_recipe(self, recipe: "Favourite") -> None:
         if recipe in self.__favourite_recipes:
-            self.__favourite_recipes.remove(recipe)
+            self.__favourite_recipes._remove(recipe)
         else:
             raise ValueError("Recipe not found in user's favourites")
 
     def add_review(self, review: "Review") -> None:
         if not isinstance(review, Review):
             raise TypeError("Expected a Review instance")
-        self.__reviews.append(review)
+        self.__reviews._append(review)
 
     def remove_review(self, review: "Review") -> None:
         if review in self.__reviews:
-            self.__reviews.remove(review)
+            self.__reviews._remove(review)
         else:
             raise ValueError("Review not found in user's reviews")
 
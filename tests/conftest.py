@@ -0,0 +1,31 @@
+import os
+import shutil
+from datetime import datetime
+
+import pytest
+
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.recipe import Recipe
+
+# The recipes.csv bundled with the app. Tests import it with `from conftest import SOURCE_CSV`.
+SOURCE_CSV = os.path.join(os.path.dirname(__file__), '..', 'recipe', 'adapters', 'data', 'recipes.csv')
+
+
+@pytest.fixture
+def csv_copy(tmp_path):
+    """ A copy of recipes.csv in tmp_path, for tests that change it or have files written next to it. """
+    csv_file = tmp_path / 'recipes.csv'
+    shutil.copyfile(SOURCE_CSV, csv_file)
+    return str(csv_file)
+
+
+@pytest.fixture
+def make_recipe():
+    """ A factory for small hand-made recipes, all by one author and published on 1 January 2024. """
+    author = Author(1, "Gordon Ramsay")
+
+    def make(recipe_id, category, ingredients, name=None, description=""):
+        return Recipe(recipe_id, name if name else f"Recipe {recipe_id}", author, created_date=datetime(2024, 1, 1),
+                      category=category, ingredients=ingredients, description=description)
+
+    return make
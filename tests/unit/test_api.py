@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+import recipe.adapters.repository as repo
+from recipe import create_app
+from recipe.adapters.recommendations import SimilarRecipes
+
+
+@pytest.fixture(scope='module')
+def client():
+    return create_app({'TESTING': True, 'USE_SNAPSHOT': False, 'SIMILAR_RECIPES_FILE': None}).test_client()
+
+
+def test_pages_follow_the_cursor(client):
+    first = client.get('/api/recipes?limit=5&fields=id,name').get_json()
+    ids = [recipe['id'] for recipe in first['recipes']]
+    assert ids == sorted(ids) and len(ids) == 5
+    assert set(first['recipes'][0]) == {'id', 'name'}
+    assert first['next_cursor'] == str(ids[-1])
+    second = client.get(f"/api/recipes?limit=5&fields=id&cursor={first['next_cursor']}").get_json()
+    assert second['recipes'][0]['id'] > ids[-1]
+
+
+def test_filters(client):
+    recipes = client.get('/api/recipes?limit=100&category=frozen desserts&max_total_time=60'
+                         '&min_calories=100&max_calories=400&fields=category,total_time,nutrition').get_json()
+    assert recipes['recipes']
+    for recipe in recipes['recipes']:
+        assert recipe['category']['name'].lower() == 'frozen desserts'
+        assert recipe['total_time'] <= 60
+        assert 100 <= recipe['nutrition']['calories'] <= 400
+    author = client.get('/api/recipes/221?fields=author').get_json()['author']['id']
+    by_author = client.get(f'/api/recipes?author={author}&fields=author').get_json()['recipes']
+    assert by_author and all(recipe['author']['id'] == author for recipe in by_author)
+
+
+def test_total_time_is_the_published_one(client):
+    # Recipe 3059 lists no cook or preparation time but a TotalTime of 100 minutes.
+    assert client.get('/api/recipes/3059?fields=total_time').get_json() == {'total_time': 100}
+    quick = client.get('/api/recipes?format=ndjson&max_total_time=60&fields=id').get_data(as_text=True)
+    assert 3059 not in [json.loads(line)['id'] for line in quick.splitlines()]
+
+
+def test_ndjson_streams_every_match(client):
+    response = client.get('/api/recipes?format=ndjson&fields=id')
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert len(lines) == 2455
+    ids = [json.loads(line)['id'] for line in lines]
+    assert ids == sorted(ids)
+    accepted = client.get('/api/recipes?limit=3&fields=id', headers={'Accept': 'application/x-ndjson'})
+    assert len(accepted.get_data(as_text=True).splitlines()) == 3
+
+
+def test_invalid_arguments(client):
+    assert client.get('/api/recipes?limit=0').status_code == 400
+    assert client.get('/api/recipes?fields=id,secret').status_code == 400
+    assert client.get('/api/recipes?format=ndjson&min_calories=lots').status_code == 400
+    assert client.get('/api/recipes?max_calories=nan').status_code == 400
+    assert client.get('/api/recipes/999999').status_code == 404
+
+
+def test_similar_recipes(client):
+    similar = client.get('/api/recipes/38/similar?limit=5&fields=id,name').get_json()
+    assert similar['recipe_id'] == 38
+    assert len(similar['similar']) == 5
+    assert set(similar['similar'][0]) == {'id', 'name', 'score'}
+    assert 38 not in [recipe['id'] for recipe in similar['similar']]
+    scores = [recipe['score'] for recipe in similar['similar']]
+    assert scores == sorted(scores, reverse=True)
+    assert client.get('/api/recipes/38/similar?limit=50').status_code == 400
+    assert client.get('/api/recipes/999999/similar').status_code == 404
+
+
+def test_similar_recipes_follow_the_published_version(client, tmp_path):
+    app, previous = client.application, repo.published
+    app.config['SIMILAR_RECIPES_FILE'] = path = str(tmp_path / 'similar.npz')
+    try:
+        repo.publish(previous.repository, 'next version')
+        assert client.get('/api/recipes/38/similar?limit=1').status_code == 200
+        assert app.extensions['similar_recipes'].fingerprint == 'next version'
+        assert SimilarRecipes.load(path).fingerprint == 'next version'
+    finally:
+        repo.publish(*previous)
+        app.config['SIMILAR_RECIPES_FILE'] = None
+
+
+def test_nearest_nutrition(client):
+    nearest = client.get('/api/recipes/nearest-nutrition?calories=500&protein_content=30&fat_content=15'
+                         '&limit=5&fields=id,nutrition').get_json()
+    assert nearest['targets'] == {'calories': 500, 'fat_content': 15, 'protein_content': 30}
+    assert len(nearest['recipes']) == 5
+    assert set(nearest['recipes'][0]) == {'id', 'nutrition', 'distance'}
+    distances = [recipe['distance'] for recipe in nearest['recipes']]
+    assert distances == sorted(distances)
+    assert client.get('/api/recipes/nearest-nutrition?limit=5').status_code == 400
+    assert client.get('/api/recipes/nearest-nutrition?calories=lots').status_code == 400
+    for target in ('nan', 'inf', '-inf'):
+        assert client.get(f'/api/recipes/nearest-nutrition?calories={target}').status_code == 400
+    assert client.get('/api/recipes/nearest-nutrition?calories=500&limit=1000').status_code == 400
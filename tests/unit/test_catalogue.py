@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import pytest
+
+import recipe.adapters.repository as repo
+from recipe import create_app
+from recipe.adapters.catalogue_repository import CatalogueRepository
+from recipe.adapters.datareader.catalogue import RecipeCatalogue, compile_catalogue
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.repository import RepositoryException
+from recipe.adapters.repository_populate import populate
+
+
+def summarise(recipes):
+    return [(r.id, r.name, r.author.id, r.author.name, r.category.id, r.category.name, r.cook_time,
+             r.preparation_time, r.total_time, r.date, r.description, r.images, r.ingredient_quantities, r.ingredients,
+             r.instructions, r.servings, r.recipe_yield, r.nutrition.calories, r.nutrition.protein_content)
+            for r in recipes]
+
+
+def test_catalogue_matches_reader(csv_copy):
+    reader = CSVDataReader(csv_copy, use_snapshot=False)
+    with RecipeCatalogue.open(csv_file=csv_copy) as catalogue:
+        assert len(catalogue) == len(reader.recipes)
+        assert summarise(catalogue) == summarise(reader.recipes)
+        assert [(c.id, c.name) for c in catalogue.categories] == [(c.id, c.name) for c in reader.categories]
+        assert catalogue.fingerprint == reader.fingerprint
+
+
+def test_get_recipe(csv_copy):
+    with RecipeCatalogue.open(csv_file=csv_copy) as catalogue:
+        recipe = catalogue.get_recipe(221)
+        assert recipe.id == 221
+        assert not recipe.is_materialised
+        assert recipe.ingredients
+        assert recipe.is_materialised
+        assert recipe.author is catalogue.get_recipe(221).author
+        assert catalogue.get_recipe(-1) is None
+        with pytest.raises(IndexError):
+            catalogue.recipe_at(len(catalogue))
+
+
+def test_open_recompiles_when_csv_changes(csv_copy):
+    RecipeCatalogue.open(csv_file=csv_copy).close()
+    with open(csv_copy, 'r', encoding='utf-8') as file:
+        header, first, *_ = file.read().splitlines(keepends=True)
+    with open(csv_copy, 'w', encoding='utf-8') as file:
+        file.write(header + first)
+    with RecipeCatalogue.open(csv_file=csv_copy) as catalogue:
+        assert len(catalogue) == 1
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'bogus.catalogue'
+    path.write_bytes(b'not a catalogue')
+    with pytest.raises(ValueError):
+        RecipeCatalogue(str(path))
+
+
+def test_compile_returns_count(csv_copy, tmp_path):
+    assert compile_catalogue(str(tmp_path / 'out.catalogue'), csv_copy) == 2455
+
+
+def test_repository_matches_memory_repository(csv_copy, tmp_path):
+    memory = MemoryRepository()
+    populate(memory, CSVDataReader(csv_copy, use_snapshot=False))
+    catalogue = CatalogueRepository.open(str(tmp_path / 'recipes.catalogue'), csv_copy)
+    assert catalogue.get_number_of_recipes() == memory.get_number_of_recipes()
+    assert [r.id for r in catalogue.get_recipes(3, 50)] == [r.id for r in memory.get_recipes(3, 50)]
+    assert [r.id for r in catalogue.iter_recipes(after_id=500)] == [r.id for r in memory.iter_recipes(after_id=500)]
+    author_id = memory.get_recipe(221).author.id
+    assert [r.id for r in catalogue.get_recipes_by_author(author_id)] == \
+           [r.id for r in memory.get_recipes_by_author(author_id)]
+    for category in memory.get_categories():
+        assert catalogue.get_category_by_name(category.name.upper()).id == category.id
+        assert [r.id for r in catalogue.get_recipes_by_category(category.id)] == \
+               [r.id for r in memory.get_recipes_by_category(category.id)]
+    start, end = datetime(2012, 1, 1), datetime(2012, 6, 30)
+    dated = [r.id for r in catalogue.get_recipes_by_date_range(start, end)]
+    assert dated and dated == [r.id for r in memory.get_recipes_by_date_range(start, end)]
+    assert catalogue.get_author(author_id).name == memory.get_author(author_id).name
+    assert [a.id for a in catalogue.get_authors()] == [a.id for a in memory.get_authors()]
+    assert catalogue.get_author(-1) is None and catalogue.get_category(0) is None and catalogue.get_recipe(-1) is None
+    assert catalogue.get_recipes_by_author(-1) == [] and catalogue.get_recipes_by_category(10_000) == []
+    with pytest.raises(RepositoryException):
+        catalogue.add_recipe(memory.get_recipe(221))
+
+
+def test_app_serves_from_the_catalogue(tmp_path):
+    previous = repo.published
+    try:
+        client = create_app({'TESTING': True, 'REPOSITORY': 'catalogue', 'SIMILAR_RECIPES_FILE': None,
+                             'CATALOGUE_FILE': str(tmp_path / 'recipes.catalogue')}).test_client()
+        assert isinstance(repo.published.repository, CatalogueRepository)
+        assert client.get('/').status_code == 200
+        recipe = client.get('/api/recipes/221').get_json()
+        assert recipe['id'] == 221 and recipe['ingredients']
+        assert client.get('/api/recipes?limit=3&category=beverages&fields=id').get_json()['recipes']
+    finally:
+        repo.published = previous
+        repo.repo_instance = previous.repository if previous is not None else None
@@ -0,0 +1,56 @@
+import math
+
+import numpy as np
+import pytest
+
+from recipe.adapters.datareader.columnstore import RecipeColumnStore
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+
+
+@pytest.fixture(scope='module')
+def reader():
+    return CSVDataReader(use_snapshot=False)
+
+
+@pytest.fixture(scope='module')
+def store():
+    return RecipeColumnStore.from_csv()
+
+
+def test_store_mirrors_reader(reader, store):
+    assert len(store) == len(reader.recipes)
+    assert store.column('recipe_id').tolist() == [r.id for r in reader.recipes]
+    assert store.column('author_id').tolist() == [r.author.id for r in reader.recipes]
+    assert store.column('category_id').tolist() == [r.category.id for r in reader.recipes]
+    assert store.column('cook_time').tolist() == [r.cook_time for r in reader.recipes]
+    assert np.isnan(store.column('rating')).all()
+
+
+def test_filter_matches_python_scan(reader, store):
+    ids = store.filter(cook_time=(None, 30), calories=(100, 400), protein_content=(10, None))
+    expected = [r.id for r in reader.recipes
+                if r.cook_time <= 30 and r.nutrition.calories is not None
+                and 100 <= r.nutrition.calories <= 400 and r.nutrition.protein_content >= 10]
+    assert ids.tolist() == expected
+
+
+def test_sort_and_top_k(store):
+    calories = dict(zip(store.column('recipe_id').tolist(), store.column('calories').tolist()))
+    known = sorted((value, recipe_id) for recipe_id, value in calories.items() if not math.isnan(value))
+
+    ascending = store.sort('calories')
+    assert [calories[i] for i in ascending[:len(known)]] == [value for value, _ in known]
+    assert [calories[i] for i in store.top_k('calories', 5, descending=False)] == [v for v, _ in known[:5]]
+    assert [calories[i] for i in store.top_k('calories', 5)] == [v for v, _ in known[::-1][:5]]
+
+
+def test_ratings_can_be_updated(store):
+    recipe_id = int(store.column('recipe_id')[0])
+    store.set_rating(recipe_id, 4.5)
+    assert store.top_k('rating', 3).tolist() == [recipe_id]
+    store.set_rating(recipe_id, None)
+    assert len(store.top_k('rating', 3)) == 0
+    with pytest.raises(KeyError):
+        store.set_rating(-1, 3.0)
+    with pytest.raises(ValueError):
+        store.column('calories')[0] = 1.0
@@ -0,0 +1,46 @@
+from conftest import SOURCE_CSV
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.compacturls import CompactUrls, UrlPrefixes, split_url
+from recipe.domainmodel.recipe import Recipe
+
+
+URLS = ['https://img.example.com/v1/img/recipes/38/first.jpg',
+        'https://img.example.com/v1/img/recipes/38/second.jpg',
+        'https://img.example.com/v1/img/feed/40/third.jpg',
+        'no-slashes.jpg']
+
+
+def test_split_url():
+    assert split_url(URLS[0]) == ('https://img.example.com/v1/img/recipes/', '38/first.jpg')
+    assert split_url('no-slashes.jpg') == ('', 'no-slashes.jpg')
+
+
+def test_compact_urls_round_trip():
+    prefixes = UrlPrefixes()
+    urls = CompactUrls(URLS, prefixes)
+    assert len(urls) == 4
+    assert list(urls) == URLS and urls.expand() == URLS
+    assert urls == URLS and urls == CompactUrls(URLS, UrlPrefixes())
+    assert len(prefixes) == 3
+    assert prefixes[prefixes.id_of('https://img.example.com/v1/img/feed/')] == 'https://img.example.com/v1/img/feed/'
+
+
+def test_recipe_expands_images_on_access():
+    recipe = Recipe(1, "Muffins", Author(1, "Bob"), images=CompactUrls(URLS, UrlPrefixes()))
+    images = recipe.images
+    assert images == URLS and type(images) is list
+    images.append('changed.jpg')
+    assert recipe.images == URLS
+    assert Recipe(2, "Muffins", Author(1, "Bob"), images=CompactUrls([], UrlPrefixes())).images == []
+
+
+def test_loaded_strings_are_shared():
+    reader = CSVDataReader(SOURCE_CSV, use_snapshot=False)
+    by_text = {}
+    for recipe in reader.recipes:
+        for text in recipe.ingredients + recipe.ingredient_quantities:
+            assert by_text.setdefault(text, text) is text
+    assert reader.recipes[0].images[0] == ('https://img.sndimg.com/food/image/upload/w_555,h_416,c_fit,'
+                                           'fl_progressive,q_95/v1/img/recipes/38/YUeirxMLQaeE1h3v3qnM_229%20berry'
+                                           '%20blue%20frzn%20dess.jpg')
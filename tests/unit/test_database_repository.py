@@ -0,0 +1,95 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.database_repository import INDEXES, SqliteRepository
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.repository import RepositoryException
+from recipe.adapters.repository_populate import populate
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+
+
+@pytest.fixture(scope='module')
+def loaded_repo(tmp_path_factory):
+    repo = SqliteRepository(str(tmp_path_factory.mktemp('db') / 'recipes.db'))
+    repo.load_csv()
+    return repo
+
+
+@pytest.fixture
+def repo(tmp_path):
+    author_a, author_b = Author(1, "Chef A"), Author(2, "Chef B")
+    breakfast, dinner = Category("Breakfast", [], 1), Category("Dinner", [], 2)
+    repo = SqliteRepository(str(tmp_path / 'recipes.db'))
+    for recipe_id, author, category, day in ((30, author_a, breakfast, 3), (10, author_b, dinner, 1),
+                                             (20, author_a, dinner, 2), (40, author_b, breakfast, 2)):
+        repo.add_recipe(Recipe(recipe_id, f"Recipe {recipe_id}", author, category=category,
+                               created_date=datetime(2024, 1, day), ingredients=["egg", "flour"]))
+    return repo
+
+
+def test_get_recipe(repo):
+    recipe = repo.get_recipe(20)
+    assert recipe.name == "Recipe 20"
+    assert recipe.ingredients == ["egg", "flour"]
+    assert recipe.date == datetime(2024, 1, 2)
+    assert recipe.author is repo.get_author(1)
+    assert repo.get_recipe(99) is None
+    assert repo.get_number_of_recipes() == 4
+
+
+def test_add_duplicate_recipe(repo):
+    with pytest.raises(RepositoryException):
+        repo.add_recipe(Recipe(10, "Again", Author(1, "Chef A")))
+
+
+def test_queries(repo):
+    assert [r.id for r in repo.get_recipes_by_author(1)] == [30, 20]
+    assert [r.id for r in repo.get_recipes_by_category(1)] == [30, 40]
+    assert [r.id for r in repo.get_recipes(page=2, per_page=3)] == [40]
+    assert [r.id for r in repo.get_recipes_by_date_range(datetime(2024, 1, 2), datetime(2024, 1, 3))] == [20, 40, 30]
+    assert repo.get_category_by_name("dinner").id == 2
+    assert [a.id for a in repo.get_authors()] == [1, 2]
+    assert [c.name for c in repo.get_categories()] == ["Breakfast", "Dinner"]
+    with pytest.raises(ValueError):
+        repo.get_recipes(page=0)
+
+
+def test_load_csv_matches_memory_repository(loaded_repo):
+    memory = MemoryRepository()
+    populate(memory, CSVDataReader(use_snapshot=False))
+    assert loaded_repo.get_number_of_recipes() == memory.get_number_of_recipes()
+    expected, actual = memory.get_recipe(221), loaded_repo.get_recipe(221)
+    for attribute in ('name', 'cook_time', 'preparation_time', 'total_time', 'date', 'description', 'images',
+                      'ingredients', 'ingredient_quantities', 'instructions', 'servings', 'recipe_yield'):
+        assert getattr(actual, attribute) == getattr(expected, attribute)
+    assert actual.nutrition.calories == expected.nutrition.calories
+    assert (actual.author.id, actual.author.name) == (expected.author.id, expected.author.name)
+    assert (actual.category.id, actual.category.name) == (expected.category.id, expected.category.name)
+    assert [r.id for r in loaded_repo.get_recipes_by_author(expected.author.id)] == \
+           [r.id for r in memory.get_recipes_by_author(expected.author.id)]
+
+
+def test_load_csv_twice_raises(loaded_repo):
+    with pytest.raises(RepositoryException):
+        loaded_repo.load_csv()
+    assert loaded_repo.get_recipe(221) is not None
+
+
+def test_failed_load_keeps_indexes(repo, tmp_path):
+    repo.add_recipe(Recipe(221, "Clashes with the CSV", Author(1, "Chef A")))
+    with pytest.raises(RepositoryException):
+        repo.load_csv()
+    assert repo.get_number_of_recipes() == 5
+    connection = sqlite3.connect(str(tmp_path / 'recipes.db'))
+    indexes = connection.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'recipes_%'")
+    assert {name for name, in indexes} == {name for name, _ in INDEXES}
+
+
+def test_iter_recipes_after_cursor(repo):
+    assert [r.id for r in repo.iter_recipes()] == [10, 20, 30, 40]
+    assert [r.id for r in repo.iter_recipes(after_id=15)] == [20, 30, 40]
@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader, iter_recipes
+
+
+def summarise(reader):
+    return [(r.id, r.name, r.author.id, r.category.id, r.total_time, r.date, r.images, r.ingredients, r.instructions,
+             r.nutrition.calories) for r in reader.recipes]
+
+
+def test_reader_loads_recipes(csv_copy):
+    reader = CSVDataReader(csv_copy, use_snapshot=False)
+    assert len(reader.recipes) == 2455
+    assert reader.recipes[0].id == 38
+    assert reader.recipes[0].ingredients == ['blueberries', 'granulated sugar', 'vanilla yogurt', 'lemon juice']
+    assert [c.id for c in reader.categories] == list(range(1, len(reader.categories) + 1))
+    assert sum(len(a.recipes) for a in reader.authors) == len(reader.recipes)
+
+
+def test_snapshot_matches_parse(csv_copy):
+    parsed = CSVDataReader(csv_copy, use_snapshot=False)
+    CSVDataReader(csv_copy)
+    assert os.path.exists(csv_copy + '.snapshot')
+    assert summarise(CSVDataReader(csv_copy)) == summarise(parsed)
+
+
+def test_snapshot_rebuilt_when_csv_changes(csv_copy):
+    CSVDataReader(csv_copy)
+    with open(csv_copy, 'r', encoding='utf-8') as file:
+        lines = file.readlines()
+    with open(csv_copy, 'w', encoding='utf-8') as file:
+        file.writelines(lines[:1] + [lines[1].replace('Low-Fat Berry Blue Frozen Dessert', 'Berry Sorbet')] + lines[2:])
+    assert CSVDataReader(csv_copy).recipes[0].name == 'Berry Sorbet'
+
+
+def test_snapshot_survives_touch(csv_copy):
+    CSVDataReader(csv_copy)
+    os.utime(csv_copy, ns=(0, 0))
+    assert summarise(CSVDataReader(csv_copy)) == summarise(CSVDataReader(csv_copy, use_snapshot=False))
+
+
+def test_chunk_boundaries_skip_newlines_inside_quotes():
+    data = b'a,b\n1,"x\ny"\n2,z\n3,"\n\n"\n'
+    boundaries = CSVDataReader._chunk_boundaries(data, 4, 8)
+    assert boundaries[0] == 4 and boundaries[-1] == len(data)
+    for boundary in boundaries[1:-1]:
+        assert data[boundary - 1:boundary] == b'\n'
+        assert data.count(b'"', 4, boundary) % 2 == 0
+
+
+def test_parallel_parse_matches_serial(csv_copy):
+    serial = CSVDataReader(csv_copy, use_snapshot=False)
+    parallel = CSVDataReader(csv_copy, use_snapshot=False, parallel=True, workers=3)
+    assert summarise(parallel) == summarise(serial)
+    assert [(a.id, len(a.recipes)) for a in parallel.authors] == [(a.id, len(a.recipes)) for a in serial.authors]
+    assert [(c.id, c.name) for c in parallel.categories] == [(c.id, c.name) for c in serial.categories]
+    # Strings interned in the workers are shared again once the chunks are merged.
+    ingredients = [item for recipe in parallel.recipes for item in recipe.ingredients]
+    assert len({id(item) for item in ingredients}) == len(set(ingredients))
+
+
+def test_lazy_reader_defers_heavy_columns(csv_copy):
+    eager = CSVDataReader(csv_copy, use_snapshot=False)
+    lazy = CSVDataReader(csv_copy, lazy=True)
+    assert not os.path.exists(csv_copy + '.snapshot')
+    assert [(r.id, r.name, r.author.id, r.category.id, r.date) for r in lazy.recipes] == \
+           [(r.id, r.name, r.author.id, r.category.id, r.date) for r in eager.recipes]
+    assert not any(r.is_materialised for r in lazy.recipes)
+
+    recipe = lazy.recipes[1]
+    assert recipe.ingredients == ['sugar', 'lemons, rind of', 'lemon, zest of', 'fresh water', 'fresh lemon juice']
+    assert recipe.is_materialised
+    assert not lazy.recipes[0].is_materialised
+
+
+def test_lazy_recipes_match_eager_recipes(csv_copy):
+    eager = CSVDataReader(csv_copy, use_snapshot=False)
+    lazy = CSVDataReader(csv_copy, lazy=True)
+    assert summarise(lazy) == summarise(eager)
+    assert [r.description for r in lazy.recipes] == [r.description for r in eager.recipes]
+
+
+def test_iter_recipes_yields_recipes_in_file_order(csv_copy):
+    eager = CSVDataReader(csv_copy, use_snapshot=False)
+    streamed = list(CSVDataReader(csv_copy, lazy=True).iter_recipes())
+    assert [(r.id, r.author.id, r.category.id, r.ingredients) for r in streamed] == \
+           [(r.id, r.author.id, r.category.id, r.ingredients) for r in eager.recipes]
+    assert all(r.author.recipes == [] for r in streamed)
+
+
+def test_iter_recipes_projection_and_predicates(csv_copy):
+    records = list(iter_recipes(csv_copy, fields=('id', 'name'),
+                                where={'category_name': lambda name: name == 'Beverages',
+                                       'cook_time': lambda minutes: minutes <= 5}))
+    expected = [(r.id, r.name) for r in CSVDataReader(csv_copy, use_snapshot=False).recipes
+                if r.category.name == 'Beverages' and r.cook_time <= 5]
+    assert records and [(record['id'], record['name']) for record in records] == expected
+    assert set(records[0]) == {'id', 'name'}
+
+
+def test_iter_recipes_rejects_unknown_fields(csv_copy):
+    with pytest.raises(ValueError):
+        next(iter_recipes(csv_copy, fields=('flavour',)))
@@ -0,0 +1,69 @@
+import csv
+import warnings
+from datetime import datetime
+
+import pytest
+
+from conftest import SOURCE_CSV
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.datareader.dateparser import DateParser, describe_unparseable, parse_date_uncached
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('9th Aug 2009', datetime(2009, 8, 9)),
+    ('21st Dec 2001', datetime(2001, 12, 21)),
+    ('2nd jan 2010', datetime(2010, 1, 2)),
+    ('23rd September 2005', datetime(2005, 9, 23)),
+    (' 9 Aug 2009 ', datetime(2009, 8, 9)),
+    ('2009-08-09', datetime(2009, 8, 9)),
+    ('2009-8-9', datetime(2009, 8, 9)),
+    ('31st Feb 2009', None),
+    ('9xx Aug 2009', None),
+    ('9th Sept 2009', None),
+    ('09-08-2009', None),
+    ('2009-08', None),
+    ('yesterday', None),
+])
+def test_parse_date_uncached(text, expected):
+    assert parse_date_uncached(text) == expected
+
+
+def test_parser_caches_and_counts_unparseable():
+    parser = DateParser(max_cache_size=2)
+    assert parser.parse('9th Aug 2009') is parser.parse('9th Aug 2009')
+    assert parser.parse('') is None
+    assert parser.parse('soon') is None and parser.parse('soon') is None
+    assert parser.parse('2009-08-09') == datetime(2009, 8, 9)
+    assert parser.cache_size() == 2
+    assert parser.unparseable == {'soon': 2}
+    assert describe_unparseable(parser.unparseable, 'x.csv') == "2 rows of x.csv have unparseable dates: 'soon' (2)"
+
+
+def test_reader_reports_unparseable_dates_once(tmp_path):
+    csv_file = tmp_path / 'recipes.csv'
+    with open(SOURCE_CSV, encoding='utf-8', newline='') as source, \
+            open(csv_file, 'w', encoding='utf-8', newline='') as target:
+        reader = csv.reader(source)
+        writer = csv.writer(target)
+        writer.writerow(next(reader))
+        for index, values in enumerate(reader):
+            if index in (0, 5, 9):
+                values[7] = 'sometime in 2009'
+            writer.writerow(values)
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        loaded = CSVDataReader(str(csv_file))
+    assert len(caught) == 1 and "3 rows of recipes.csv" in str(caught[0].message)
+    assert loaded.unparseable_dates == {'sometime in 2009': 3}
+    # The report survives the snapshot, and lazy loading reports too.
+    with pytest.warns(UserWarning):
+        assert CSVDataReader(str(csv_file)).unparseable_dates == {'sometime in 2009': 3}
+    with pytest.warns(UserWarning):
+        assert CSVDataReader(str(csv_file), lazy=True).unparseable_dates == {'sometime in 2009': 3}
+
+
+def test_clean_file_has_no_unparseable_dates(csv_copy):
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert CSVDataReader(csv_copy, use_snapshot=False).unparseable_dates == {}
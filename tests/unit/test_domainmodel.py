@@ -266,6 +266,12 @@ def test_recipe_hash(my_author):
     recipe_set = {recipe1, recipe2}
     assert len(recipe_set) == 1
 
+def test_domain_objects_are_slotted(my_user, my_author, my_category, my_recipe):
+    for obj in (my_user, my_author, my_category, my_recipe):
+        assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        my_recipe.colour = "red"
+
 # Nutrition tests
 def test_nutrition_construction(my_nutrition):
     assert my_nutrition.calories == 500.0
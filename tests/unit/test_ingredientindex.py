@@ -0,0 +1,54 @@
+import pytest
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.ingredientindex import IngredientIndex, normalise_ingredient
+
+PANTRY = ['eggs', 'Butter', 'sugar', 'flour', 'milk', 'salt', 'vanilla', 'baking powder']
+
+
+@pytest.fixture(scope='module')
+def reader():
+    return CSVDataReader(use_snapshot=False)
+
+
+@pytest.fixture(scope='module')
+def index(reader):
+    return IngredientIndex(reader.recipes)
+
+
+def ingredient_keys(recipe):
+    return {key for key in map(normalise_ingredient, recipe.ingredients) if key}
+
+
+def test_normalise_ingredient():
+    assert normalise_ingredient('  Lemons, rind of ') == 'lemon rind'
+    assert normalise_ingredient('EGGS') == normalise_ingredient('egg')
+
+
+def test_containing_all_matches_scan(reader, index):
+    expected = [r.id for r in reader.recipes if {'egg', 'sugar', 'butter'} <= ingredient_keys(r)]
+    assert expected
+    assert index.containing_all(['eggs', 'sugar', 'butter']) == expected
+    assert index.containing_all(['eggs', 'unobtainium']) == []
+
+
+@pytest.mark.parametrize('max_missing', [0, 1, 3])
+def test_cookable_matches_scan(reader, index, max_missing):
+    pantry = {normalise_ingredient(name) for name in PANTRY}
+    expected = []
+    for position, recipe in enumerate(reader.recipes):
+        keys = ingredient_keys(recipe)
+        matched, missing = len(keys & pantry), len(keys - pantry)
+        if matched and missing <= max_missing:
+            expected.append(((-matched / len(keys), missing, position), (recipe.id, matched, missing)))
+    expected.sort()
+
+    matches = index.cookable(PANTRY, max_missing=max_missing)
+    assert matches
+    assert [tuple(match) for match in matches] == [match for _, match in expected]
+    assert index.cookable(PANTRY, max_missing=max_missing, limit=3) == matches[:3]
+
+
+def test_cookable_rejects_negative_missing(index):
+    with pytest.raises(ValueError):
+        index.cookable(PANTRY, max_missing=-1)
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+import recipe.adapters.repository as repo
+from recipe import create_app
+from recipe.adapters.instrumentation import Histogram, Metrics, TimedRepository
+
+
+@pytest.fixture
+def app(tmp_path):
+    return create_app({'TESTING': True, 'USE_SNAPSHOT': False, 'INSTRUMENTATION': True,
+                       'PROFILE_DIR': str(tmp_path / 'profiles'), 'PROFILE_TOKEN': 'let-me-in'})
+
+
+def test_histogram_buckets_are_inclusive():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4 and histogram.sum == pytest.approx(2.65)
+
+
+def test_prometheus_text_format():
+    metrics = Metrics()
+    metrics.observe('repository_call_duration_seconds', 0.0003, method='get_recipe')
+    metrics.add_collector(lambda: [('page_cache_hits_total', 'counter', "Page cache hits.", [((), 3)])])
+    text = metrics.render()
+    assert '# TYPE repository_call_duration_seconds histogram' in text
+    assert 'repository_call_duration_seconds_bucket{method="get_recipe",le="0.00025"} 0' in text
+    assert 'repository_call_duration_seconds_bucket{method="get_recipe",le="0.0005"} 1' in text
+    assert 'repository_call_duration_seconds_bucket{method="get_recipe",le="+Inf"} 1' in text
+    assert 'repository_call_duration_seconds_count{method="get_recipe"} 1' in text
+    assert 'page_cache_hits_total 3' in text
+
+
+def test_requests_are_measured(app):
+    client = app.test_client()
+    response = client.get('/')
+    assert response.status_code == 200
+    assert 'template;dur=' in response.headers['Server-Timing']
+    assert 'repository;dur=' in response.headers['Server-Timing']
+    client.get('/api/recipes?limit=2')
+    text = client.get('/metrics').get_data(as_text=True)
+    assert 'http_request_duration_seconds_count{endpoint="home",method="GET",status="200"} 1' in text
+    assert 'template_render_duration_seconds_count{template="recipeDescription.html"} 1' in text
+    assert 'repository_call_duration_seconds_count{method="iter_recipes"} 1' in text
+    assert 'page_cache_misses_total 1' in text
+    assert 'catalogue_load_seconds' in text
+
+
+def test_profile_on_demand(app):
+    client = app.test_client()
+    assert 'X-Profile-File' not in client.get('/', headers={'X-Profile': 'wrong'}).headers
+    response = client.get('/', headers={'X-Profile': 'let-me-in'})
+    profile = os.path.join(app.config['PROFILE_DIR'], response.headers['X-Profile-File'])
+    assert os.path.getsize(profile) > 0
+
+
+def test_timed_repository_delegates(app):
+    assert isinstance(repo.repo_instance, TimedRepository)
+    recipes = list(repo.repo_instance.iter_recipes(after_id=None))
+    assert len(recipes) == repo.repo_instance.get_number_of_recipes()
+
+
+def test_metrics_route_is_opt_in():
+    assert create_app({'TESTING': True, 'USE_SNAPSHOT': False}).test_client().get('/metrics').status_code == 404
@@ -0,0 +1,45 @@
+import ast
+import csv
+
+import pytest
+
+from conftest import SOURCE_CSV
+from recipe.adapters.datareader.listparser import parse_list_literal
+
+LIST_COLUMNS = ('Images', 'RecipeIngredientQuantities', 'RecipeIngredientParts', 'RecipeInstructions')
+
+
+def test_parse_simple_list():
+    assert parse_list_literal("['4', '1/4', '1']") == ['4', '1/4', '1']
+
+
+def test_parse_empty_list():
+    assert parse_list_literal("[]") == []
+
+
+def test_parse_embedded_commas_and_quotes():
+    text = """['lemons, rind of', "baker's yeast", 'say \\'hi\\'', "a \\"b\\"", 'back\\\\slash']"""
+    assert parse_list_literal(text) == ast.literal_eval(text)
+
+
+def test_parse_control_escapes():
+    text = "['line\\nbreak', 'tab\\there', 'cr\\r']"
+    assert parse_list_literal(text) == ['line\nbreak', 'tab\there', 'cr\r']
+
+
+def test_parse_falls_back_for_other_literals():
+    assert parse_list_literal("['caf\\xe9', 1]") == ['caf\xe9', 1]
+
+
+def test_parse_rejects_malformed_input():
+    with pytest.raises((ValueError, SyntaxError)):
+        parse_list_literal("['unterminated]")
+
+
+def test_parity_with_literal_eval_on_every_row():
+    with open(SOURCE_CSV, 'r', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            for column in LIST_COLUMNS:
+                text = row[column]
+                if text and text != 'NA':
+                    assert parse_list_literal(text) == ast.literal_eval(text), (row['RecipeId'], column)
@@ -0,0 +1,81 @@
+import pytest
+
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.favourite import Favourite
+from recipe.domainmodel.indexedlist import IndexedList
+from recipe.domainmodel.recipe import Recipe
+from recipe.domainmodel.review import Review
+from recipe.domainmodel.user import User
+
+
+def test_author_recipes_keep_insertion_order():
+    author = Author(1, "Chef A")
+    recipes = [Recipe(recipe_id, f"Recipe {recipe_id}", author) for recipe_id in (5, 2, 9)]
+    for recipe in recipes:
+        author.add_recipe(recipe)
+    assert author.recipes == recipes
+    with pytest.raises(ValueError):
+        author.add_recipe(Recipe(2, "Same id", author))
+    assert author.recipes is author.recipes
+
+
+def test_author_constructed_with_recipes():
+    author = Author(1, "Chef A")
+    recipes = [Recipe(1, "One", author), Recipe(2, "Two", author), Recipe(1, "One", author)]
+    constructed = Author(1, "Chef A", recipes)
+    assert constructed.recipes == recipes
+    assert constructed.stats.count == 3
+    with pytest.raises(ValueError):
+        constructed.add_recipe(Recipe(2, "Two", author))
+
+
+def test_user_favourites():
+    user = User("cook", "secret", 1)
+    favourites = [Favourite() for _ in range(3)]
+    for favourite in favourites:
+        user.add_favourite_recipe(favourite)
+    with pytest.raises(ValueError):
+        user.add_favourite_recipe(favourites[0])
+    user.remove_favourite_recipe(favourites[1])
+    assert user.favourite_recipes == [favourites[0], favourites[2]]
+    with pytest.raises(ValueError):
+        user.remove_favourite_recipe(favourites[1])
+
+
+def test_user_reviews():
+    user = User("cook", "secret", 1)
+    reviews = [Review() for _ in range(3)]
+    for review in reviews:
+        user.add_review(review)
+    user.add_review(reviews[2])
+    user.remove_review(reviews[0])
+    user.remove_review(reviews[2])
+    assert user.reviews == reviews[1:]
+    with pytest.raises(ValueError):
+        user.remove_review(reviews[0])
+
+
+def test_collections_cannot_be_changed_past_their_owner():
+    user = User("cook", "secret", 1)
+    favourite = Favourite()
+    with pytest.raises(AttributeError):
+        user.favourite_recipes.append(favourite)
+    user.add_favourite_recipe(favourite)
+    with pytest.raises(ValueError):
+        user.add_favourite_recipe(favourite)
+    author = Author(1, "Chef A")
+    with pytest.raises(AttributeError):
+        author.recipes.append(Recipe(1, "One", author))
+    assert author.recipes == [] and user.favourite_recipes == [favourite]
+
+
+def test_indexed_list_removals():
+    items = [f"item {number}" for number in range(10)]
+    indexed = IndexedList(items + items[:3])
+    for item in items[:3] + items[5:9]:
+        indexed._remove(item)
+    assert list(indexed) == items[3:5] + items[9:] + items[:3]
+    assert indexed[0] == items[3] and indexed[-1] == items[2] and indexed[1:3] == [items[4], items[9]]
+    assert len(indexed) == 6 and indexed.count(items[0]) == 1 and items[5] not in indexed
+    with pytest.raises(ValueError):
+        indexed._remove(items[5])
@@ -0,0 +1,80 @@
+from datetime import datetime
+
+import pytest
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.repository import RepositoryException
+from recipe.adapters.repository_populate import populate
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+
+
+@pytest.fixture(scope='module')
+def populated_repo():
+    repo = MemoryRepository()
+    populate(repo, CSVDataReader(use_snapshot=False))
+    return repo
+
+
+@pytest.fixture
+def repo():
+    author_a, author_b = Author(1, "Chef A"), Author(2, "Chef B")
+    breakfast, dinner = Category("Breakfast", [], 1), Category("Dinner", [], 2)
+    repo = MemoryRepository()
+    for recipe_id, author, category, day in ((30, author_a, breakfast, 3), (10, author_b, dinner, 1),
+                                             (20, author_a, dinner, 2), (40, author_b, breakfast, 2)):
+        repo.add_recipe(Recipe(recipe_id, f"Recipe {recipe_id}", author, category=category,
+                               created_date=datetime(2024, 1, day)))
+    return repo
+
+
+def test_get_recipe(repo):
+    assert repo.get_recipe(20).name == "Recipe 20"
+    assert repo.get_recipe(99) is None
+    assert repo.get_number_of_recipes() == 4
+
+
+def test_add_duplicate_recipe(repo):
+    with pytest.raises(RepositoryException):
+        repo.add_recipe(Recipe(10, "Again", Author(1, "Chef A")))
+
+
+def test_recipes_by_author_and_category(repo):
+    assert [r.id for r in repo.get_recipes_by_author(1)] == [30, 20]
+    assert [r.id for r in repo.get_recipes_by_category(1)] == [30, 40]
+    assert repo.get_recipes_by_author(99) == []
+    assert repo.get_category_by_name("dinner").id == 2
+    assert [a.id for a in repo.get_authors()] == [1, 2]
+    assert [c.name for c in repo.get_categories()] == ["Breakfast", "Dinner"]
+
+
+def test_recipes_by_date_range(repo):
+    assert [r.id for r in repo.get_recipes_by_date_range(datetime(2024, 1, 2), datetime(2024, 1, 3))] == [20, 40, 30]
+    assert repo.get_recipes_by_date_range(datetime(2025, 1, 1), datetime(2025, 2, 1)) == []
+
+
+def test_paging(repo):
+    assert [r.id for r in repo.get_recipes(1, 3)] == [10, 20, 30]
+    assert [r.id for r in repo.get_recipes(2, 3)] == [40]
+    assert repo.get_recipes(3, 3) == []
+    repo.add_recipe(Recipe(15, "Late addition", Author(1, "Chef A"), created_date=datetime(2024, 1, 1)))
+    assert [r.id for r in repo.get_recipes(1, 3)] == [10, 15, 20]
+    with pytest.raises(ValueError):
+        repo.get_recipes(0)
+
+
+def test_populate_indexes_full_catalogue(populated_repo):
+    assert populated_repo.get_number_of_recipes() == 2455
+    recipe = populated_repo.get_recipe(38)
+    assert recipe.name == "Low-Fat Berry Blue Frozen Dessert"
+    assert recipe in populated_repo.get_recipes_by_author(recipe.author.id)
+    assert recipe in populated_repo.get_recipes_by_category(recipe.category.id)
+    assert recipe in populated_repo.get_recipes_by_date_range(recipe.date, recipe.date)
+
+
+def test_iter_recipes_after_cursor(repo):
+    assert [r.id for r in repo.iter_recipes()] == [10, 20, 30, 40]
+    assert [r.id for r in repo.iter_recipes(after_id=20)] == [30, 40]
+    assert list(repo.iter_recipes(after_id=40)) == []
@@ -0,0 +1,102 @@
+import math
+
+import numpy as np
+import pytest
+
+from conftest import SOURCE_CSV
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.nutritionindex import NutritionIndex
+from recipe.domainmodel.nutrition import NUTRITION_FIELDS, Nutrition
+
+
+@pytest.fixture(scope='module')
+def catalogue():
+    recipes = CSVDataReader(SOURCE_CSV, use_snapshot=False).recipes
+    recipe_ids = np.array([recipe.id for recipe in recipes])
+    values = np.array([recipe.nutrition.as_tuple() for recipe in recipes], dtype=np.float64)
+    return recipe_ids, values, NutritionIndex.build(recipes)
+
+
+def normalised(values, column):
+    present = values[~np.isnan(values[:, column]), column]
+    scale = np.subtract(*np.percentile(present, [75, 25])) or 1.0
+    return np.median(present), scale
+
+
+def brute_force_nearest(recipe_ids, values, k, **targets):
+    squared = np.zeros(len(recipe_ids))
+    for field, target in targets.items():
+        column = NUTRITION_FIELDS.index(field)
+        centre, scale = normalised(values, column)
+        filled = np.where(np.isnan(values[:, column]), centre, values[:, column])
+        squared += ((filled - target) / scale) ** 2
+    order = np.lexsort((np.arange(len(recipe_ids)), squared))[:k]
+    return recipe_ids[order].tolist(), np.sqrt(squared[order])
+
+
+def test_nutrition_value_type():
+    nutrition = Nutrition.from_values([500, None, 8.0, 50, 800, 60, 5, 10, 25])
+    assert nutrition.as_tuple() == (500.0, None, 8.0, 50.0, 800.0, 60.0, 5.0, 10.0, 25.0)
+    assert nutrition.fat_content is None and type(nutrition.calories) is float
+    assert nutrition == Nutrition(calories=500, saturated_fat_content=8, cholesterol_content=50, sodium_content=800,
+                                  carbohydrate_content=60, fiber_content=5, sugar_content=10, protein_content=25)
+    assert hash(nutrition) == hash(Nutrition.from_values(nutrition.as_tuple()))
+    with pytest.raises(TypeError):
+        Nutrition(calories='500')
+    with pytest.raises(TypeError):
+        nutrition.protein_content = True
+
+
+@pytest.mark.parametrize('k, targets', [
+    (10, {'calories': 500, 'protein_content': 30, 'fat_content': 15}),
+    (1, {'calories': 250}),
+    (25, {'sodium_content': 400, 'sugar_content': 40}),
+    (200, dict(zip(NUTRITION_FIELDS, (800, 40, 15, 120, 1500, 60, 6, 12, 45)))),
+])
+def test_nearest_matches_brute_force(catalogue, k, targets):
+    recipe_ids, values, index = catalogue
+    expected_ids, expected_distances = brute_force_nearest(recipe_ids, values, k, **targets)
+    matches = index.nearest(k, **targets)
+    assert [match.recipe_id for match in matches] == expected_ids
+    assert np.allclose([match.distance for match in matches], expected_distances)
+
+
+@pytest.mark.parametrize('ranges', [
+    {'calories': (400, 600), 'protein_content': (30, None)},
+    {'fiber_content': (None, 0)},
+    {'sodium_content': (100, 100.5), 'fat_content': (0, 1000)},
+    {'calories': (10 ** 6, None)},
+])
+def test_within_matches_brute_force(catalogue, ranges):
+    recipe_ids, values, index = catalogue
+    matched = np.ones(len(recipe_ids), dtype=bool)
+    for field, (low, high) in ranges.items():
+        column = values[:, NUTRITION_FIELDS.index(field)]
+        matched &= (column >= (-math.inf if low is None else low)) & (column <= (math.inf if high is None else high))
+    assert index.within(**ranges) == recipe_ids[matched].tolist()
+
+
+def test_missing_values():
+    recipe_ids = np.array([1, 2, 3, 4, 5])
+    values = np.full((5, len(NUTRITION_FIELDS)), np.nan)
+    values[:, 0] = [100, np.nan, 300, 400, 500]
+    values[:, 8] = [10, 20, np.nan, 40, 50]
+    index = NutritionIndex(recipe_ids, values, leaf_size=1)
+    # Recipe 2's missing calories count as the median, 350.
+    assert [match.recipe_id for match in index.nearest(2, calories=350)] == [2, 3]
+    assert index.within(calories=(0, None)) == [1, 3, 4, 5]
+    assert index.within(calories=(0, None), protein_content=(0, None)) == [1, 4, 5]
+    assert index.within(fat_content=(None, None)) == []
+
+
+def test_invalid_queries(catalogue):
+    _, _, index = catalogue
+    with pytest.raises(ValueError):
+        index.nearest(0, calories=500)
+    with pytest.raises(ValueError):
+        index.nearest(5)
+    with pytest.raises(ValueError):
+        index.nearest(5, kilojoules=2000)
+    with pytest.raises(ValueError):
+        index.within()
+    assert NutritionIndex.build([]).nearest(5, calories=500) == []
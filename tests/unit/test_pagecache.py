@@ -0,0 +1,53 @@
+import pytest
+
+from recipe import create_app
+from recipe.adapters.pagecache import PageCache
+
+
+@pytest.fixture(scope='module')
+def app():
+    return create_app({'TESTING': True, 'USE_SNAPSHOT': False})
+
+
+def test_cache_hits_and_misses():
+    cache = PageCache()
+    renders = []
+    for _ in range(3):
+        page = cache.get_or_render(('page', 1), lambda: renders.append(1) or "<p>hi</p>")
+    assert len(renders) == 1
+    assert page.body == b"<p>hi</p>"
+    assert cache.stats() == {'hits': 2, 'misses': 1, 'evictions': 0, 'entries': 1, 'bytes': 9}
+
+
+def test_cache_evicts_least_recently_used():
+    cache = PageCache(max_bytes=10)
+    cache.put('a', b'aaaa')
+    cache.put('b', b'bbbb')
+    cache.get('a')
+    cache.put('c', b'cccc')
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.size == 8 and cache.evictions == 1
+    cache.put('huge', b'x' * 11)
+    assert cache.get('huge') is None and len(cache) == 2
+
+
+def test_home_page_is_cached(app):
+    client = app.test_client()
+    cache = app.extensions['page_cache']
+    cache.clear()
+    first = client.get('/')
+    second = client.get('/')
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert cache.misses >= 1 and cache.hits >= 1 and len(cache) == 1
+
+
+def test_conditional_get_returns_not_modified(app):
+    client = app.test_client()
+    etag = client.get('/').headers['ETag']
+    response = client.get('/', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert client.get('/', headers={'If-None-Match': '"stale"'}).status_code == 200
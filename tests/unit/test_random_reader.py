@@ -0,0 +1,94 @@
+import csv
+import os
+import random
+from collections import Counter
+
+import pytest
+
+from conftest import SOURCE_CSV
+from recipe.adapters.datareader.RandomCSVDataReader import (AliasSampler, RandomCSVDataReader, RandomRecipe,
+                                                             decode_random_recipe)
+from recipe.adapters.datareader.csvdatareader import decode_row
+from recipe.adapters.datareader.decoders import NUTRITION_COLUMNS
+
+
+def test_rows_are_decoded_once():
+    reader = RandomCSVDataReader(SOURCE_CSV)
+    assert len(reader) == 2455
+    first = reader.get_recipe_at(0)
+    assert isinstance(first, RandomRecipe)
+    assert first.id == 38
+    assert first.name == 'Low-Fat Berry Blue Frozen Dessert'
+    assert first.cook_time == 1440 and first.total_time == 1485
+    assert first.calories == 170.9
+    assert first.recipe_yield is None and first.servings == '4'
+    assert len(first.images) == 6 and first.images[0].startswith('https://')
+    assert first.ingredients[:2] == (('4', 'blueberries'), ('1/4', 'granulated sugar'))
+    assert first.instructions[4].startswith("Strain through fine sieve. Pour into baking pan (or transfer")
+    assert reader.get_recipe_at(0) is first
+    assert list(reader)[0] is first
+
+
+def test_unequal_ingredient_columns_are_padded():
+    row = {'RecipeId': '1', 'Name': 'n', 'AuthorName': 'a', 'RecipeCategory': 'c', 'Description': 'd',
+           'Images': 'NA', 'PrepTime': '5', 'CookTime': 'NA', 'TotalTime': '5',
+           'RecipeIngredientQuantities': "['1']", 'RecipeIngredientParts': "['salt', 'pepper']",
+           'RecipeInstructions': "['Mix.']", 'RecipeServings': '', 'RecipeYield': '2 cups'}
+    row.update({column: 'NA' for _, column in NUTRITION_COLUMNS})
+    decoded = decode_random_recipe(row)
+    assert decoded.images == ()
+    assert decoded.cook_time == 0
+    assert decoded.ingredients == (('1', 'salt'), ('', 'pepper'))
+    assert decoded.calories is None and decoded.recipe_yield == '2 cups'
+    assert decoded.servings == ''
+
+
+def test_rows_decode_like_csv_data_reader():
+    with open(SOURCE_CSV, newline='', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            random_recipe, record = decode_random_recipe(row), decode_row(row)
+            assert (random_recipe.cook_time, random_recipe.preparation_time, random_recipe.total_time) == \
+                   (record.cook_time, record.preparation_time, record.total_time)
+            assert tuple(getattr(random_recipe, attribute) for attribute, _ in NUTRITION_COLUMNS) == record.nutrition
+            assert (random_recipe.servings, random_recipe.recipe_yield) == (record.servings, record.recipe_yield)
+            assert list(random_recipe.images) == record.images
+
+
+def test_template_only_iterates():
+    from jinja2 import Environment, FileSystemLoader
+    templates = os.path.join(os.path.dirname(__file__), '..', '..', 'recipe', 'adapters', 'templates')
+    recipe = RandomCSVDataReader(SOURCE_CSV).get_recipe_at(0)
+    html = Environment(loader=FileSystemLoader(templates), autoescape=True) \
+        .get_template('RandomRecipe.html').render(recipe=recipe)
+    assert html.count('class="recipe-image"') == 6
+    assert '<li>1/4 granulated sugar</li>' in html
+    assert "manufacturers&#39; directions" in html
+    assert '产量:</strong> 未指定' in html
+
+
+def test_seed_is_reproducible():
+    reader_a, reader_b = RandomCSVDataReader(SOURCE_CSV, seed=7), RandomCSVDataReader(SOURCE_CSV, seed=7)
+    assert [reader_a.get_random_recipe().id for _ in range(20)] == \
+           [reader_b.get_random_recipe().id for _ in range(20)]
+
+
+def test_weighted_sampling_skips_zero_weights():
+    reader = RandomCSVDataReader(SOURCE_CSV, seed=1, weights=lambda row: row['RecipeId'] in ('38', '40'))
+    assert {reader.get_random_recipe().id for _ in range(200)} == {38, 40}
+
+
+def test_alias_sampler_follows_weights():
+    sampler = AliasSampler([1, 0, 3], random.Random(3))
+    counts = Counter(sampler.sample() for _ in range(40_000))
+    assert counts[1] == 0
+    assert counts[2] / counts[0] == pytest.approx(3, rel=0.05)
+    with pytest.raises(ValueError):
+        AliasSampler([0, 0], random.Random())
+
+
+def test_empty_and_missing_files(tmp_path):
+    path = tmp_path / 'empty.csv'
+    path.write_text('RecipeId,Name\n')
+    assert RandomCSVDataReader(str(path)).get_random_recipe() is None
+    with pytest.raises(FileNotFoundError):
+        RandomCSVDataReader(str(tmp_path / 'missing.csv'))
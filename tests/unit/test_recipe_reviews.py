@@ -0,0 +1,83 @@
+import pytest
+
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.recipe import Recipe
+from recipe.domainmodel.review import Review
+
+
+class RatedReview(Review):
+    """ Review is still a stub; this gives it the rating attribute Recipe reads. """
+
+    def __init__(self, rating):
+        self.rating = rating
+
+
+@pytest.fixture
+def recipe():
+    return Recipe(1, "Pancakes", Author(1, "Chef A"))
+
+
+def test_rating_is_the_rounded_mean(recipe):
+    reviews = [RatedReview(rating) for rating in (5.0, 4.0, 4.0)]
+    for review in reviews:
+        recipe.add_review(review)
+    assert recipe.rating == 4.3
+    recipe.remove_review(reviews[0])
+    assert recipe.rating == 4.0
+    assert recipe.reviews == reviews[1:]
+
+
+def test_unrated_reviews_do_not_count(recipe):
+    unrated = RatedReview(None)
+    recipe.add_review(unrated)
+    assert recipe.rating is None
+    recipe.add_review(RatedReview(3.0))
+    assert recipe.rating == 3.0
+    recipe.remove_review(unrated)
+    assert recipe.rating == 3.0
+
+
+def test_removing_every_review_clears_the_rating(recipe):
+    reviews = [RatedReview(0.1), RatedReview(0.2), RatedReview(4.7)]
+    for review in reviews:
+        recipe.add_review(review)
+    for review in reviews:
+        recipe.remove_review(review)
+    assert recipe.rating is None
+    recipe.add_review(RatedReview(2.0))
+    assert recipe.rating == 2.0
+
+
+def test_duplicate_and_missing_reviews(recipe):
+    review = RatedReview(4.0)
+    recipe.add_review(review)
+    recipe.add_review(RatedReview(1.0))
+    recipe.add_review(review)
+    assert recipe.rating == 3.0 and len(recipe.reviews) == 3
+    recipe.remove_review(review)
+    recipe.remove_review(review)
+    assert recipe.rating == 1.0
+    with pytest.raises(ValueError):
+        recipe.remove_review(review)
+
+
+def test_rating_is_read_when_a_review_is_added(recipe):
+    review = RatedReview(4.0)
+    recipe.add_review(review)
+    review.rating = 2.0
+    assert recipe.rating == 4.0
+    recipe.add_review(review)
+    assert recipe.rating == 3.0
+    recipe.remove_review(review)
+    assert recipe.rating == 2.0
+    assert recipe.reviews is recipe.reviews
+
+
+def test_rating_histogram(recipe):
+    assert recipe.rating_histogram == {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
+    reviews = [RatedReview(rating) for rating in (0.0, 1.4, 2.5, 4.0, 4.2, 5.0)]
+    for review in reviews:
+        recipe.add_review(review)
+    assert recipe.rating_histogram == {1: 2, 2: 0, 3: 1, 4: 2, 5: 1}
+    recipe.remove_review(reviews[3])
+    assert recipe.rating_histogram[4] == 1
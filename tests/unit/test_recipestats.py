@@ -0,0 +1,94 @@
+import pytest
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.domainmodel.author import Author
+from recipe.domainmodel.category import Category
+from recipe.domainmodel.recipe import Recipe
+from recipe.domainmodel.recipestats import RecipeStats
+
+
+@pytest.fixture
+def author():
+    return Author(1, "Chef A")
+
+
+@pytest.fixture
+def category():
+    return Category("Dinner", [], 1)
+
+
+def make_recipe(recipe_id, author, category, cook_time, preparation_time, rating=None):
+    recipe = Recipe(recipe_id, f"Recipe {recipe_id}", author, cook_time=cook_time,
+                    preparation_time=preparation_time, category=category, rating=rating)
+    author.add_recipe(recipe)
+    category.add_recipe(recipe)
+    return recipe
+
+
+def test_empty_stats():
+    stats = RecipeStats()
+    assert stats.count == 0
+    assert stats.average_rating is None
+    assert stats.average_calories is None
+    assert stats.time_range('total_time') is None
+    assert stats.fastest_recipe is None
+    with pytest.raises(ValueError):
+        stats.time_range('bake_time')
+
+
+def test_stats_follow_additions(author, category):
+    slow = make_recipe(1, author, category, 60, 30, rating=4.0)
+    quick = make_recipe(2, author, category, 5, 10, rating=3.0)
+    make_recipe(3, author, category, 20, 0)
+    for stats in (author.stats, category.stats):
+        assert stats.count == 3
+        assert stats.rated_count == 2
+        assert stats.average_rating == 3.5
+        assert stats.time_range('total_time') == (15, 90)
+        assert stats.time_range('cook_time') == (5, 60)
+        assert stats.fastest_recipe is quick
+    assert slow in author.recipes
+
+
+def test_stats_follow_rating_changes(author, category):
+    recipe = make_recipe(1, author, category, 10, 10, rating=2.0)
+    make_recipe(2, author, category, 10, 10, rating=4.0)
+    recipe.rating = 5.0
+    assert author.stats.average_rating == category.stats.average_rating == 4.5
+    recipe.rating = None
+    assert author.stats.average_rating == 4.0
+    assert category.stats.rated_count == 1
+
+
+def test_stats_use_the_published_total_time(author, category):
+    listed = Recipe(1, "Slow cooked", author, cook_time=0, preparation_time=0, total_time=100, category=category)
+    category.add_recipe(listed)
+    quick = make_recipe(2, author, category, 10, 20)
+    assert category.stats.time_range('total_time') == (30, 100)
+    assert category.stats.fastest_recipe is quick
+
+
+def test_rating_changes_count_each_listing(author, category):
+    recipe = make_recipe(1, author, category, 10, 10, rating=2.0)
+    category.add_recipe(recipe)
+    recipe.rating = 4.0
+    assert category.stats.rated_count == 2
+    assert category.stats.average_rating == 4.0
+
+
+def test_recipes_outside_the_group_are_ignored(author, category):
+    make_recipe(1, author, category, 10, 10, rating=2.0)
+    outsider = Recipe(2, "Elsewhere", author, category=category, rating=1.0)
+    outsider.rating = 5.0
+    assert author.stats.average_rating == 2.0
+    assert category.stats.count == 1
+
+
+def test_stats_match_a_full_scan():
+    reader = CSVDataReader(use_snapshot=False)
+    category = max(reader.categories, key=lambda c: len(c.recipes))
+    calories = [r.nutrition.calories for r in category.recipes if r.nutrition.calories is not None]
+    assert category.stats.count == len(category.recipes)
+    assert category.stats.average_calories == pytest.approx(sum(calories) / len(calories))
+    totals = [r.total_time for r in category.recipes]
+    assert category.stats.time_range('total_time') == (min(totals), max(totals))
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.recommendations import SimilarRecipes, build_lock, recipe_features
+from recipe.domainmodel.category import Category
+
+
+@pytest.fixture
+def recipes(make_recipe):
+    italian = Category("Italian", [], 1)
+    dessert = Category("Dessert", [], 2)
+    return [
+        make_recipe(1, italian, ["spaghetti", "bacon", "eggs", "parmesan"]),
+        make_recipe(2, dessert, ["chocolate", "eggs", "cream"]),
+        make_recipe(3, dessert, ["mascarpone", "coffee", "eggs", "cream"]),
+        make_recipe(4, italian, ["spaghetti", "bacon", "Eggs", "pecorino"]),
+        make_recipe(7, dessert, ["Chocolate", "cream", "sugar"]),
+        make_recipe(9, None, ["water"]),
+    ]
+
+
+def brute_force(recipes, k):
+    """ Dense cosine similarity over the same TF-IDF weights, ranked best first with ties in catalogue order. """
+    features = [recipe_features(recipe) for recipe in recipes]
+    vocabulary = sorted(set().union(*features))
+    matrix = np.array([[feature in row for feature in vocabulary] for row in features], dtype=np.float64)
+    idf = np.log((1 + len(recipes)) / (1 + matrix.sum(axis=0))) + 1
+    matrix *= idf
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    similarity = matrix @ matrix.T
+    result = {}
+    for row, recipe in enumerate(recipes):
+        ranked = sorted((-similarity[row, other], other) for other in range(len(recipes))
+                        if other != row and similarity[row, other] > 1e-9)
+        result[recipe.id] = [(recipes[other].id, -score) for score, other in ranked[:k]]
+    return result
+
+
+@pytest.mark.parametrize('block_size', [1, 2, 4, 1024])
+def test_matches_brute_force_for_any_block_size(recipes, block_size):
+    similar = SimilarRecipes.build(recipes, k=3, block_size=block_size)
+    for recipe_id, expected in brute_force(recipes, 3).items():
+        found = similar.similar(recipe_id)
+        assert [neighbour.recipe_id for neighbour in found] == [other for other, _ in expected]
+        assert [neighbour.score for neighbour in found] == pytest.approx([score for _, score in expected], abs=1e-3)
+
+
+def test_lookup(recipes):
+    similar = SimilarRecipes.build(recipes, k=2)
+    assert similar.similar(1)[0].recipe_id == 4
+    assert [neighbour.recipe_id for neighbour in similar.similar(2, limit=1)] == [7]
+    assert similar.similar(9) == []
+    assert similar.similar(5) == [] and similar.similar(1000) == [] and similar.similar(-1) == []
+    assert len(similar) == 6 and similar.k == 2
+    with pytest.raises(ValueError):
+        SimilarRecipes.build(recipes, k=0)
+
+
+def test_save_load_round_trip(recipes, tmp_path):
+    path = str(tmp_path / 'similar.npz')
+    built = SimilarRecipes.load_or_build(recipes, 'v1', path)
+    loaded = SimilarRecipes.load(path)
+    assert loaded.fingerprint == 'v1'
+    assert all(loaded.similar(recipe.id) == built.similar(recipe.id) for recipe in recipes)
+    rebuilt = SimilarRecipes.load_or_build(recipes[:3], 'v2', path)
+    assert len(rebuilt) == 3 and SimilarRecipes.load(path).fingerprint == 'v2'
+
+
+def test_full_catalogue_blocks_agree():
+    catalogue = CSVDataReader(use_snapshot=False).recipes
+    whole = SimilarRecipes.build(catalogue, block_size=4096)
+    blocked = SimilarRecipes.build(catalogue, block_size=300)
+    for recipe in catalogue[::97]:
+        assert [n.recipe_id for n in blocked.similar(recipe.id)] == [n.recipe_id for n in whole.similar(recipe.id)]
+    assert whole.similar(38)[0].score > whole.similar(38)[-1].score
+
+
+def test_load_or_build_waits_for_another_build(recipes, tmp_path, monkeypatch):
+    path = str(tmp_path / 'similar.npz')
+    built = SimilarRecipes.build(recipes, 'v1')
+    monkeypatch.setattr(SimilarRecipes, 'build', lambda *args, **kwargs: pytest.fail("built twice"))
+    results = []
+    with build_lock(path):
+        worker = threading.Thread(target=lambda: results.append(SimilarRecipes.load_or_build(recipes, 'v1', path)))
+        worker.start()
+        # Give the worker time to find no file and queue for the lock, then save the lists as the lock holder.
+        time.sleep(0.2)
+        built.save(path)
+    worker.join()
+    assert results and results[0].fingerprint == 'v1' and len(results[0]) == len(recipes)
@@ -0,0 +1,144 @@
+import csv
+import os
+
+import pytest
+
+import recipe.adapters.repository as repo
+from recipe.adapters.catalogue_repository import CatalogueRepository
+from recipe.adapters.datareader.csvdatareader import CSVDataReader, file_fingerprint
+from recipe.adapters.memory_repository import MemoryRepository
+from recipe.adapters.reloader import CatalogueReloader, RecordDiff, diff_rows
+from recipe.adapters.repository_populate import populate
+
+
+@pytest.fixture
+def loaded(csv_copy):
+    previous = repo.published
+    reader = CSVDataReader(csv_copy, use_snapshot=False)
+    repository = MemoryRepository()
+    populate(repository, reader)
+    repo.publish(repository, reader.fingerprint)
+    yield csv_copy
+    repo.published = previous
+    repo.repo_instance = previous.repository if previous is not None else None
+
+
+def rewrite(csv_file, change):
+    with open(csv_file, newline='', encoding='utf-8') as file:
+        rows = list(csv.reader(file))
+    rows = [rows[0]] + change(rows[1:])
+    with open(csv_file, 'w', newline='', encoding='utf-8') as file:
+        csv.writer(file).writerows(rows)
+    stat = os.stat(csv_file)
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_diff_rows():
+    assert diff_rows({1: 10, 2: 20, 3: 30}, {2: 21, 3: 30, 4: 40}) == RecordDiff([4], [2], [1])
+    assert diff_rows({1: 10}, {1: 10}).is_empty
+
+
+def test_unchanged_file_is_not_reloaded(loaded):
+    reloader = CatalogueReloader(loaded)
+    assert reloader.check() is None
+    rewrite(loaded, lambda rows: rows)
+    snapshot = repo.repo_instance
+    assert reloader.check().is_empty
+    assert repo.repo_instance is snapshot
+
+
+def test_reload_applies_row_changes(loaded):
+    reloads = []
+    reloader = CatalogueReloader(loaded, on_reload=lambda diff, fingerprint: reloads.append(fingerprint))
+    old_repo = repo.repo_instance
+    first, second = old_repo.get_recipes(1, 2)
+    old_author_recipes = len(first.author.recipes)
+
+    def change(rows):
+        deleted = [row for row in rows if row[0] == str(second.id)]
+        rows = [row for row in rows if row[0] != str(second.id)]
+        for row in rows:
+            if row[0] == str(first.id):
+                row[1] = "Renamed recipe"
+        inserted = list(deleted[0])
+        inserted[0], inserted[1], inserted[10] = '999999', 'Brand new', 'Hot Reload Category'
+        return rows + [inserted]
+
+    rewrite(loaded, change)
+    diff = reloader.check()
+    assert (diff.inserted, diff.updated, diff.deleted) == ([999999], [first.id], [second.id])
+    assert len(reloads) == 1
+
+    new_repo = repo.repo_instance
+    assert new_repo is not old_repo
+    assert repo.published == (new_repo, reloads[0])
+    assert reloads[0] == file_fingerprint(loaded)
+    assert new_repo.get_recipe(first.id).name == "Renamed recipe"
+    assert new_repo.get_recipe(second.id) is None
+    assert new_repo.get_recipe(999999).category.name == 'Hot Reload Category'
+    assert new_repo.get_number_of_recipes() == old_repo.get_number_of_recipes()
+    # The old snapshot is left exactly as it was.
+    assert old_repo.get_recipe(first.id).name == first.name
+    assert old_repo.get_recipe(second.id) is second
+    assert len(first.author.recipes) == old_author_recipes
+    # Categories keep their ids, and membership follows the new rows.
+    for category in old_repo.get_categories():
+        assert new_repo.get_category_by_name(category.name).id == category.id
+    renamed = new_repo.get_recipe(first.id)
+    assert renamed in renamed.author.recipes and renamed.author is not first.author
+    assert sum(len(c.recipes) for c in new_repo.get_categories()) == new_repo.get_number_of_recipes()
+
+
+def test_reload_wraps_before_publishing(loaded):
+    wrapped = []
+    reloader = CatalogueReloader(loaded, wrap_repository=lambda repository: wrapped.append(repository) or repository)
+    rewrite(loaded, lambda rows: rows[1:])
+    reloader.check()
+    assert wrapped == [repo.published.repository]
+
+
+def test_reload_matches_a_fresh_load(loaded):
+    reloader = CatalogueReloader(loaded)
+    rewrite(loaded, lambda rows: rows[::2])
+    reloader.check()
+    fresh = CSVDataReader(loaded, use_snapshot=False)
+    reloaded = repo.repo_instance
+    assert [r.id for r in reloaded.get_recipes(1, 5000)] == sorted(r.id for r in fresh.recipes)
+    for recipe in fresh.recipes[:50]:
+        copy = reloaded.get_recipe(recipe.id)
+        assert (copy.name, copy.ingredients, copy.author.name, copy.category.name) == \
+               (recipe.name, recipe.ingredients, recipe.author.name, recipe.category.name)
+
+
+def test_unreadable_file_is_retried_on_the_next_poll(loaded):
+    reloader = CatalogueReloader(loaded)
+    snapshot = repo.published
+    with open(loaded, 'a', encoding='utf-8') as file:
+        file.write('999999,Partial,1,Bob')
+    assert reloader.check() is None
+    assert repo.published is snapshot
+
+    def bad_cook_time(rows):
+        rows[0][4] = 'soon'
+        return rows
+
+    rewrite(loaded, lambda rows: bad_cook_time(rows[:-1]))
+    assert reloader.check() is None
+    assert repo.published is snapshot
+
+    rewrite(loaded, lambda rows: rows[1:])
+    diff = reloader.check()
+    assert len(diff.deleted) == 1 and diff.updated == []
+    assert repo.published is not snapshot
+    assert repo.repo_instance.get_recipe(diff.deleted[0]) is None
+
+
+def test_reload_with_another_rebuild(loaded, tmp_path):
+    catalogue_file = str(tmp_path / 'recipes.catalogue')
+    reloader = CatalogueReloader(
+        loaded, rebuild=lambda repository, source, changed: CatalogueRepository.open(catalogue_file, loaded))
+    rewrite(loaded, lambda rows: rows[1:])
+    reloader.check()
+    repository, version = repo.published
+    assert isinstance(repository, CatalogueRepository) and version == repository.catalogue.fingerprint
+    assert repository.get_number_of_recipes() == 2454
@@ -0,0 +1,62 @@
+import pytest
+
+from recipe.adapters.datareader.csvdatareader import CSVDataReader
+from recipe.adapters.searchindex import RecipeSearchIndex, tokenise
+from recipe.domainmodel.category import Category
+
+
+@pytest.fixture
+def recipes(make_recipe):
+    italian = Category("Italian", [], 1)
+    dessert = Category("Dessert", [], 2)
+    return [
+        make_recipe(1, italian, ["spaghetti", "bacon", "eggs"], "Spaghetti Carbonara"),
+        make_recipe(2, dessert, ["chocolate", "eggs", "cream"], "Chocolate Mousse", "A rich chocolate dessert."),
+        make_recipe(3, dessert, ["mascarpone", "coffee", "eggs"], "Tiramisu", "Italian dessert with coffee."),
+        make_recipe(4, dessert, ["flour", "chocolate chips", "butter"], "Chocolate Chip Cookies"),
+    ]
+
+
+def test_tokenise_folds_case_stopwords_and_plurals():
+    assert tokenise("The Eggs, and 2 Chocolate Chips!") == ['egg', '2', 'chocolate', 'chip']
+
+
+def test_search_ranks_by_bm25(recipes):
+    index = RecipeSearchIndex.build(recipes)
+    page = index.search("chocolate")
+    assert page.total == 2
+    assert set(page.recipe_ids) == {2, 4}
+    assert page.scores == sorted(page.scores, reverse=True)
+    assert index.search("italian coffee").recipe_ids[0] == 3
+    assert index.search("saffron").total == 0
+
+
+def test_search_pagination(recipes):
+    index = RecipeSearchIndex.build(recipes)
+    everything = index.search("egg", per_page=10)
+    assert everything.total == 3
+    pages = [index.search("egg", page=page, per_page=2) for page in (1, 2, 3)]
+    assert pages[0].page_count == 2
+    assert pages[0].recipe_ids + pages[1].recipe_ids == everything.recipe_ids
+    assert pages[2].recipe_ids == []
+    with pytest.raises(ValueError):
+        index.search("egg", page=0)
+
+
+def test_index_persists_and_rebuilds_on_new_data(recipes, tmp_path):
+    path = str(tmp_path / 'search.npz')
+    built = RecipeSearchIndex.load_or_build(recipes, 'v1', path)
+    loaded = RecipeSearchIndex.load(path)
+    assert loaded.fingerprint == 'v1'
+    assert loaded.search("dessert") == built.search("dessert")
+
+    rebuilt = RecipeSearchIndex.load_or_build(recipes[:1], 'v2', path)
+    assert len(rebuilt) == 1
+    assert RecipeSearchIndex.load(path).fingerprint == 'v2'
+
+
+def test_search_full_catalogue():
+    reader = CSVDataReader(use_snapshot=False)
+    index = RecipeSearchIndex.build(reader.recipes, reader.fingerprint)
+    page = index.search("chocolate chip banana muffins")
+    assert 221 in page.recipe_ids